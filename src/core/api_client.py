@@ -0,0 +1,160 @@
+import time
+import random
+import asyncio
+import logging
+import concurrent.futures
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Dict, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """
+    Async token bucket: `rate` requests per second on average, bursts of up to
+    `capacity`. block_for() pauses every caller (used when the server says 429).
+    Only used from the client's event loop, so it needs no lock.
+    """
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last = time.monotonic()
+        self._blocked_until = 0.0
+
+    def block_for(self, seconds: float):
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            if now < self._blocked_until:
+                wait = self._blocked_until - now
+            elif self._tokens >= 1:
+                self._tokens -= 1
+                return
+            else:
+                wait = (1 - self._tokens) / self.rate
+            await asyncio.sleep(wait)
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+class ApiClient:
+    """
+    Rate-limited HTTP client for the star-citizen-heads API.
+
+    Requests run as coroutines on one private event loop thread: a token bucket
+    spaces them out, a semaphore bounds how many are in flight, and retries wait
+    with asyncio.sleep (jittered exponential backoff, or the server's Retry-After
+    on 429/503), so waiting never holds a thread. The blocking requests call
+    itself runs in the loop's default executor.
+
+    Qt workers stay synchronous: run() submits a coroutine and waits for it.
+    """
+    MAX_RETRIES = 4
+    BASE_DELAY = 0.5 # seconds; backoff is random in [0, BASE_DELAY * 2^attempt]
+    MAX_DELAY = 30
+    MAX_RETRY_AFTER = 120 # Don't let a server header stall the UI for longer than this
+    RATE = 5.0 # requests per second
+    BURST = 10
+    MAX_CONCURRENCY = 6
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(self, session: requests.Session, rate: Optional[float] = None,
+                 burst: Optional[int] = None, max_concurrency: Optional[int] = None):
+        self.session = session
+        self.bucket = TokenBucket(rate or self.RATE, burst or self.BURST)
+        self.max_concurrency = max_concurrency or self.MAX_CONCURRENCY
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._start_lock = threading.Lock()
+
+    # --- Event loop ---
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def serve():
+                    asyncio.set_event_loop(loop)
+                    self._semaphore = asyncio.Semaphore(self.max_concurrency)
+                    ready.set()
+                    loop.run_forever()
+
+                threading.Thread(target=serve, name="ApiClientLoop", daemon=True).start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    def run(self, coro: Awaitable, timeout: Optional[float] = None) -> Any:
+        """Runs a coroutine on the client loop and waits for its result (call from any other thread)."""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result(timeout)
+
+    def spawn(self, coro: Awaitable) -> concurrent.futures.Future:
+        """Schedules a coroutine on the client loop without waiting for it. Cancelling the future cancels it."""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def close(self):
+        with self._start_lock:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._loop = None
+
+    # --- Requests ---
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.MAX_DELAY, self.BASE_DELAY * (2 ** attempt)))
+
+    async def get(self, url: str, params: Optional[Dict[str, str]] = None,
+                  headers: Optional[Dict[str, str]] = None, timeout: float = 10) -> requests.Response:
+        """
+        GET with rate limiting and retries. Returns the final response (which may
+        still be an error status once retries are exhausted); raises
+        requests.RequestException if the last attempt failed at the network level.
+        """
+        for attempt in range(self.MAX_RETRIES):
+            last = attempt == self.MAX_RETRIES - 1
+            await self.bucket.acquire()
+            try:
+                async with self._semaphore:
+                    response = await asyncio.to_thread(
+                        self.session.get, url, params=params, headers=headers, timeout=timeout
+                    )
+            except requests.RequestException as e:
+                if last:
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(f"Network error on attempt {attempt + 1}: {e} (retrying in {delay:.1f}s)")
+            else:
+                if response.status_code not in self.RETRY_STATUSES or last:
+                    return response
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if retry_after is not None:
+                    delay = min(retry_after, self.MAX_RETRY_AFTER)
+                else:
+                    delay = self._backoff(attempt)
+                if response.status_code == 429:
+                    # Rate limited: hold back every request, not just this one
+                    self.bucket.block_for(delay)
+                logger.warning(f"HTTP {response.status_code} on attempt {attempt + 1} (retrying in {delay:.1f}s)")
+            await asyncio.sleep(delay)
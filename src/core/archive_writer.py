@@ -0,0 +1,168 @@
+import os
+import time
+import zlib
+import struct
+import zipfile
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Config value "backup_compression" -> zlib level
+COMPRESSION_LEVELS = {"fast": 1, "balanced": 6, "max": 9}
+DEFAULT_COMPRESSION = "balanced"
+
+# A member is (name inside the archive, path on disk or raw bytes)
+Member = Tuple[str, Union[str, bytes]]
+
+SAMPLE_SIZE = 64 * 1024
+STORE_RATIO = 0.95 # Sample that doesn't shrink below this is treated as incompressible
+
+_ZIP64_LIMIT = 0xFFFFFFFF
+_FLAG_UTF8 = 0x800
+
+class _Compressed:
+    __slots__ = ("name", "method", "crc", "size", "data", "date_time")
+
+    def __init__(self, name, method, crc, size, data, date_time):
+        self.name = name
+        self.method = method
+        self.crc = crc
+        self.size = size
+        self.data = data
+        self.date_time = date_time
+
+def _deflate(data: bytes, level: int) -> bytes:
+    # Raw deflate stream (no zlib header), as stored inside zip members
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush()
+
+def compress_member(member: Member, level: int) -> _Compressed:
+    """
+    Reads and compresses one member. Incompressible payloads (a sample that barely
+    shrinks, or output not smaller than the input) are stored as-is.
+    zlib releases the GIL while deflating, so members compress in parallel across threads.
+    """
+    name, source = member
+    if isinstance(source, bytes):
+        data = source
+        date_time = time.localtime()[:6]
+    else:
+        with open(source, 'rb') as f:
+            data = f.read()
+        date_time = time.localtime(os.path.getmtime(source))[:6]
+
+    crc = zlib.crc32(data)
+    method = zipfile.ZIP_DEFLATED
+    payload = None
+    if len(data) > SAMPLE_SIZE:
+        sample = data[:SAMPLE_SIZE]
+        if len(_deflate(sample, 1)) >= len(sample) * STORE_RATIO:
+            method = zipfile.ZIP_STORED
+    if method == zipfile.ZIP_DEFLATED:
+        payload = _deflate(data, level)
+        if len(payload) >= len(data):
+            method = zipfile.ZIP_STORED
+    if method == zipfile.ZIP_STORED:
+        payload = data
+    return _Compressed(name, method, crc, len(data), payload, date_time)
+
+def _dos_time(date_time) -> Tuple[int, int]:
+    year, month, day, hour, minute, second = date_time
+    year = max(1980, min(2107, year))
+    return ((year - 1980) << 9 | month << 5 | day), (hour << 11 | minute << 5 | second // 2)
+
+class _ZipAssembler:
+    """Writes pre-compressed members straight into a zip file (local headers + central directory)."""
+    def __init__(self, fp):
+        self.fp = fp
+        self.entries = []
+
+    def add(self, item: _Compressed):
+        name = item.name.encode('utf-8')
+        dos_date, dos_time = _dos_time(item.date_time)
+        version = 20 if item.method == zipfile.ZIP_DEFLATED else 10
+        offset = self.fp.tell()
+        self.fp.write(struct.pack(
+            "<4s5H3L2H", b"PK\x03\x04", version, _FLAG_UTF8, item.method, dos_time, dos_date,
+            item.crc, len(item.data), item.size, len(name), 0
+        ))
+        self.fp.write(name)
+        self.fp.write(item.data)
+        self.entries.append((name, version, item.method, dos_time, dos_date, item.crc, len(item.data), item.size, offset))
+
+    def close(self):
+        start = self.fp.tell()
+        for name, version, method, dos_time, dos_date, crc, csize, size, offset in self.entries:
+            self.fp.write(struct.pack(
+                "<4s6H3L5H2L", b"PK\x01\x02", 20, version, _FLAG_UTF8, method, dos_time, dos_date,
+                crc, csize, size, len(name), 0, 0, 0, 0, 0, offset
+            ))
+            self.fp.write(name)
+        size = self.fp.tell() - start
+        count = len(self.entries)
+        self.fp.write(struct.pack("<4s4H2LH", b"PK\x05\x06", 0, 0, count, count, size, start, 0))
+
+def write_archive(target_path: str, members: List[Member], level: str = DEFAULT_COMPRESSION,
+                  max_workers: Optional[int] = None,
+                  progress_callback: Optional[Callable[[int, int], None]] = None) -> int:
+    """
+    Writes a zip archive, compressing members in parallel and appending them in order.
+    Archives needing ZIP64 (huge members or >65535 entries) fall back to zipfile.
+    The file is written to a temp path and moved into place when complete.
+    Returns the number of members written.
+    """
+    zlevel = COMPRESSION_LEVELS.get(level, COMPRESSION_LEVELS[DEFAULT_COMPRESSION])
+    workers = max_workers or min(8, os.cpu_count() or 1)
+    total = len(members)
+
+    def too_big(member: Member) -> bool:
+        source = member[1]
+        size = len(source) if isinstance(source, bytes) else os.path.getsize(source)
+        return size >= _ZIP64_LIMIT
+
+    tmp_path = f"{target_path}.tmp"
+    try:
+        if total > 0xFFFF or any(too_big(m) for m in members):
+            _write_with_zipfile(tmp_path, members, zlevel, progress_callback)
+        else:
+            with open(tmp_path, 'wb') as fp, ThreadPoolExecutor(max_workers=workers) as pool:
+                assembler = _ZipAssembler(fp)
+                # Bounded look-ahead keeps memory flat while every core stays busy
+                window = workers * 2
+                pending = []
+                next_index = 0
+                done = 0
+                while done < total:
+                    while next_index < total and len(pending) < window:
+                        pending.append(pool.submit(compress_member, members[next_index], zlevel))
+                        next_index += 1
+                    item = pending.pop(0).result()
+                    if fp.tell() + len(item.data) >= _ZIP64_LIMIT:
+                        raise OverflowError("Archive too large for the fast writer")
+                    assembler.add(item)
+                    done += 1
+                    if progress_callback:
+                        progress_callback(done, total)
+                assembler.close()
+        os.replace(tmp_path, target_path)
+    except OverflowError:
+        _write_with_zipfile(tmp_path, members, zlevel, progress_callback)
+        os.replace(tmp_path, target_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return total
+
+def _write_with_zipfile(path: str, members: List[Member], zlevel: int,
+                        progress_callback: Optional[Callable[[int, int], None]]):
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED, compresslevel=zlevel, allowZip64=True) as zf:
+        for i, (name, source) in enumerate(members, 1):
+            if isinstance(source, bytes):
+                zf.writestr(name, source)
+            else:
+                zf.write(source, arcname=name)
+            if progress_callback:
+                progress_callback(i, len(members))
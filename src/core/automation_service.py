@@ -3,6 +3,7 @@ import os
 import subprocess
 import shutil
 import logging
+import threading
 from PySide6.QtCore import QObject, Signal, QThread, QTimer
 
 logger = logging.getLogger(__name__)
@@ -97,43 +98,43 @@ class AutomationService(QObject):
         if self.config_manager.config.get("auto_backup_enabled", True):
             self._perform_auto_backup()
             
-        # 2. Cloud Sync
+        # 2. Integrity sweep (cached, so only files changed during the session are read)
+        if self.config_manager.config.get("integrity_check_enabled", True):
+            threading.Thread(target=self._perform_integrity_check, daemon=True).start()
+
+        # 3. Cloud Sync
         if self.config_manager.config.get("cloud_sync_enabled", False):
             self._perform_cloud_sync()
 
     def _perform_auto_backup(self):
         try:
-            timestamp = time.strftime("%Y%m%d_%H%M%S")
-            filename = f"AutoBackup_{timestamp}.zip"
-            
-            # Save to default backup folder or a specific one?
-            backups_dir = os.path.join(self.config_manager.config_dir, "Backups")
-            os.makedirs(backups_dir, exist_ok=True)
-            
-            target = os.path.join(backups_dir, filename)
-            self.character_service.create_backup(target)
-            
-            self.log_message.emit("INFO", f"Auto-Backup created: {filename}")
-            
-            # Cleanup old backups? (Keep last 5)
-            self._cleanup_old_backups(backups_dir)
+            # Incremental snapshot: only new file contents are stored, unchanged libraries are skipped
+            backups = self.character_service.incremental_backup
+            snapshot_id = backups.create(str(self.character_service.get_game_path()), reason="Game Exit")
+            if snapshot_id is None:
+                self.log_message.emit("INFO", "Auto-Backup skipped: no changes since the last backup")
+                return
+
+            self.log_message.emit("INFO", f"Auto-Backup created: {snapshot_id}")
+
+            # Retention by storage budget (shared contents are only counted once)
+            budget_mb = self.config_manager.config.get("auto_backup_budget_mb", backups.DEFAULT_BUDGET_MB)
+            removed, _ = backups.prune(int(budget_mb) * 1024 * 1024)
+            if removed:
+                self.log_message.emit("INFO", f"Removed {removed} old backups to stay within {budget_mb} MB")
             
         except Exception as e:
             self.log_message.emit("ERROR", f"Auto-Backup Failed: {e}")
 
-    def _cleanup_old_backups(self, backup_dir):
+    def _perform_integrity_check(self):
         try:
-            files = sorted(
-                [os.path.join(backup_dir, f) for f in os.listdir(backup_dir) if f.startswith("AutoBackup_")],
-                key=os.path.getmtime
-            )
-            keep = 5
-            if len(files) > keep:
-                for f in files[:-keep]:
-                    os.remove(f)
-                    self.log_message.emit("INFO", f"Removed old backup: {os.path.basename(f)}")
-        except:
-            pass
+            problems = self.character_service.validate_library_integrity()
+            for problem in problems:
+                self.log_message.emit("WARNING", f"Integrity: {problem['filename']}: {problem['error']}")
+            if not problems:
+                self.log_message.emit("INFO", "Integrity check passed")
+        except Exception as e:
+            self.log_message.emit("ERROR", f"Integrity check failed: {e}")
 
     def _perform_cloud_sync(self):
         target_path = self.config_manager.config.get("cloud_sync_path")
@@ -1,8 +1,11 @@
 import os
 import shutil
 import json
+import time
+import threading
 from datetime import datetime
 from pathlib import Path
+from typing import Dict, List, Optional, Set, Union
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,136 +14,354 @@ class BackupManager:
     """
     Manages automatic backups (snapshots) of characters before replacement.
     Implements a 'Time Capsule' feature.
+
+    All snapshots of the library live in one append-only journal
+    (Backups/journal.jsonl): "add" records describe a snapshot, "del" records
+    (tombstones) retire one. The journal is replayed once into in-memory indexes
+    by character and by time, and compacted when tombstones pile up.
+    Snapshot contents are stored once per distinct SHA-256 under
+    Backups/Snapshots, as real copies so that no later write to the live file
+    (or to a restored one) can reach them. Objects whose last snapshot was
+    retired are deleted once the records have been applied.
     """
+    JOURNAL_NAME = "journal.jsonl"
+    MAX_PER_CHARACTER = 10
+    COMPACT_MIN_TOMBSTONES = 100
+
     def __init__(self, config_manager):
         self.config_manager = config_manager
         # Store backups in %AppData%/SCCharacters/Backups or local
         self.backup_dir = os.path.join(self.config_manager.config_dir, "Backups")
+        self.objects_dir = os.path.join(self.backup_dir, "Snapshots")
+        self.journal_path = os.path.join(self.backup_dir, self.JOURNAL_NAME)
         self._ensure_dir()
+        self._blob_store = None
+
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._entries: Dict[str, dict] = {}        # id -> entry
+        self._by_char: Dict[str, List[str]] = {}   # character -> ids, oldest first
+        self._by_time: List[str] = []              # ids, oldest first (journal order)
+        self._refs: Dict[str, int] = {}            # sha -> live entries using it
+        self._orphans: Set[str] = set()             # shas whose count dropped to zero, not yet deleted
+        self._tombstones = 0
+
+    @property
+    def blob_store(self):
+        if self._blob_store is None:
+            from src.core.blob_store import BlobStore
+            self._blob_store = BlobStore(self.config_manager.config_dir)
+        return self._blob_store
 
     def _ensure_dir(self):
         if not os.path.exists(self.backup_dir):
             os.makedirs(self.backup_dir)
 
+    # --- Journal ---
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if not os.path.exists(self.journal_path):
+            self._migrate_legacy_history()
+            return
+        try:
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue # Torn last line after a crash
+                    self._apply(record)
+        except OSError as e:
+            logger.error(f"Could not read snapshot journal: {e}")
+        self._collect_orphans()
+
+    def _apply(self, record: dict):
+        if record.get("op") == "add":
+            entry = {k: v for k, v in record.items() if k != "op"}
+            if entry["id"] in self._entries:
+                # Journals written before ids were made unique can repeat one; keep the first
+                logger.warning(f"Ignoring duplicate snapshot id {entry['id']} in journal")
+                return
+            self._entries[entry["id"]] = entry
+            self._by_char.setdefault(entry["character"], []).append(entry["id"])
+            self._by_time.append(entry["id"])
+            for sha in self._shas(entry):
+                self._refs[sha] = self._refs.get(sha, 0) + 1
+        elif record.get("op") == "del":
+            entry = self._entries.pop(record.get("id"), None)
+            if entry is None:
+                return
+            self._tombstones += 1
+            ids = self._by_char.get(entry["character"], [])
+            if entry["id"] in ids:
+                ids.remove(entry["id"])
+            if not ids:
+                self._by_char.pop(entry["character"], None)
+            self._by_time.remove(entry["id"])
+            for sha in self._shas(entry):
+                self._refs[sha] -= 1
+                if self._refs[sha] <= 0:
+                    # A later "add" may reuse the content, so only delete after the whole batch
+                    del self._refs[sha]
+                    self._orphans.add(sha)
+
+    def _collect_orphans(self):
+        for sha in self._orphans:
+            if sha not in self._refs:
+                self._remove_object(sha)
+        self._orphans.clear()
+
+    def _new_id(self, now: float) -> str:
+        """Microsecond timestamp id, bumped past any live id (same clock tick, coarse timers)."""
+        stamp = int(now * 1e6)
+        while f"{stamp:x}" in self._entries:
+            stamp += 1
+        return f"{stamp:x}"
+
+    @staticmethod
+    def _shas(entry: dict) -> List[str]:
+        return [sha for sha in (entry.get("sha"), entry.get("json_sha")) if sha]
+
+    def _append(self, records: List[dict]):
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+        for record in records:
+            self._apply(record)
+        self._collect_orphans()
+
+    def _compact_if_needed(self):
+        if self._tombstones < self.COMPACT_MIN_TOMBSTONES or self._tombstones < len(self._entries):
+            return
+        tmp = f"{self.journal_path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            for entry_id in self._by_time:
+                f.write(json.dumps(dict(self._entries[entry_id], op="add")) + "\n")
+        os.replace(tmp, self.journal_path)
+        logger.info(f"Snapshot journal compacted ({self._tombstones} tombstones dropped)")
+        self._tombstones = 0
+
+    # --- Content ---
+
+    def _object_path(self, sha: str) -> str:
+        return os.path.join(self.objects_dir, sha[:2], sha)
+
+    def _store_object(self, path: str) -> str:
+        sha = self.blob_store.digest(path)
+        dest = self._object_path(sha)
+        if not os.path.exists(dest):
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            shutil.copy2(path, f"{dest}.tmp")
+            os.replace(f"{dest}.tmp", dest)
+        return sha
+
+    def _remove_object(self, sha: str):
+        try:
+            os.remove(self._object_path(sha))
+        except OSError:
+            pass
+
+    # --- Public API ---
+
     def create_snapshot(self, char_path: str, reason: str = "Pre-Install"):
         """
         Creates a timestamped snapshot of a character file before it is overwritten.
         char_path: Full path to the .chf file being replaced.
+        Returns the journal entry, or None.
         """
         if not os.path.exists(char_path):
             return None # Nothing to backup
 
         try:
-            filename = os.path.basename(char_path)
-            char_name = os.path.splitext(filename)[0]
-            
-            # Timestamp format: YYYYMMDD_HHMMSS
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            
-            # Create folder for this character's history
-            char_backup_dir = os.path.join(self.backup_dir, char_name)
-            if not os.path.exists(char_backup_dir):
-                os.makedirs(char_backup_dir)
-                
-            # Copy .chf
-            dest_chf = os.path.join(char_backup_dir, f"{timestamp}_{filename}")
-            shutil.copy2(char_path, dest_chf)
-            
-            # Backup metadata/thumb if exists
-            json_src = char_path.replace(".chf", ".json")
-            if os.path.exists(json_src):
-                 shutil.copy2(json_src, os.path.join(char_backup_dir, f"{timestamp}_{char_name}.json"))
-                 
-            # Log Metadata
-            manifest_path = os.path.join(char_backup_dir, "history.json")
-            history = []
-            if os.path.exists(manifest_path):
-                try:
-                    with open(manifest_path, 'r') as f:
-                        history = json.load(f)
-                except: pass
-                
-            entry = {
-                "timestamp": timestamp,
-                "reason": reason,
-                "filename": f"{timestamp}_{filename}",
-                "original_path": char_path
-            }
-            history.insert(0, entry) # Newest first
-            
-            # Limit history per char (e.g. max 10)
-            if len(history) > 10:
-                # Remove old files
-                to_remove = history[10:]
-                history = history[:10]
-                for old in to_remove:
-                    try:
-                        old_file = os.path.join(char_backup_dir, old["filename"])
-                        if os.path.exists(old_file): os.remove(old_file)
-                        # Remove companion json check omitted for brevity or implement if critical
-                    except: pass
-            
-            with open(manifest_path, 'w') as f:
-                json.dump(history, f, indent=4)
-                
-            logger.info(f"Snapshot created for {char_name}: {timestamp}")
-            return dest_chf
-            
+            with self._lock:
+                self._load()
+                filename = os.path.basename(char_path)
+                char_name = os.path.splitext(filename)[0]
+                now = time.time()
+
+                entry = {
+                    "id": self._new_id(now),
+                    "character": char_name,
+                    # Timestamp format: YYYYMMDD_HHMMSS
+                    "timestamp": datetime.fromtimestamp(now).strftime("%Y%m%d_%H%M%S"),
+                    "time": now,
+                    "reason": reason,
+                    "filename": filename,
+                    "original_path": char_path,
+                    "size": os.path.getsize(char_path),
+                    "sha": self._store_object(char_path),
+                }
+                # Backup metadata if exists
+                json_src = os.path.splitext(char_path)[0] + ".json"
+                if os.path.exists(json_src):
+                    entry["json_sha"] = self._store_object(json_src)
+
+                records = [dict(entry, op="add")]
+                # Limit history per char: retire the oldest with tombstones
+                history = self._by_char.get(char_name, [])
+                overflow = len(history) + 1 - self.MAX_PER_CHARACTER
+                if overflow > 0:
+                    records.extend({"op": "del", "id": old_id} for old_id in history[:overflow])
+                self._append(records)
+                self._compact_if_needed()
+
+            logger.info(f"Snapshot created for {char_name}: {entry['timestamp']}")
+            return entry
+
         except Exception as e:
             logger.error(f"Failed to create snapshot: {e}")
             return None
 
-    def list_snapshots(self, char_name: str):
-        """Returns list of backups for a given character name."""
-        # Sanitize char_name just in case
-        safe_name = char_name 
-        # Actually we need to match how create_snapshot derived the folder name from the file
-        # This assumes char_name matches the file name standard.
-        
-        path = os.path.join(self.backup_dir, safe_name, "history.json")
-        if os.path.exists(path):
-            with open(path, 'r') as f:
-                return json.load(f)
-        return []
-
-    def restore_snapshot(self, snapshot_entry, target_dir):
+    def list_snapshots(self, char_name: str) -> List[dict]:
+        """Returns list of backups for a given character name (newest first)."""
+        with self._lock:
+            self._load()
+            return [self._entries[i] for i in reversed(self._by_char.get(char_name, []))]
+
+    def list_recent(self, limit: int = 50, since: Optional[float] = None) -> List[dict]:
+        """Snapshots across the whole library, newest first."""
+        with self._lock:
+            self._load()
+            result = []
+            for entry_id in reversed(self._by_time):
+                entry = self._entries[entry_id]
+                if since is not None and entry["time"] < since:
+                    break
+                result.append(entry)
+                if len(result) >= limit:
+                    break
+            return result
+
+    def prune(self, max_age_days: Optional[float] = None, max_per_character: Optional[int] = None) -> int:
+        """Retires snapshots older than max_age_days and/or beyond max_per_character. Returns how many."""
+        with self._lock:
+            self._load()
+            doomed = []
+            if max_age_days is not None:
+                cutoff = time.time() - max_age_days * 86400
+                for entry_id in self._by_time:
+                    if self._entries[entry_id]["time"] >= cutoff:
+                        break
+                    doomed.append(entry_id)
+            if max_per_character is not None:
+                for ids in self._by_char.values():
+                    doomed.extend(ids[:max(0, len(ids) - max_per_character)])
+            doomed = list(dict.fromkeys(doomed))
+            if doomed:
+                self._append([{"op": "del", "id": entry_id} for entry_id in doomed])
+                self._compact_if_needed()
+            return len(doomed)
+
+    def restore_snapshot(self, snapshot_entry: Union[dict, str], target_dir) -> bool:
         """
-        Restores a snapshot to the game directory.
+        Restores a snapshot (entry or id) to the game directory under its original filename,
+        together with its metadata sidecar when one was captured.
         """
         try:
-            filename = snapshot_entry["filename"]
-            # We need to strip the timestamp prefix to restore the original name
-            # Format: YYYYMMDD_HHMMSS_Name.chf
-            # Split at first _ that follows the timestamp pattern? 
-            # Easier: Use the original filename logic or extract from "timestamp" length
-            
-            # Expected: 15 chars (timestamp) + 1 (_) = 16 prefix len
-            original_name = filename[16:] # Rough logic, safer to store 'original_name' in manifest next time
-            
-            # Actually, let's just infer from the entry if we stored it, or assume standard format.
-            src = os.path.join(self.backup_dir, os.path.splitext(original_name)[0], filename) 
-            # Wait, char_name folder logic:
-            # backup_dir / char_name / timestamp_charfile.chf
-            
-            # Let's trust the Caller passes us enough info or we improve the manifest.
-            # Rework: Caller usually knows the char name.
-            pass 
-        except:
+            with self._lock:
+                self._load()
+                entry_id = snapshot_entry if isinstance(snapshot_entry, str) else snapshot_entry.get("id")
+                entry = self._entries.get(entry_id)
+            if entry is None:
+                logger.error(f"Snapshot {entry_id} not found")
+                return False
+
+            src = self._object_path(entry["sha"])
+            if not os.path.exists(src) or os.path.getsize(src) != entry["size"]:
+                logger.error(f"Snapshot content for {entry['filename']} is missing or damaged")
+                return False
+
+            target_dir = str(target_dir)
+            # Copies, so the restored files never share an inode with the history
+            self._copy_out(src, target_dir, entry["filename"])
+            if entry.get("json_sha") and os.path.exists(self._object_path(entry["json_sha"])):
+                json_name = os.path.splitext(entry["filename"])[0] + ".json"
+                self._copy_out(self._object_path(entry["json_sha"]), target_dir, json_name)
+            logger.info(f"Restored {entry['character']} from {entry['timestamp']}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to restore snapshot: {e}")
             return False
-            
+
+    @staticmethod
+    def _copy_out(src: str, target_dir: str, name: str):
+        tmp = os.path.join(target_dir, f".tmp_{name}")
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, os.path.join(target_dir, name))
+
     def restore_latest(self, char_name, target_dir):
         """Simple restore of the most recent backup."""
         snaps = self.list_snapshots(char_name)
         if not snaps: return False
-        
-        latest = snaps[0]
-        char_backup_dir = os.path.join(self.backup_dir, char_name)
-        src = os.path.join(char_backup_dir, latest["filename"])
-        
-        # Original name inference: timestamp (15) + _ (1) = 16
-        dest_name = latest["filename"][16:] 
-        dest_path = os.path.join(target_dir, dest_name)
-        
-        shutil.copy2(src, dest_path)
-        logger.info(f"Restored {char_name} from {latest['timestamp']}")
-        return True
+        return self.restore_snapshot(snaps[0], target_dir)
+
+    # --- Migration ---
+
+    def _migrate_legacy_history(self):
+        """
+        Imports the old per-character Backups/<name>/history.json manifests into the
+        journal, moving their files into the content store.
+        """
+        records = []
+        try:
+            folders = [e for e in os.scandir(self.backup_dir) if e.is_dir()]
+        except OSError:
+            return
+        for folder in folders:
+            manifest_path = os.path.join(folder.path, "history.json")
+            if not os.path.isfile(manifest_path):
+                continue
+            try:
+                with open(manifest_path, 'r') as f:
+                    history = json.load(f)
+            except (OSError, ValueError):
+                continue
+
+            try:
+                records.extend(self._import_legacy_folder(folder, history, len(records)))
+            except Exception as e:
+                logger.error(f"Could not migrate snapshots of {folder.name}: {e}")
+                continue
+            shutil.rmtree(folder.path, ignore_errors=True)
+
+        records.sort(key=lambda r: r["time"])
+        # Always create the journal so migration runs only once
+        self._append(records)
+        if records:
+            logger.info(f"Migrated {len(records)} legacy snapshots into the journal")
+
+    def _import_legacy_folder(self, folder, history: List[dict], offset: int) -> List[dict]:
+        records = []
+        # history.json is newest first; the journal is oldest first
+        for old in reversed(history):
+            old_file = os.path.join(folder.path, old.get("filename", ""))
+            if not os.path.isfile(old_file):
+                continue
+            try:
+                stamp = datetime.strptime(old["timestamp"], "%Y%m%d_%H%M%S").timestamp()
+            except (KeyError, ValueError):
+                stamp = os.path.getmtime(old_file)
+            entry = {
+                "op": "add",
+                "id": f"{int(stamp * 1e6):x}_{offset + len(records)}",
+                "character": folder.name,
+                "timestamp": old.get("timestamp", ""),
+                "time": stamp,
+                "reason": old.get("reason", ""),
+                # Stored as "<timestamp>_<original name>"
+                "filename": old["filename"][16:] or old["filename"],
+                "original_path": old.get("original_path", ""),
+                "size": os.path.getsize(old_file),
+                "sha": self._store_object(old_file),
+            }
+            json_file = os.path.join(folder.path, f"{old.get('timestamp', '')}_{folder.name}.json")
+            if os.path.isfile(json_file):
+                entry["json_sha"] = self._store_object(json_file)
+            records.append(entry)
+        return records
@@ -0,0 +1,166 @@
+import os
+import shutil
+import hashlib
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class BlobStore:
+    """
+    SHA-256 content-addressed store for character files (Blobs/ab/<sha256> in the config dir).
+    Environment folders reference blobs by hardlink, so identical .chf bytes are
+    kept on disk once; where hardlinks are not possible (other volume,
+    unsupported filesystem) files are copied as before.
+
+    A blob is always a copy of the source file, never a link to it, so the live
+    file can be edited in place (by the game or an external tool) without touching
+    stored content. Copies linked out of the store still share the blob's inode;
+    an in-place write to one of those is caught by re-checking the blob's digest
+    before it is linked again, and the damaged blob is dropped.
+    """
+    HASH_BLOCK = 1024 * 1024
+
+    def __init__(self, config_dir: str):
+        self.root = os.path.join(config_dir, "Blobs")
+        self._lock = threading.Lock()
+        # (dev, inode, size, mtime_ns) -> sha256, so unchanged files are hashed once per session
+        self._digests: Dict[Tuple[int, int, int, int], str] = {}
+
+    def blob_path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest)
+
+    def has(self, digest: str) -> bool:
+        return os.path.isfile(self.blob_path(digest))
+
+    def digest(self, path: str) -> str:
+        st = os.stat(path)
+        key = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+        with self._lock:
+            cached = self._digests.get(key)
+        if cached:
+            return cached
+
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(self.HASH_BLOCK), b""):
+                sha.update(block)
+        digest = sha.hexdigest()
+        with self._lock:
+            self._digests[key] = digest
+        return digest
+
+    def put(self, path: str) -> Optional[str]:
+        """
+        Stores a copy of the file and returns its digest (skipped when an intact
+        blob with the same content exists). Returns None if the copy fails.
+        """
+        digest = self.digest(path)
+        if self.verify(digest):
+            return digest
+
+        os.makedirs(self.root, exist_ok=True)
+        tmp = os.path.join(self.root, f".tmp_{threading.get_ident()}_{os.path.basename(path)}")
+        try:
+            # Hash what was actually copied: the source may change underneath us
+            sha = hashlib.sha256()
+            with open(path, 'rb') as src, open(tmp, 'wb') as dst:
+                for block in iter(lambda: src.read(self.HASH_BLOCK), b""):
+                    sha.update(block)
+                    dst.write(block)
+            shutil.copystat(path, tmp)
+            digest = sha.hexdigest()
+            blob = self.blob_path(digest)
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            if self.verify(digest):
+                return digest # Another thread stored the same content first
+            os.replace(tmp, blob)
+            return digest
+        except OSError as e:
+            logger.warning(f"Blob store cannot copy {path}: {e}")
+            return None
+        finally:
+            self._remove_quietly(tmp)
+
+    def verify(self, digest: str) -> bool:
+        """
+        True if the blob exists and still holds its content. A blob changed in place
+        through one of its links is removed (the links keep their own data).
+        """
+        blob = self.blob_path(digest)
+        try:
+            actual = self.digest(blob)
+        except OSError:
+            return False
+        if actual == digest:
+            return True
+        logger.warning(f"Blob {digest[:12]} was modified in place, dropping it")
+        self._remove_quietly(blob)
+        return False
+
+    def materialize(self, digest: str, dest: str) -> bool:
+        """
+        Places the blob at `dest` (replacing any existing file atomically).
+        Returns True if hardlinked, False if it had to be copied.
+        Raises IOError if the blob is missing or no longer matches its digest.
+        """
+        if not self.verify(digest):
+            raise IOError(f"Blob {digest[:12]} is missing or damaged")
+        blob = self.blob_path(digest)
+        if os.path.exists(dest) and os.path.samefile(blob, dest):
+            return True
+
+        tmp = os.path.join(os.path.dirname(dest), f".tmp_{os.path.basename(dest)}")
+        self._remove_quietly(tmp)
+        try:
+            os.link(blob, tmp)
+            linked = True
+        except OSError as e:
+            # Other volume, FAT/exFAT, link limit reached...
+            logger.debug(f"Hardlink to {dest} failed ({e}), copying instead")
+            shutil.copy2(blob, tmp)
+            linked = False
+        os.replace(tmp, dest)
+        return linked
+
+    def place(self, src: str, dest: str) -> bool:
+        """
+        Makes `dest` hold the same bytes as `src`, sharing storage where possible.
+        Returns True if `dest` ended up as a hardlink, False if it was copied.
+        """
+        digest = self.put(src)
+        if digest is not None:
+            return self.materialize(digest, dest)
+
+        tmp = os.path.join(os.path.dirname(dest), f".tmp_{os.path.basename(dest)}")
+        shutil.copy2(src, tmp)
+        os.replace(tmp, dest)
+        return False
+
+    def gc(self) -> int:
+        """Deletes blobs no longer referenced by any folder (link count 1). Returns the number removed."""
+        removed = 0
+        if not os.path.isdir(self.root):
+            return 0
+        for bucket in os.scandir(self.root):
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                try:
+                    # os.stat, not entry.stat(): scandir leaves st_nlink at 0 on Windows
+                    if entry.is_file() and os.stat(entry.path).st_nlink <= 1:
+                        os.remove(entry.path)
+                        removed += 1
+                except OSError as e:
+                    logger.warning(f"Could not remove blob {entry.name}: {e}")
+        if removed:
+            logger.info(f"Blob store: removed {removed} unreferenced blobs")
+        return removed
+
+    @staticmethod
+    def _remove_quietly(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,264 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+import requests
+from typing import Callable, Iterable, List, Optional
+
+from src.core.models import Character, tag_names
+
+logger = logging.getLogger(__name__)
+
+# Local orderings (the API's orderBy values plus "name")
+ORDER_CLAUSES = {
+    "name": "name COLLATE NOCASE ASC",
+    "latest": "created_at DESC",
+    "oldest": "created_at ASC",
+    "download": "downloads DESC",
+    "like": "likes DESC",
+}
+
+def _fts_phrase(token: str) -> str:
+    return '"' + token.replace('"', '""') + '"'
+
+class Catalog:
+    """
+    Local mirror of the online character catalog, stored as SQLite in the config directory.
+
+    A first sync walks every page of /api/heads; later syncs walk orderBy=latest
+    only until they reach characters already stored. Name/author/tag search uses
+    an FTS5 index (plain LIKE if this SQLite lacks FTS5), so search, tag filters
+    and A-Z sorting of the whole catalog run locally and work offline.
+    """
+    DB_NAME = "catalog.db"
+    SYNC_BATCH_PAGES = 5 # Pages requested concurrently during a full sync
+
+    def __init__(self, config_dir: Optional[str] = None):
+        # No config dir -> throwaway in-memory catalog
+        self.db_path = os.path.join(config_dir, self.DB_NAME) if config_dir else ":memory:"
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.fts = True
+        self._init_schema()
+
+    def _init_schema(self):
+        conn = self._conn
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS heads (
+                id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                author TEXT NOT NULL,
+                author_image TEXT,
+                url_detail TEXT,
+                image_url TEXT,
+                download_url TEXT,
+                tags TEXT,
+                downloads INTEGER,
+                likes INTEGER,
+                created_at TEXT,
+                synced_at REAL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS heads_created ON heads(created_at)")
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        try:
+            # External-content FTS table kept in step by triggers
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS heads_fts USING fts5(
+                    name, author, tags, content='heads', content_rowid='rowid'
+                )
+            """)
+            conn.executescript("""
+                CREATE TRIGGER IF NOT EXISTS heads_ai AFTER INSERT ON heads BEGIN
+                    INSERT INTO heads_fts(rowid, name, author, tags) VALUES (new.rowid, new.name, new.author, new.tags);
+                END;
+                CREATE TRIGGER IF NOT EXISTS heads_ad AFTER DELETE ON heads BEGIN
+                    INSERT INTO heads_fts(heads_fts, rowid, name, author, tags) VALUES ('delete', old.rowid, old.name, old.author, old.tags);
+                END;
+                CREATE TRIGGER IF NOT EXISTS heads_au AFTER UPDATE ON heads BEGIN
+                    INSERT INTO heads_fts(heads_fts, rowid, name, author, tags) VALUES ('delete', old.rowid, old.name, old.author, old.tags);
+                    INSERT INTO heads_fts(rowid, name, author, tags) VALUES (new.rowid, new.name, new.author, new.tags);
+                END;
+            """)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"SQLite without FTS5, catalog search falls back to LIKE: {e}")
+            self.fts = False
+        conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # --- State ---
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+            self._conn.commit()
+
+    @property
+    def is_complete(self) -> bool:
+        """True once a full sync has finished (local results then cover the whole catalog)."""
+        return self._get_meta("full_sync_done") == "1"
+
+    @property
+    def last_sync(self) -> Optional[float]:
+        value = self._get_meta("last_sync")
+        return float(value) if value else None
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM heads").fetchone()[0]
+
+    # --- Writing ---
+
+    @staticmethod
+    def character_id(character: Character) -> str:
+        # url_detail is BASE_URL/character/<id> for every API character
+        return character.url_detail.rstrip('/').rsplit('/', 1)[-1]
+
+    def upsert(self, characters: Iterable[Character]) -> int:
+        """Stores characters (replacing older copies). Returns how many were not known before."""
+        rows = []
+        now = time.time()
+        for c in characters:
+            if not c.url_detail or not c.download_url:
+                continue
+            rows.append((
+                self.character_id(c), c.name, c.author or "Unknown", c.author_image, c.url_detail,
+                c.image_url, c.download_url, json.dumps(tag_names(c.tags)), c.downloads or 0,
+                c.likes or 0, c.created_at or "", now
+            ))
+        if not rows:
+            return 0
+        with self._lock:
+            known = self.known_ids([r[0] for r in rows])
+            # Upsert rather than REPLACE so rowids (and the FTS rows) stay stable
+            self._conn.executemany("""
+                INSERT INTO heads VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    name = excluded.name, author = excluded.author, author_image = excluded.author_image,
+                    url_detail = excluded.url_detail, image_url = excluded.image_url,
+                    download_url = excluded.download_url, tags = excluded.tags,
+                    downloads = excluded.downloads, likes = excluded.likes,
+                    created_at = excluded.created_at, synced_at = excluded.synced_at
+            """, rows)
+            self._conn.commit()
+        return len({r[0] for r in rows} - known)
+
+    def known_ids(self, ids: List[str]) -> set:
+        found = set()
+        with self._lock:
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT id FROM heads WHERE id IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                found.update(row[0] for row in rows)
+        return found
+
+    # --- Sync ---
+
+    def sync(self, scraper, progress_callback: Optional[Callable[[int], None]] = None,
+             max_pages: int = 10000) -> int:
+        """
+        Brings the mirror up to date from the API. Until a full sync has completed
+        every page is fetched (SYNC_BATCH_PAGES at a time); afterwards only the newest
+        pages are walked, stopping at the first page with already-known characters.
+        The full sync only counts as done once the API reports its last page; if a
+        page fails it stops and the next run resumes from that page.
+        Returns the number of new characters.
+        """
+        full = not self.is_complete
+        added = 0
+        # Newer characters push older ones to later pages, so resuming re-reads a few but skips none
+        page = int(self._get_meta("full_sync_page") or 1) if full else 1
+        reached_end = False
+        while page <= max_pages:
+            batch = self.SYNC_BATCH_PAGES if full else 1
+            try:
+                chars, has_next = scraper.get_character_pages(page, batch, order_by="latest",
+                                                              use_cache=False, raise_errors=True)
+            except (requests.RequestException, ValueError) as e:
+                logger.warning(f"Catalog sync stopped at page {page}: {e}")
+                return added
+            if not chars and page == 1 and not has_next:
+                return added # Empty API: nothing we can conclude
+            new = self.upsert(chars)
+            added += new
+            page += batch
+            if full:
+                self._set_meta("full_sync_page", str(page))
+            if progress_callback:
+                progress_callback(self.count())
+            if not has_next:
+                reached_end = True
+                break
+            if not full and new < len(chars):
+                break
+
+        if full:
+            if not reached_end:
+                logger.info(f"Catalog full sync paused at page {page} ({self.count()} characters so far)")
+                return added
+            self._set_meta("full_sync_done", "1")
+            self._set_meta("full_sync_page", "")
+        self._set_meta("last_sync", str(time.time()))
+        logger.info(f"Catalog sync ({'full' if full else 'delta'}): {added} new, {self.count()} total")
+        return added
+
+    # --- Queries ---
+
+    def search(self, text: Optional[str] = None, tags: Optional[List[str]] = None,
+               order_by: str = "name", limit: int = 5000, offset: int = 0) -> List[Character]:
+        """
+        Local search. Words match name, author or tags by prefix; words starting
+        with '#' are tag filters. order_by is one of ORDER_CLAUSES.
+        """
+        words = (text or "").split()
+        tags = list(tags or []) + [w[1:] for w in words if w.startswith('#') and len(w) > 1]
+        words = [w for w in words if not w.startswith('#')]
+        order = ORDER_CLAUSES.get(order_by, ORDER_CLAUSES["name"])
+
+        where = []
+        params: list = []
+        if self.fts and (words or tags):
+            terms = [f"{_fts_phrase(w)}*" for w in words] + [f"tags : {_fts_phrase(t)}" for t in tags]
+            where.append("rowid IN (SELECT rowid FROM heads_fts WHERE heads_fts MATCH ?)")
+            params.append(" AND ".join(terms))
+        else:
+            for w in words:
+                where.append("(name LIKE ? OR author LIKE ? OR tags LIKE ?)")
+                params.extend([f"%{w}%"] * 3)
+            for t in tags:
+                where.append("tags LIKE ?")
+                params.append(f"%{json.dumps(t)}%")
+
+        sql = "SELECT name, author, author_image, url_detail, image_url, download_url, tags, downloads, likes, created_at FROM heads"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {order} LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+
+        with self._lock:
+            try:
+                rows = self._conn.execute(sql, params).fetchall()
+            except sqlite3.OperationalError as e:
+                logger.warning(f"Catalog query failed: {e}")
+                return []
+        return [
+            Character(
+                name=row[0], author=row[1], author_image=row[2] or "", url_detail=row[3],
+                image_url=row[4] or "", download_url=row[5], tags=json.loads(row[6]) if row[6] else [],
+                downloads=row[7], likes=row[8], created_at=row[9]
+            )
+            for row in rows
+        ]
@@ -1,16 +1,50 @@
+import os
 import logging
 import shutil
 import zipfile
 import json
+import zlib
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 
 from src.core.config_manager import ConfigManager
 from src.core.models import Character
 
 logger = logging.getLogger(__name__)
 
+@dataclass
+class RestorePlan:
+    """Result of a restore dry run: archive member names grouped by what restoring would do."""
+    zip_path: str
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+
+    @property
+    def pending(self) -> int:
+        return len(self.added) + len(self.changed)
+
+@dataclass
+class RepairPlan:
+    """What repair_library found (and, once executed, what it fixed)."""
+    orphan_json: List[str] = field(default_factory=list)
+    orphan_thumbs: List[str] = field(default_factory=list)
+    missing_metadata: Dict[str, float] = field(default_factory=dict) # stem -> .chf mtime
+    stale_temp: List[str] = field(default_factory=list)
+    results: Dict[str, int] = field(default_factory=lambda: {
+        "orphans_removed": 0, "metadata_created": 0, "thumbnails_removed": 0, "temp_removed": 0
+    })
+
+    @property
+    def pending(self) -> int:
+        return len(self.orphan_json) + len(self.orphan_thumbs) + len(self.missing_metadata) + len(self.stale_temp)
+
+    def summary(self) -> str:
+        return (f"{len(self.orphan_json)} orphaned metadata files, {len(self.orphan_thumbs)} orphaned thumbnails, "
+                f"{len(self.missing_metadata)} characters without metadata, {len(self.stale_temp)} stale temp files")
+
 class CharacterService:
     """
     Service class to handle business logic for Character operations:
@@ -19,14 +53,56 @@ class CharacterService:
     - Deployment to other environments (PTU, etc)
     - Backup
     """
+    STALE_TEMP_SECONDS = 3600 # .tmp_ files untouched this long belong to dead downloads
+
     def __init__(self, config_manager: ConfigManager):
         self.config_manager = config_manager
         self._observer = None
         self._watcher_running = False
+        self._coalescer = None
+        self._library_index = None
+        self._blob_store = None
+        self._incremental_backup = None
+        self._similarity_index = None
+        self._similarity_keys = {} # filename -> fingerprint currently in the similarity index
+
+    @property
+    def library_index(self):
+        """Persistent index of the installed library (created on first use)."""
+        if self._library_index is None:
+            from src.core.library_index import LibraryIndex
+            self._library_index = LibraryIndex(self.config_manager.config_dir)
+        return self._library_index
+
+    @property
+    def similarity_index(self):
+        """LSH index of installed .chf contents, filled by find_duplicates (created on first use)."""
+        if self._similarity_index is None:
+            from src.core.similarity_index import SimilarityIndex
+            self._similarity_index = SimilarityIndex()
+        return self._similarity_index
+
+    @property
+    def blob_store(self):
+        """Content-addressed store shared by deploys and snapshots (created on first use)."""
+        if self._blob_store is None:
+            from src.core.blob_store import BlobStore
+            self._blob_store = BlobStore(self.config_manager.config_dir)
+        return self._blob_store
+
+    @property
+    def incremental_backup(self):
+        """Deduplicated point-in-time backups of the library (created on first use)."""
+        if self._incremental_backup is None:
+            from src.core.incremental_backup import IncrementalBackup
+            self._incremental_backup = IncrementalBackup(self.config_manager.config_dir)
+        return self._incremental_backup
 
     def start_watcher(self, on_change_callback):
         """
         Starts watching the CustomCharacters folder for changes.
+        on_change_callback receives a list of LibraryChange deltas (added, modified,
+        removed, renamed) once the folder has been quiet for a short moment.
         """
         if self._watcher_running:
             return
@@ -34,19 +110,44 @@ class CharacterService:
         try:
             from watchdog.observers import Observer
             from watchdog.events import FileSystemEventHandler
+            from src.core.library_watcher import ChangeCoalescer
 
             path = self.get_game_path()
             if not path.exists():
                 return
 
+            coalescer = ChangeCoalescer(on_change_callback)
+            root = os.path.normcase(os.path.abspath(str(path)))
+
+            def in_root(p):
+                # Subfolders (e.g. _storage for loadouts) are not part of the active library
+                return os.path.normcase(os.path.dirname(os.path.abspath(p))) == root
+
             class Handler(FileSystemEventHandler):
-                def on_any_event(self, event):
+                def on_created(self, event):
+                    if not event.is_directory and in_root(event.src_path):
+                        coalescer.file_created(event.src_path)
+
+                def on_modified(self, event):
+                    if not event.is_directory and in_root(event.src_path):
+                        coalescer.file_modified(event.src_path)
+
+                def on_deleted(self, event):
+                    if not event.is_directory and in_root(event.src_path):
+                        coalescer.file_deleted(event.src_path)
+
+                def on_moved(self, event):
                     if event.is_directory:
                         return
-                    if event.src_path.endswith('.chf') or event.src_path.endswith('.json'):
-                         # Use a small debounce or just callback
-                         on_change_callback()
-
+                    src_in, dest_in = in_root(event.src_path), in_root(event.dest_path)
+                    if src_in and dest_in:
+                        coalescer.file_moved(event.src_path, event.dest_path)
+                    elif src_in:
+                        coalescer.file_deleted(event.src_path)
+                    elif dest_in:
+                        coalescer.file_created(event.dest_path)
+
+            self._coalescer = coalescer
             self._event_handler = Handler()
             self._observer = Observer()
             self._observer.schedule(self._event_handler, str(path), recursive=False)
@@ -64,6 +165,9 @@ class CharacterService:
             self._observer.join()
             self._observer = None
             self._watcher_running = False
+        if self._coalescer:
+            self._coalescer.cancel()
+            self._coalescer = None
 
     def get_game_path(self) -> Path:
         """Returns the configured game path as a Path object."""
@@ -109,116 +213,87 @@ class CharacterService:
             logger.error(f"Error uninstalling character {character.name}: {e}")
             raise e
 
-    def deploy_to_ptu(self) -> Tuple[int, int, List[str]]:
+    def _find_deploy_targets(self, live_path: Path) -> List[Tuple[str, Path]]:
         """
-        Copies characters from current (LIVE) to PTU/EPTU/TECH-PREVIEW if they exist.
-        Returns a tuple: (files_copied, environments_found, list_of_env_names).
-        Raises Exception on failure.
+        Finds the PTU/EPTU/TECH-PREVIEW CustomCharacters folders next to LIVE
+        (plus the custom PTU path from settings), creating them if the environment exists.
+        Assumes the standard structure: <Root>/StarCitizen/<Env>/USER/Client/0/CustomCharacters
         """
-        live_path = self.get_game_path()
-        if not live_path.exists():
-            raise FileNotFoundError("Source path not found")
-
-        # Logic: We are at .../LIVE/USER/Client/0/CustomCharacters
-        # We want to find .../PTU/... etc.
-        # This assumes the standard structure: <Root>/StarCitizen/<Env>/USER/Client/0/CustomCharacters
-        
-        # Robust navigation: Search up for "StarCitizen" directory
-        sc_root = None
-        current = live_path
-        # Traverse up to 6 levels to be safe
-        for _ in range(6):
-            if current.name == "StarCitizen":
-                sc_root = current
-                break
-            current = current.parent
-            if current == current.parent: # Reached root drive
-                break
-        
-        if not sc_root:
-             # Fallback: assume strict relative path if standard folder structure
-             # LIVE / USER / Client / 0 / CustomCharacters -> 5 parents up to StarCitizen
-             if "StarCitizen" in live_path.parts:
-                 # This handles cases where user might have nested it differently but kept "StarCitizen" name
-                 # We already tried walking up, maybe the folder name isn't "StarCitizen"?
-                 # Let's try to assume the common 'Roberts Space Industries/StarCitizen' structure or just siblings of "LIVE"
-                 # Parents: .parent (0), .parent (Client), .parent (USER), .parent (LIVE)
-                 # Wait, LIVE is usually the env folder.
-                 # path = .../StarCitizen/LIVE/USER/Client/0/CustomCharacters
-                 # So LIVE is path.parents[4]
-                 pass
-             
-             # If we couldn't find "StarCitizen" folder specifically, let's try to find the "Env" folder parent
-             # usually "LIVE".
-             # If user set path to X:/CustomCharacters we are lost unless we guess.
-             # Let's try to go up 5 levels and assume that's the base for parallel envs.
-             sc_root = live_path.parents[5]
-
-        deploy_targets = ["PTU", "EPTU", "TECH-PREVIEW"]
         found_targets = []
-        
+
         # 1. Check Custom PTU Path first
         custom_ptu = self.config_manager.get_custom_ptu_path()
         if custom_ptu and Path(custom_ptu).exists():
              found_targets.append(("Custom PTU", Path(custom_ptu)))
-        
-        # Verify which targets exist
-        for target in deploy_targets:
-            # We look for folders named PTU, EPTU parallel to the folder that contains "USER"
-            # Wait, strict structure is: StarCitizen / [LIVE|PTU] / USER / ...
-            # So we look for siblings of the directory that CONTAINS "USER".
-            # Usually live_path is .../LIVE/USER/Client/0/CustomCharacters
-            # live_path.parents[3] is .../LIVE/USER
-            # live_path.parents[4] is .../LIVE  <-- The Environment Folder
-            # So we want siblings of live_path.parents[4]
-            
-            # Let's be safer: Identify the environment directory.
-            # It's likely the one 5 levels up.
-            try:
-                env_dir_parent = live_path.parents[5] # .../StarCitizen
-                candidate_env = env_dir_parent / target
-                
-                if candidate_env.exists():
-                    # Construct full path
-                    target_full = candidate_env / "USER" / "Client" / "0" / "CustomCharacters"
-                    
-                    # Ensure it exists (create if needed, if parent env exists)
-                    try:
-                        target_full.mkdir(parents=True, exist_ok=True)
-                        found_targets.append((target, target_full))
-                    except Exception as e:
-                        logger.warning(f"Could not create dir for {target}: {e}")
-            except IndexError:
-                # Path too short?
+
+        # 2. Siblings of the environment folder: live_path.parents[3] is .../LIVE
+        try:
+            env_dir = live_path.parents[3]
+        except IndexError:
+            # Path too short to follow the standard layout
+            return found_targets
+        env_dir_parent = env_dir.parent # .../StarCitizen
+
+        for target in ["PTU", "EPTU", "TECH-PREVIEW"]:
+            candidate_env = env_dir_parent / target
+            if candidate_env == env_dir or not candidate_env.exists():
                 continue
+            target_full = candidate_env / "USER" / "Client" / "0" / "CustomCharacters"
+            # Ensure it exists (create if needed, if parent env exists)
+            try:
+                target_full.mkdir(parents=True, exist_ok=True)
+                found_targets.append((target, target_full))
+            except Exception as e:
+                logger.warning(f"Could not create dir for {target}: {e}")
 
-        if not found_targets:
-            return 0, 0, []
+        return found_targets
 
-        count = 0
-        # Get all .chf files
-        files = list(live_path.glob('*.chf'))
-        
-        for f in files:
-            for _, dest_path in found_targets:
-                shutil.copy2(f, dest_path / f.name)
-            count += 1
-            
-        return count, len(found_targets), [t[0] for t in found_targets]
+    def deploy_to_ptu(self, dry_run: bool = False, progress_callback=None, plan=None):
+        """
+        Syncs characters from current (LIVE) to PTU/EPTU/TECH-PREVIEW if they exist.
+        Only new or changed files are copied (size/mtime, then hash); copies run in a
+        thread pool across all targets and share storage through the blob store.
+
+        dry_run: only compute the plan (nothing is written).
+        plan: a plan from a previous dry run to execute as-is.
+        Returns a DeployPlan with the operations and per-target stats
+        (no targets -> empty stats). Raises Exception on failure.
+        """
+        from src.core.deploy_sync import plan_sync, execute_plan
+
+        live_path = self.get_game_path()
+        if not live_path.exists():
+            raise FileNotFoundError("Source path not found")
+
+        if plan is None:
+            targets = [(name, str(path)) for name, path in self._find_deploy_targets(live_path)]
+            plan = plan_sync(str(live_path), targets, self.blob_store.digest)
+        if dry_run:
+            return plan
+
+        execute_plan(plan, self.blob_store.place, progress_callback=progress_callback)
+        logger.info(f"Deploy finished:\n{plan.summary()}")
+        return plan
 
-    def create_backup(self, target_zip_path: str) -> None:
+    def create_backup(self, target_zip_path: str, progress_callback=None) -> None:
         """
         Creates a zip backup of all installed characters.
+        Members are compressed in parallel; the level comes from the
+        "backup_compression" setting (fast/balanced/max).
         """
+        from src.core.archive_writer import write_archive, DEFAULT_COMPRESSION
+
         source_dir = self.get_game_path()
         if not source_dir.exists():
              raise FileNotFoundError("Source directory not found")
 
-        with zipfile.ZipFile(target_zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # Parse directory
-            for file_path in source_dir.iterdir():
-                if file_path.is_file() and (file_path.suffix == '.chf' or file_path.suffix == '.json'):
-                    zipf.write(file_path, arcname=file_path.name)
+        members = [
+            (file_path.name, str(file_path))
+            for file_path in sorted(source_dir.iterdir())
+            if file_path.is_file() and (file_path.suffix == '.chf' or file_path.suffix == '.json')
+        ]
+        level = self.config_manager.config.get("backup_compression", DEFAULT_COMPRESSION)
+        write_archive(target_zip_path, members, level=level, progress_callback=progress_callback)
 
     def save_custom_thumbnail(self, character: Character, image_path: str) -> bool:
         """
@@ -254,9 +329,56 @@ class CharacterService:
             logger.error(f"Failed to save thumbnail: {e}")
             return False
 
-    def restore_backup(self, zip_path: str) -> int:
+    @staticmethod
+    def _restorable_members(zipf: zipfile.ZipFile) -> List[zipfile.ZipInfo]:
+        members = []
+        # Filter for .chf and .json files to be safe
+        for info in zipf.infolist():
+            name = info.filename
+            if info.is_dir() or not (name.endswith('.chf') or name.endswith('.json')):
+                continue
+            # Security check: prevent directory traversal
+            if ".." in name or name.startswith("/") or name.startswith("\\") or ":" in name:
+                logger.warning(f"Skipping suspicious file in backup: {name}")
+                continue
+            members.append(info)
+        return members
+
+    @staticmethod
+    def _file_crc32(path: Path) -> int:
+        crc = 0
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                crc = zlib.crc32(block, crc)
+        return crc
+
+    def plan_restore(self, zip_path: str) -> RestorePlan:
+        """
+        Dry run of restore_backup: compares every member's size and CRC-32 (from the
+        zip directory, nothing is decompressed) against the installed file.
+        """
+        path = self.get_game_path()
+        plan = RestorePlan(zip_path=zip_path)
+        try:
+            with zipfile.ZipFile(zip_path, 'r') as zipf:
+                for info in self._restorable_members(zipf):
+                    dest = path / info.filename
+                    if not dest.exists():
+                        plan.added.append(info.filename)
+                    elif dest.stat().st_size != info.file_size or self._file_crc32(dest) != info.CRC:
+                        plan.changed.append(info.filename)
+                    else:
+                        plan.unchanged.append(info.filename)
+        except zipfile.BadZipFile:
+            raise Exception("Invalid zip file.")
+        return plan
+
+    def restore_backup(self, zip_path: str, progress_callback=None, plan: Optional[RestorePlan] = None) -> int:
         """
         Restores characters from a zip backup to the game path.
+        Only members that are missing or differ from the installed file are written
+        (streamed to a temp file, then moved into place).
+        progress_callback receives (done, total) over the members being written.
         Returns the number of characters (.chf files) restored.
         """
         path = self.get_game_path()
@@ -266,23 +388,27 @@ class CharacterService:
             except Exception as e:
                 raise Exception(f"Destination directory does not exist and cannot be created: {e}")
 
+        if plan is None:
+            plan = self.plan_restore(zip_path)
+        to_write = plan.added + plan.changed
+
         count = 0
         try:
             with zipfile.ZipFile(zip_path, 'r') as zipf:
-                # Filter for .chf and .json files to be safe
-                files_to_extract = [f for f in zipf.namelist() if f.endswith('.chf') or f.endswith('.json')]
-                
-                for file in files_to_extract:
-                    # Security check: prevent directory traversal
-                    if ".." in file or file.startswith("/") or file.startswith("\\"):
-                        logger.warning(f"Skipping suspicious file in backup: {file}")
-                        continue
-                        
-                    zipf.extract(file, path)
-                    if file.endswith('.chf'):
+                for done, name in enumerate(to_write, 1):
+                    dest = path / name
+                    dest.parent.mkdir(parents=True, exist_ok=True)
+                    tmp = dest.with_name(f".tmp_{dest.name}")
+                    with zipf.open(name) as src, open(tmp, 'wb') as out:
+                        shutil.copyfileobj(src, out, 1024 * 1024)
+                    os.replace(tmp, dest)
+                    if name.endswith('.chf'):
                         count += 1
+                    if progress_callback:
+                        progress_callback(done, len(to_write))
                         
-            logger.info(f"Restored {count} characters from backup: {zip_path}")
+            logger.info(f"Restored {count} characters from backup: {zip_path} "
+                        f"({len(plan.added)} added, {len(plan.changed)} changed, {len(plan.unchanged)} unchanged)")
             return count
             
         except zipfile.BadZipFile:
@@ -333,196 +459,376 @@ class CharacterService:
 
 
             
-    def repair_library(self) -> dict:
+    def plan_repair(self) -> RepairPlan:
         """
-        Scans the library for inconsistencies:
-        1. Deletes orphaned .json files (no matching .chf)
-        2. Creates default .json for orphaned .chf files
-        
-        Returns a summary dict.
+        Lists the library once and works out what repair_library would fix:
+        sidecars and thumbnails without a .chf, .chf files without metadata, and
+        .tmp_ leftovers of interrupted downloads that haven't been touched for a while.
         """
+        plan = RepairPlan()
         path = self.get_game_path()
         if not path.exists():
-            return {"orphans_removed": 0, "metadata_created": 0}
-            
-        orphans_removed = 0
-        metadata_created = 0
-        
-        # Get all files
-        all_files = list(path.iterdir())
-        chf_files = {f.stem for f in all_files if f.suffix.lower() == '.chf'}
-        json_files = {f.stem for f in all_files if f.suffix.lower() == '.json'}
-        
-        # 1. Check for orphaned JSONs
-        for stem in json_files:
-            if stem not in chf_files:
-                try:
-                    (path / f"{stem}.json").unlink()
-                    orphans_removed += 1
-                except Exception as e:
-                    logger.error(f"Failed to remove orphan json {stem}: {e}")
-                    
-        # 2. Check for missing JSONs
-        from src.core.models import Character
-        from datetime import datetime
-        
-        for stem in chf_files:
-            if stem not in json_files:
-                # Create default metadata
-                try:
-                    file_stat = (path / f"{stem}.chf").stat()
-                    # Use filename as name, replace underscores
-                    name = stem.replace('_', ' ').title()
-                    
-                    data = {
-                        "id": stem, # Use stem as ID
-                        "name": name,
-                        "description": "Recovered by Maintenance Tool",
-                        "author": "Unknown",
-                        "download_url": "",
-                        "image_url": "",
-                        "installed_at": file_stat.st_mtime,
-                        "tags": ["Recovered"]
-                    }
-                    
-                    with open(path / f"{stem}.json", 'w', encoding='utf-8') as f:
-                        json.dump(data, f, indent=4)
-                        
-                    metadata_created += 1
-                except Exception as e:
-                     logger.error(f"Failed to create metadata for {stem}: {e}")
+            return plan
+
+        chf_stems = {}
+        json_stems = set()
+        thumbs = {}
+        now = datetime.now().timestamp()
+        with os.scandir(path) as it:
+            for entry in it:
+                if not entry.is_file():
+                    continue
+                name = entry.name
+                lower = name.lower()
+                if name.startswith('.tmp_'):
+                    # Recent ones may still be downloading (or resuming)
+                    if now - entry.stat().st_mtime > self.STALE_TEMP_SECONDS:
+                        plan.stale_temp.append(name)
+                elif lower.endswith('.chf'):
+                    chf_stems[name[:-4]] = entry.stat().st_mtime
+                elif lower.endswith('_thumb.jpg'):
+                    thumbs[name[:-len('_thumb.jpg')]] = name
+                elif lower.endswith('.json'):
+                    json_stems.add(name[:-5])
+
+        plan.orphan_json = sorted(f"{stem}.json" for stem in json_stems if stem not in chf_stems)
+        plan.orphan_thumbs = sorted(name for stem, name in thumbs.items() if stem not in chf_stems)
+        plan.missing_metadata = {stem: mtime for stem, mtime in sorted(chf_stems.items()) if stem not in json_stems}
+        plan.stale_temp.sort()
+        return plan
+
+    def repair_library(self, dry_run: bool = False, plan: Optional[RepairPlan] = None,
+                       max_workers: Optional[int] = None) -> RepairPlan:
+        """
+        Fixes the inconsistencies found by plan_repair:
+        1. Deletes orphaned .json files and thumbnails (no matching .chf)
+        2. Creates default .json for orphaned .chf files
+        3. Deletes stale .tmp_ download leftovers
 
-        logger.info(f"Library repair: Removed {orphans_removed} orphans, Created {metadata_created} metadata files.")
-        
-        return {
-            "orphans_removed": orphans_removed, 
-            "metadata_created": metadata_created
-        }
-        return {
-            "orphans_removed": orphans_removed, 
-            "metadata_created": metadata_created
-        }
+        dry_run: only compute the plan (nothing is touched).
+        plan: a plan from a previous dry run to execute as-is.
+        Deletions and metadata writes run in a thread pool; metadata is written to a
+        temp file and renamed into place. Returns the plan with `results` filled in.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        if plan is None:
+            plan = self.plan_repair()
+        if dry_run or not plan.pending:
+            return plan
 
-    def validate_library_integrity(self) -> List[dict]:
+        path = self.get_game_path()
+
+        def remove(kind, name):
+            try:
+                (path / name).unlink()
+                return kind
+            except FileNotFoundError:
+                return None
+            except OSError as e:
+                logger.error(f"Failed to remove {name}: {e}")
+                return None
+
+        def create_metadata(stem, mtime):
+            data = {
+                "id": stem, # Use stem as ID
+                # Use filename as name, replace underscores
+                "name": stem.replace('_', ' ').title(),
+                "description": "Recovered by Maintenance Tool",
+                "author": "Unknown",
+                "download_url": "",
+                "image_url": "",
+                "installed_at": mtime,
+                "tags": ["Recovered"]
+            }
+            tmp = path / f".tmp_{stem}.json"
+            try:
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=4)
+                os.replace(tmp, path / f"{stem}.json")
+                return "metadata_created"
+            except OSError as e:
+                logger.error(f"Failed to create metadata for {stem}: {e}")
+                if tmp.exists():
+                    tmp.unlink()
+                return None
+
+        with ThreadPoolExecutor(max_workers=max_workers or min(8, os.cpu_count() or 1)) as pool:
+            futures = [pool.submit(remove, "orphans_removed", n) for n in plan.orphan_json]
+            futures += [pool.submit(remove, "thumbnails_removed", n) for n in plan.orphan_thumbs]
+            futures += [pool.submit(remove, "temp_removed", n) for n in plan.stale_temp]
+            futures += [pool.submit(create_metadata, stem, mtime) for stem, mtime in plan.missing_metadata.items()]
+            for future in futures:
+                kind = future.result()
+                if kind:
+                    plan.results[kind] += 1
+
+        logger.info(f"Library repair: {plan.summary()}")
+        return plan
+
+    def validate_library_integrity(self, max_workers: Optional[int] = None) -> List[dict]:
         """
-        Scans all .chf files and checks if they have a valid header/size.
+        Checks every .chf for an empty, truncated, blank or foreign (zip, image,
+        html, json...) payload. Files are read through memory maps in a thread
+        pool; verdicts are cached in the library index by (size, mtime), so a
+        repeat run only reads files that changed. The content fingerprint taken
+        on the way is cached too, so get_fingerprints() needn't read them again.
         Returns a list of dicts with error details: {'filename': str, 'error': str}
         """
+        from concurrent.futures import ThreadPoolExecutor
+        from src.core.chf_format import inspect_file
+
         path = self.get_game_path()
-        errors = []
-        
         if not path.exists():
             return []
-            
-        for file_path in path.glob("*.chf"):
+
+        index = self.library_index
+        stats = index.list_directory(str(path))
+        chf_files = {
+            name: st for name, st in stats.items()
+            if name.lower().endswith('.chf') and not name.startswith('.tmp_')
+        }
+        cached = index.get_integrity(str(path))
+
+        verdicts = {}
+        to_check = []
+        for name, st in chf_files.items():
+            hit = cached.get(name)
+            if hit and hit[0] == st.st_size and hit[1] == st.st_mtime_ns:
+                verdicts[name] = hit
+            else:
+                to_check.append(name)
+
+        def check(name):
+            st = chf_files[name]
             try:
-                if file_path.stat().st_size == 0:
-                    errors.append({'filename': file_path.name, 'error': 'Empty file (0 bytes)'})
-                    continue
-                    
-                # Read first bytes
-                with open(file_path, 'rb') as f:
-                    header = f.read(4)
-                    # SC characters usually are binary or encoded. 
-                    # We just check we can read it. 
-                    # TODO: Identify known magic bytes for CryXml or similar if public.
-                    pass
-            except Exception as e:
-                errors.append({'filename': file_path.name, 'error': str(e)})
-                
+                sha, error = inspect_file(str(path / name))
+            except (OSError, ValueError) as e:
+                return name, None, str(e)
+            return name, (st.st_size, st.st_mtime_ns, sha, error), None
+
+        fresh = {}
+        errors = []
+        if to_check:
+            with ThreadPoolExecutor(max_workers=max_workers or min(8, os.cpu_count() or 1)) as pool:
+                for name, verdict, read_error in pool.map(check, to_check):
+                    if verdict is None:
+                        # Unreadable right now (locked...): report but don't cache
+                        errors.append({'filename': name, 'error': read_error})
+                    else:
+                        fresh[name] = verdict
+        verdicts.update(fresh)
+        index.store_integrity(str(path), fresh, removed=[n for n in cached if n not in chf_files])
+        index.store_fingerprints(str(path), {name: v[:3] for name, v in fresh.items()})
+
+        for name in sorted(verdicts):
+            if verdicts[name][3]:
+                errors.append({'filename': name, 'error': verdicts[name][3]})
+        logger.info(f"Integrity check: {len(chf_files)} files, {len(to_check)} read, {len(errors)} problems")
         return errors
 
+    def get_fingerprints(self, filenames: Optional[List[str]] = None) -> Dict[str, str]:
+        """
+        Content fingerprints of installed characters ({filename: fingerprint}), so
+        characters can be compared by content rather than by name. Cached in the
+        library index; see chf_format.ChfFile.fingerprint.
+        """
+        path = self.get_game_path()
+        if not path.exists():
+            return {}
+        return self.library_index.fingerprints(str(path), filenames)
+
+    def find_duplicates(self, threshold: Optional[float] = None, max_workers: Optional[int] = None) -> List[List[str]]:
+        """
+        Groups installed characters whose .chf contents are identical or nearly so
+        (re-uploads under another name, "_1" copies...). Returns lists of filenames,
+        largest group first.
+
+        Signatures are cached per content fingerprint in the library index and kept
+        in an in-memory LSH index between calls, so only new or changed files are read.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        from src.core import similarity_index as sim
+
+        prints = self.get_fingerprints()
+        index = self.similarity_index
+        # Drop files that are gone or whose content changed
+        for filename in [f for f, fp in self._similarity_keys.items() if prints.get(f) != fp]:
+            index.remove(filename)
+            del self._similarity_keys[filename]
+
+        new_files = [f for f in prints if f not in self._similarity_keys]
+        if new_files:
+            cached = self.library_index.get_minhashes(list({prints[f] for f in new_files}))
+            missing = {prints[f]: f for f in new_files if prints[f] not in cached}
+            path = self.get_game_path()
+
+            def compute(fp):
+                try:
+                    return fp, sim.pack(sim.file_minhash(str(path / missing[fp])))
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Could not read {missing[fp]}: {e}")
+                    return fp, None
+
+            if missing:
+                with ThreadPoolExecutor(max_workers=max_workers or min(8, os.cpu_count() or 1)) as pool:
+                    fresh = {fp: blob for fp, blob in pool.map(compute, missing) if blob is not None}
+                self.library_index.store_minhashes(fresh)
+                cached.update(fresh)
+
+            for filename in new_files:
+                blob = cached.get(prints[filename])
+                if blob is not None:
+                    index.add(filename, sim.unpack(blob))
+                    self._similarity_keys[filename] = prints[filename]
+
+        groups = index.clusters(sim.DEFAULT_THRESHOLD if threshold is None else threshold)
+        logger.info(f"Duplicate scan: {len(index)} files, {len(groups)} groups")
+        return groups
+
     def _get_storage_path(self) -> Path:
         """Returns path to the '_storage' folder inside CustomCharacters used for swapping loadouts."""
         path = self.get_game_path() / "_storage"
         path.mkdir(exist_ok=True)
         return path
 
+    LOADOUT_MANIFEST = "loadout_manifest.json"
+
+    @staticmethod
+    def _loadout_files(directory: Path, filename: str) -> List[str]:
+        """Files that travel with a character: .chf, .json sidecar and custom thumbnail."""
+        stem = Path(filename).stem
+        return [name for name in (filename, f"{stem}.json", f"{stem}_thumb.jpg") if (directory / name).exists()]
+
+    def plan_loadout(self, collection_name: str, collection_manager) -> dict:
+        """
+        Computes the minimal set of moves to make `collection_name` the active loadout.
+        Active and stored characters come from the library index, so only sidecars
+        that changed since the last scan are parsed.
+        Returns {"to_store": [filenames], "to_activate": [filenames], "active": n}.
+        """
+        game_path = self.get_game_path()
+        storage_path = self._get_storage_path()
+        targets = set(collection_manager.collections.get(collection_name, []))
+
+        def wanted(char: Character) -> bool:
+            # Collections store the file stem; entries not yet migrated may hold the name
+            return Path(char.local_filename).stem in targets or char.name in targets
+
+        active, _ = self.library_index.scan(str(game_path))
+        stored, _ = self.library_index.scan(str(storage_path))
+        active_names = {c.local_filename for c in active}
+
+        to_store = sorted(c.local_filename for c in active if not wanted(c))
+        to_activate = sorted(
+            c.local_filename for c in stored
+            if wanted(c) and c.local_filename not in active_names
+        )
+        kept = len(active) - len(to_store)
+        return {"to_store": to_store, "to_activate": to_activate, "active": kept + len(to_activate)}
+
     def deploy_collection_as_loadout(self, collection_name: str, collection_manager) -> Tuple[int, int]:
         """
         Implementation of the Loadout System.
-        1. Moves ALL characters from root CustomCharacters to _storage.
-        2. Moves characters belonging to 'collection_name' from _storage (or root) back to root.
-        
+        Only the difference between the active set and the collection is moved:
+        characters outside the collection go to _storage, stored members come back.
+        The moves are recorded in _storage/loadout_manifest.json before they run, so an
+        interrupted switch is completed on the next call and the last switch can be undone.
+
         Returns (active_count, stored_count)
         """
         game_path = self.get_game_path()
-        storage_path = self._get_storage_path()
-        
         if not game_path.exists():
             return 0, 0
-            
-        target_names = set(collection_manager.collections.get(collection_name, []))
-        
-        # 1. Consolidate everything to storage first
-        # (This effectively "Unequips" everything)
-        # We move .chf and .json
-        moved_to_storage = 0
-        
-        # Move From Game -> Storage
-        for file_path in game_path.iterdir():
-            if file_path.is_file() and file_path.suffix in ['.chf', '.json']:
-                # Move to storage
-                try:
-                    shutil.move(str(file_path), str(storage_path / file_path.name))
-                    moved_to_storage += 1
-                except Exception as e:
-                    logger.error(f"Failed to move {file_path.name} to storage: {e}")
-
-        # 2. Deploy requested collection
-        # Move From Storage -> Game
-        deployed_count = 0
-        
-        # Iterate storage to find matches
-        # Note: target_names usually contains 'Project Name' or 'Filename' depending on how it was saved.
-        # Collection Manager stores 'character.name' usually
-        # But we need to match filename.
-        # We need to map Name -> Filename.
-        # This is tricky if metadata is separate. 
-        # Strategy: Scan storage, read JSONs (names) to match, then move.
-        
-        # Pre-scan storage for ID/Name mapping
-        storage_map = {} # Name -> [chf_path, json_path]
-        
-        for json_file in storage_path.glob("*.json"):
-            try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    name = data.get('name')
-                    if name:
-                        stem = json_file.stem
-                        chf_path = storage_path / f"{stem}.chf"
-                        if chf_path.exists():
-                            storage_map[name] = (chf_path, json_file)
-            except: 
+        storage_path = self._get_storage_path()
+
+        # Finish a switch that was interrupted (crash, locked file...) before planning a new one
+        manifest = self._read_loadout_manifest()
+        if manifest and manifest.get("state") == "in_progress":
+            logger.info(f"Resuming interrupted loadout switch to '{manifest.get('collection')}'")
+            self._run_loadout_ops(manifest)
+
+        plan = self.plan_loadout(collection_name, collection_manager)
+        ops = []
+        for filename in plan["to_store"]:
+            ops.extend({"file": name, "to": "storage"} for name in self._loadout_files(game_path, filename))
+        for filename in plan["to_activate"]:
+            ops.extend({"file": name, "to": "game"} for name in self._loadout_files(storage_path, filename))
+
+        if ops:
+            self._run_loadout_ops({
+                "collection": collection_name,
+                "created_at": datetime.now().isoformat(),
+                "state": "in_progress",
+                "ops": ops
+            })
+        logger.info(f"Loadout '{collection_name}': stored {len(plan['to_store'])}, activated {len(plan['to_activate'])} ({len(ops)} file moves)")
+        return plan["active"], len(plan["to_store"])
+
+    def undo_last_loadout(self) -> int:
+        """Reverses the moves of the last completed loadout switch. Returns the number of files moved back."""
+        manifest = self._read_loadout_manifest()
+        if not manifest or manifest.get("state") == "undone" or not manifest.get("ops"):
+            return 0
+        if manifest.get("state") == "in_progress":
+            self._run_loadout_ops(manifest)
+
+        reverse = [
+            {"file": op["file"], "to": "game" if op["to"] == "storage" else "storage"}
+            for op in reversed(manifest["ops"])
+        ]
+        moved = self._run_loadout_ops({
+            "collection": manifest.get("collection"),
+            "created_at": datetime.now().isoformat(),
+            "state": "in_progress",
+            "ops": reverse
+        }, final_state="undone")
+        logger.info(f"Undid loadout switch to '{manifest.get('collection')}' ({moved} files)")
+        return moved
+
+    def _read_loadout_manifest(self) -> Optional[dict]:
+        path = self._get_storage_path() / self.LOADOUT_MANIFEST
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unreadable loadout manifest: {e}")
+            return None
+
+    def _write_loadout_manifest(self, manifest: dict):
+        path = self._get_storage_path() / self.LOADOUT_MANIFEST
+        tmp = path.with_name(f".tmp_{path.name}")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=4)
+        os.replace(tmp, path)
+
+    def _run_loadout_ops(self, manifest: dict, final_state: str = "done") -> int:
+        """
+        Writes the manifest, then applies its moves. Every move is a rename inside the
+        same folder tree and is idempotent (already-moved files are skipped), so a
+        half-applied manifest can simply be run again.
+        """
+        game_path = self.get_game_path()
+        storage_path = self._get_storage_path()
+        self._write_loadout_manifest(manifest)
+
+        moved = 0
+        for op in manifest["ops"]:
+            src_dir, dest_dir = (game_path, storage_path) if op["to"] == "storage" else (storage_path, game_path)
+            src, dest = src_dir / op["file"], dest_dir / op["file"]
+            if not src.exists():
+                continue # Already moved by an earlier, interrupted run
+            if dest.exists():
+                logger.warning(f"Loadout: {dest} already exists, leaving {op['file']} in place")
                 continue
-                
-        # Also map by filename just in case collection stores IDs
-        
-        for target in target_names:
-            # Check if target is in storage map
-            paths = storage_map.get(target)
-            
-            if paths:
-                chf, meta = paths
-                try:
-                    shutil.move(str(chf), str(game_path / chf.name))
-                    shutil.move(str(meta), str(game_path / meta.name))
-                    deployed_count += 1
-                except Exception as e:
-                    logger.error(f"Failed to deploy {target}: {e}")
-            else:
-                # Maybe target is the filename?
-                # Check if target exists as file in storage
-                potential_chf = storage_path / f"{target}.chf"
-                if potential_chf.exists():
-                     potential_json = storage_path / f"{target}.json"
-                     try:
-                        shutil.move(str(potential_chf), str(game_path / potential_chf.name))
-                        if potential_json.exists():
-                             shutil.move(str(potential_json), str(game_path / potential_json.name))
-                        deployed_count += 1
-                     except Exception as e:
-                        print(e)
-
-        return deployed_count, moved_to_storage
+            try:
+                os.rename(src, dest)
+                moved += 1
+            except OSError as e:
+                logger.error(f"Failed to move {op['file']} to {op['to']}: {e}")
+
+        manifest["state"] = final_state
+        self._write_loadout_manifest(manifest)
+        return moved
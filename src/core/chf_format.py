@@ -0,0 +1,157 @@
+import os
+import mmap
+import hashlib
+import logging
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# The .chf layout is not publicly documented, so checks stay conservative:
+# only files that are clearly not a character export are flagged.
+MIN_SIZE = 64 # bytes; anything smaller cannot hold a character
+HEADER_SIZE = 16
+PADDING_BLOCK = 64 * 1024
+
+# Signatures of files that commonly end up renamed to .chf by mistake
+# (downloaded archives/pages, images, metadata sidecars)
+FOREIGN_SIGNATURES = (
+    (b"PK\x03\x04", "ZIP archive"),
+    (b"Rar!", "RAR archive"),
+    (b"7z\xbc\xaf\x27\x1c", "7-Zip archive"),
+    (b"\x89PNG", "PNG image"),
+    (b"\xff\xd8\xff", "JPEG image"),
+    (b"GIF8", "GIF image"),
+    (b"RIFF", "RIFF/WebP file"),
+    (b"%PDF", "PDF document"),
+    (b"<!DOCTYPE", "HTML page"),
+    (b"<html", "HTML page"),
+    (b"<?xml", "XML document"),
+)
+
+def check_header(header: bytes, size: int) -> Optional[str]:
+    """Returns an error message for an obviously invalid .chf, or None."""
+    if size == 0:
+        return "Empty file (0 bytes)"
+    if size < MIN_SIZE:
+        return f"Truncated file ({size} bytes)"
+    for signature, kind in FOREIGN_SIGNATURES:
+        if header.startswith(signature):
+            return f"Not a character file ({kind})"
+    stripped = header.lstrip(b" \t\r\n\xef\xbb\xbf")
+    if stripped[:1] in (b"{", b"["):
+        return "Not a character file (JSON text)"
+    if stripped[:1] == b"<":
+        return "Not a character file (markup text)"
+    return None
+
+class ChfFile:
+    """
+    Read-only, memory-mapped view of a .chf character file.
+
+    Nothing is copied into Python bytes unless asked for: the header is a 16 byte
+    slice, the body is exposed as a memoryview, and the fingerprint is hashed
+    straight from the map. Exported characters are padded with trailing zero
+    bytes; the padding is not part of the content.
+
+        with ChfFile(path) as chf:
+            chf.fingerprint(), chf.check()
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.size = 0
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        self._content_end: Optional[int] = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def open(self):
+        self._file = open(self.path, 'rb')
+        self.size = os.fstat(self._file.fileno()).st_size
+        if self.size:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @property
+    def header(self) -> bytes:
+        return self._map[:HEADER_SIZE] if self._map is not None else b""
+
+    @property
+    def content_end(self) -> int:
+        """Offset just past the last non-zero byte (i.e. the size without padding)."""
+        if self._content_end is None:
+            self._content_end = self._find_content_end()
+        return self._content_end
+
+    def _find_content_end(self) -> int:
+        if self._map is None:
+            return 0
+        end = self.size
+        while end > 0:
+            start = max(0, end - PADDING_BLOCK)
+            block = self._map[start:end]
+            stripped = len(block.rstrip(b"\x00"))
+            if stripped:
+                return start + stripped
+            end = start
+        return 0
+
+    def content_view(self) -> memoryview:
+        """The whole file without its trailing padding."""
+        if self._map is None:
+            return memoryview(b"")
+        return memoryview(self._map)[:self.content_end]
+
+    def body_view(self) -> memoryview:
+        """The payload after the header, without padding."""
+        if self._map is None:
+            return memoryview(b"")
+        return memoryview(self._map)[min(HEADER_SIZE, self.content_end):self.content_end]
+
+    def fingerprint(self) -> str:
+        """
+        Stable content id: SHA-256 of the file without its trailing zero padding,
+        so the same character exported with different padding compares equal.
+        """
+        sha = hashlib.sha256()
+        with self.content_view() as view:
+            sha.update(view)
+        return sha.hexdigest()
+
+    def check(self) -> Optional[str]:
+        """
+        Integrity verdict: an error message for an obviously invalid file, or None.
+        A file that is all zero bytes (pre-allocated but never written, e.g. an
+        interrupted copy) is flagged too.
+        """
+        error = check_header(self.header, self.size)
+        # Only scan for content when the header already looks blank
+        if error is None and self.header.count(0) == HEADER_SIZE and self.content_end == 0:
+            error = "File contains only zero bytes"
+        return error
+
+def fingerprint(path: str) -> str:
+    """Content fingerprint of a .chf file (see ChfFile.fingerprint)."""
+    with ChfFile(path) as chf:
+        return chf.fingerprint()
+
+def inspect_file(path: str) -> Tuple[str, Optional[str]]:
+    """
+    Reads a .chf once through a memory map. Returns (fingerprint, error or None);
+    the fingerprint is the same one fingerprint() gives, so it can be cached for both.
+    """
+    with ChfFile(path) as chf:
+        return chf.fingerprint(), chf.check()
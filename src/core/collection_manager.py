@@ -1,76 +1,198 @@
-
 import json
 import os
 import logging
-from typing import Dict, List, Set
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Set, Union
+
+from src.core.models import Character
+
+CharacterRef = Union[Character, str]
 
 class CollectionManager:
     """
     Manages custom user collections/groups for characters.
     Data is stored in 'collections.json' in the config directory.
+
+    Members are stable character IDs (the installed file stem, see character_id),
+    so editing a character's display name doesn't drop it from its collections.
+    Membership is kept as sets plus a reverse index (character -> collections),
+    making every per-character lookup O(1).
     """
+    FORMAT_VERSION = 2
+
     def __init__(self, config_dir: str):
         self.config_dir = config_dir
         self.file_path = os.path.join(config_dir, "collections.json")
-        self.collections: Dict[str, List[str]] = {} # Name -> List of Character Names (IDs)
+        self.collections: Dict[str, Set[str]] = {} # Name -> set of character IDs
+        self._membership: Dict[str, Set[str]] = {} # Character ID -> collection names
+        self._batch_depth = 0
+        self._dirty = False
+        self._legacy_names = False # v1 file: members may still be display names
         self.load()
 
+    @staticmethod
+    def character_id(character: CharacterRef) -> str:
+        """Stable ID of a character: its file stem when installed, else its name. Strings pass through."""
+        if isinstance(character, str):
+            return character
+        if character.local_filename:
+            return os.path.splitext(character.local_filename)[0]
+        return character.name
+
     def load(self):
+        self.collections = {}
         if os.path.exists(self.file_path):
             try:
                 with open(self.file_path, 'r', encoding='utf-8') as f:
-                    self.collections = json.load(f)
+                    data = json.load(f)
+                if data.get("version") == self.FORMAT_VERSION:
+                    raw = data.get("collections", {})
+                else:
+                    # v1: {name: [character names]}
+                    raw = data
+                    self._legacy_names = True
+                self.collections = {name: set(members) for name, members in raw.items()}
             except Exception as e:
                 logging.error(f"Failed to load collections: {e}")
                 self.collections = {}
-        else:
-            self.collections = {}
+        self._rebuild_membership()
+
+    def _rebuild_membership(self):
+        self._membership = {}
+        for name, members in self.collections.items():
+            for char_id in members:
+                self._membership.setdefault(char_id, set()).add(name)
 
     def save(self):
+        """Writes collections.json atomically; inside batch() the write is deferred to the end."""
+        if self._batch_depth:
+            self._dirty = True
+            return
+        self._dirty = False
+        data = {
+            "version": self.FORMAT_VERSION,
+            "collections": {name: sorted(members) for name, members in self.collections.items()}
+        }
+        tmp = f"{self.file_path}.tmp"
         try:
-            with open(self.file_path, 'w', encoding='utf-8') as f:
-                json.dump(self.collections, f, indent=4)
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=4)
+            os.replace(tmp, self.file_path)
         except Exception as e:
             logging.error(f"Failed to save collections: {e}")
 
+    @contextmanager
+    def batch(self):
+        """Groups several changes into a single save."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._dirty:
+                self.save()
+
+    def migrate_legacy_names(self, characters: Iterable[Character]):
+        """
+        Rewrites members of a v1 file (display names) to stable IDs, using the
+        installed characters. Runs once; unmatched entries are kept as they are.
+        """
+        if not self._legacy_names:
+            return
+        characters = list(characters)
+        for name, members in self.collections.items():
+            self.collections[name] = set(self.resolve_ids(members, characters))
+        self._rebuild_membership()
+        self._legacy_names = False
+        self.save()
+
+    def resolve_ids(self, members: Iterable[str], characters: Iterable[Character]) -> List[str]:
+        """
+        Maps member entries that may be display names (v1 files, older pack
+        manifests) to the stable IDs of the given characters. Entries that already
+        are one of their IDs, or match no name, are kept as they are.
+        """
+        known = set()
+        by_name = {}
+        for char in characters:
+            char_id = self.character_id(char)
+            known.add(char_id)
+            by_name.setdefault(char.name, char_id)
+        return [member if member in known else by_name.get(member, member) for member in members]
+
     def get_all_collections(self) -> List[str]:
         return list(self.collections.keys())
 
     def create_collection(self, name: str) -> bool:
         if name not in self.collections:
-            self.collections[name] = []
+            self.collections[name] = set()
             self.save()
             return True
         return False
 
     def delete_collection(self, name: str):
         if name in self.collections:
-            del self.collections[name]
+            for char_id in self.collections.pop(name):
+                self._unlink(char_id, name)
             self.save()
 
-    def add_to_collection(self, collection_name: str, character_name: str):
-        if collection_name in self.collections:
-            if character_name not in self.collections[collection_name]:
-                self.collections[collection_name].append(character_name)
-                self.save()
+    def _unlink(self, char_id: str, collection_name: str):
+        names = self._membership.get(char_id)
+        if names is not None:
+            names.discard(collection_name)
+            if not names:
+                del self._membership[char_id]
 
-    def remove_from_collection(self, collection_name: str, character_name: str):
-        if collection_name in self.collections:
-            if character_name in self.collections[collection_name]:
-                self.collections[collection_name].remove(character_name)
-                self.save()
+    def add_to_collection(self, collection_name: str, character: CharacterRef):
+        self.add_many(collection_name, [character])
+
+    def add_many(self, collection_name: str, characters: Iterable[CharacterRef]) -> int:
+        """Adds characters to a collection with a single save. Returns how many were new."""
+        members = self.collections.get(collection_name)
+        if members is None:
+            return 0
+        added = 0
+        for character in characters:
+            char_id = self.character_id(character)
+            if char_id not in members:
+                members.add(char_id)
+                self._membership.setdefault(char_id, set()).add(collection_name)
+                added += 1
+        if added:
+            self.save()
+        return added
 
-    def get_character_collections(self, character_name: str) -> List[str]:
+    def remove_from_collection(self, collection_name: str, character: CharacterRef):
+        members = self.collections.get(collection_name)
+        char_id = self.character_id(character)
+        if members is not None and char_id in members:
+            members.discard(char_id)
+            self._unlink(char_id, collection_name)
+            self.save()
+
+    def is_in_collection(self, collection_name: str, character: CharacterRef) -> bool:
+        return self.character_id(character) in self.collections.get(collection_name, ())
+
+    def get_character_collections(self, character: CharacterRef) -> List[str]:
         """Returns a list of collection names this character belongs to."""
-        return [col for col, chars in self.collections.items() if character_name in chars]
+        return sorted(self._membership.get(self.character_id(character), ()))
+
+    def get_characters_in_collection(self, collection_name: str) -> List[str]:
+        """Character IDs in a collection, sorted."""
+        return sorted(self.collections.get(collection_name, ()))
 
     def rename_collection(self, old_name: str, new_name: str) -> bool:
         if old_name not in self.collections:
             return False
         if new_name in self.collections:
             return False
-            
+
         # Move data
-        self.collections[new_name] = self.collections.pop(old_name)
+        members = self.collections.pop(old_name)
+        self.collections[new_name] = members
+        for char_id in members:
+            names = self._membership[char_id]
+            names.discard(old_name)
+            names.add(new_name)
         self.save()
         return True
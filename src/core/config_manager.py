@@ -1,7 +1,9 @@
 import json
 import os
+import atexit
 import logging
-from typing import Dict, Any, Optional
+import threading
+from typing import Dict, Any, List, Optional
 from PySide6.QtCore import QStandardPaths
 
 logger = logging.getLogger(__name__)
@@ -10,6 +12,7 @@ class ConfigManager:
     DEFAULT_GAME_PATH = r"C:\Program Files\Roberts Space Industries\StarCitizen\LIVE\USER\Client\0\CustomCharacters"
     APP_NAME = "SCCharacterInstaller"
     ORG_NAME = "Antigravity"
+    SAVE_DELAY = 0.5 # seconds; writes requested within this window are coalesced into one
     
     def __init__(self):
         # Determine application root for assets (not config writability)
@@ -24,6 +27,13 @@ class ConfigManager:
         self.config_file = os.path.join(self.config_dir, "config.json")
         self._ensure_config_dir()
         self.config: Dict[str, Any] = self._load_config()
+        # Held as a set for O(1) lookups; written back to config["favorites"] on save
+        self._favorites = set(self.config.get("favorites", []))
+
+        self._save_lock = threading.Lock()
+        self._save_timer: Optional[threading.Timer] = None
+        self._dirty = False
+        atexit.register(self.flush)
         
     def _ensure_config_dir(self):
         if not os.path.exists(self.config_dir):
@@ -65,12 +75,40 @@ class ConfigManager:
         }
         
     def save_config(self):
-        try:
-            self._ensure_config_dir()
-            with open(self.config_file, 'w') as f:
-                json.dump(self.config, f, indent=4)
-        except Exception as e:
-            logger.error(f"Error saving config: {e}")
+        """
+        Schedules a write of config.json. Calls within SAVE_DELAY are coalesced into
+        a single write, done on a background thread; flush() forces it (e.g. on exit).
+        """
+        with self._save_lock:
+            self._dirty = True
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self.SAVE_DELAY, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def flush(self):
+        """Writes pending changes now (atomically: temp file + rename)."""
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._dirty:
+                return
+            self._dirty = False
+            self.config["favorites"] = sorted(self._favorites)
+            # Shallow copy: the UI thread may keep changing keys while this runs
+            data = json.dumps(dict(self.config), indent=4)
+
+            try:
+                self._ensure_config_dir()
+                tmp = f"{self.config_file}.tmp"
+                with open(tmp, 'w') as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self.config_file)
+            except Exception as e:
+                logger.error(f"Error saving config: {e}")
             
     def get_game_path(self) -> str:
         return self.config.get("game_path", self.DEFAULT_GAME_PATH)
@@ -149,25 +187,21 @@ class ConfigManager:
         self.save_config()
 
     # --- Favorites Management ---
-    def get_favorites(self) -> list:
-        return self.config.get("favorites", [])
+    def get_favorites(self) -> List[str]:
+        return sorted(self._favorites)
 
     def add_favorite(self, character_name: str):
-        favs = self.get_favorites()
-        if character_name not in favs:
-            favs.append(character_name)
-            self.config["favorites"] = favs
+        if character_name not in self._favorites:
+            self._favorites.add(character_name)
             self.save_config()
 
     def remove_favorite(self, character_name: str):
-        favs = self.get_favorites()
-        if character_name in favs:
-            favs.remove(character_name)
-            self.config["favorites"] = favs
+        if character_name in self._favorites:
+            self._favorites.discard(character_name)
             self.save_config()
 
     def is_favorite(self, character_name: str) -> bool:
-        return character_name in self.get_favorites()
+        return character_name in self._favorites
 
     def set_muted(self, muted: bool):
         self.config["sound_enabled"] = not muted
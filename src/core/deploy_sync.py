@@ -0,0 +1,129 @@
+import os
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ACTION_ADD = "add"
+ACTION_UPDATE = "update"
+
+@dataclass
+class SyncOp:
+    target: str   # environment name, e.g. "PTU"
+    src: str
+    dest: str
+    action: str   # ACTION_ADD or ACTION_UPDATE
+
+@dataclass
+class TargetStats:
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    failed: int = 0
+
+@dataclass
+class DeployPlan:
+    """Operations needed to bring each environment in line with LIVE, plus per-target stats."""
+    ops: List[SyncOp] = field(default_factory=list)
+    stats: Dict[str, TargetStats] = field(default_factory=dict)
+    source_count: int = 0
+    dry_run: bool = True
+
+    @property
+    def target_names(self) -> List[str]:
+        return list(self.stats.keys())
+
+    def summary(self) -> str:
+        lines = []
+        for name, s in self.stats.items():
+            line = f"{name}: {s.added} new, {s.updated} changed, {s.unchanged} up to date"
+            if s.failed:
+                line += f", {s.failed} failed"
+            lines.append(line)
+        return "\n".join(lines)
+
+def _stat_map(directory: str, suffix: str) -> Dict[str, os.stat_result]:
+    """One scandir pass: filename -> stat for files with the given suffix."""
+    result = {}
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name.lower().endswith(suffix) and not entry.name.startswith(".tmp_") and entry.is_file():
+                    result[entry.name] = entry.stat()
+    except OSError:
+        pass
+    return result
+
+def plan_sync(source_dir: str, targets: List[Tuple[str, str]],
+              digest: Callable[[str], str], suffix: str = ".chf") -> DeployPlan:
+    """
+    Compares source_dir with every target directory.
+    Files match when size and mtime agree (copy2 and hardlinks both keep the mtime);
+    equal sizes with different mtimes fall back to a content hash.
+    """
+    plan = DeployPlan()
+    sources = _stat_map(source_dir, suffix)
+    plan.source_count = len(sources)
+
+    for name, target_dir in targets:
+        stats = plan.stats.setdefault(name, TargetStats())
+        existing = _stat_map(target_dir, suffix)
+        for filename, src_st in sources.items():
+            src = os.path.join(source_dir, filename)
+            dest = os.path.join(target_dir, filename)
+            dest_st = existing.get(filename)
+            if dest_st is None:
+                plan.ops.append(SyncOp(name, src, dest, ACTION_ADD))
+                stats.added += 1
+            elif _same_file(src, src_st, dest, dest_st, digest):
+                stats.unchanged += 1
+            else:
+                plan.ops.append(SyncOp(name, src, dest, ACTION_UPDATE))
+                stats.updated += 1
+    return plan
+
+def _same_file(src: str, src_st, dest: str, dest_st, digest: Callable[[str], str]) -> bool:
+    if src_st.st_size != dest_st.st_size:
+        return False
+    if src_st.st_mtime_ns == dest_st.st_mtime_ns:
+        return True
+    try:
+        return digest(src) == digest(dest)
+    except OSError:
+        return False
+
+def execute_plan(plan: DeployPlan, place: Callable[[str, str], bool], max_workers: int = 4,
+                 progress_callback: Optional[Callable[[int, int], None]] = None) -> DeployPlan:
+    """
+    Runs the plan's copies in a thread pool (spanning all targets).
+    Failed operations are logged and counted per target; stats are adjusted in place.
+    """
+    plan.dry_run = False
+    total = len(plan.ops)
+    if not total:
+        return plan
+
+    def run(op: SyncOp) -> Optional[str]:
+        try:
+            place(op.src, op.dest)
+            return None
+        except Exception as e:
+            logger.error(f"Deploy of {os.path.basename(op.src)} to {op.target} failed: {e}")
+            return str(e)
+
+    done = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for op, error in zip(plan.ops, pool.map(run, plan.ops)):
+            done += 1
+            if error is not None:
+                stats = plan.stats[op.target]
+                stats.failed += 1
+                if op.action == ACTION_ADD:
+                    stats.added -= 1
+                else:
+                    stats.updated -= 1
+            if progress_callback:
+                progress_callback(done, total)
+    return plan
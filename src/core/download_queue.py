@@ -0,0 +1,149 @@
+import time
+import logging
+import threading
+from typing import List, Optional
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+
+from src.core.models import Character
+from src.core.downloader import Downloader
+
+logger = logging.getLogger(__name__)
+
+class _QueueItemRunnable(QRunnable):
+    """Installs one queued character; all bookkeeping lives in the DownloadQueue."""
+    def __init__(self, queue: "DownloadQueue", character: Character, cancel_event: threading.Event):
+        super().__init__()
+        self.queue = queue
+        self.character = character
+        self.cancel_event = cancel_event
+
+    @Slot()
+    def run(self):
+        if self.cancel_event.is_set():
+            self.queue._item_done(self.character, False, "Cancelled", cancelled=True)
+            return
+
+        self.queue.item_started.emit(self.character)
+        last_emit = [0.0]
+
+        def on_progress(done, total):
+            # Throttle per-item progress so large batches don't flood the UI thread
+            now = time.monotonic()
+            if now - last_emit[0] >= DownloadQueue.PROGRESS_INTERVAL or (total and done >= total):
+                last_emit[0] = now
+                self.queue.item_progress.emit(self.character, done, total)
+
+        try:
+            success = self.queue.downloader.install_character(self.character, on_progress, self.cancel_event)
+            if success:
+                self.queue._item_done(self.character, True, "")
+            else:
+                cancelled = self.cancel_event.is_set()
+                message = "Cancelled" if cancelled else f"Failed to install {self.character.name}"
+                self.queue._item_done(self.character, False, message, cancelled=cancelled)
+        except Exception as e:
+            logger.error(f"Queued install error: {e}")
+            self.queue._item_done(self.character, False, str(e))
+
+class DownloadQueue(QObject):
+    """
+    Bulk install queue with a bounded number of parallel transfers.
+    All transfers share the Downloader's pooled HTTP session.
+
+    Signals (emitted from worker threads, delivered queued to the UI thread):
+        item_started: Character
+        item_progress: Character, bytes_done, bytes_total
+        item_finished: Character, success, error message
+        progress: finished items, total items in the batch
+        batch_finished: succeeded, failed, cancelled
+    """
+    item_started = Signal(object)
+    item_progress = Signal(object, int, int)
+    item_finished = Signal(object, bool, str)
+    progress = Signal(int, int)
+    batch_finished = Signal(int, int, int)
+
+    DEFAULT_PARALLEL = 4
+    MAX_PARALLEL = 8
+    PROGRESS_INTERVAL = 0.2 # seconds between per-item progress signals
+
+    def __init__(self, downloader: Downloader, max_parallel: Optional[int] = None, parent=None):
+        super().__init__(parent)
+        self.downloader = downloader
+        self.pool = QThreadPool(self)
+        self.set_max_parallel(max_parallel or self.DEFAULT_PARALLEL)
+
+        self._lock = threading.Lock()
+        self._cancel_event = threading.Event()
+        self._queued_keys = set()
+        self._total = 0
+        self._succeeded = 0
+        self._failed = 0
+        self._cancelled = 0
+
+    def set_max_parallel(self, count: int):
+        self.pool.setMaxThreadCount(max(1, min(self.MAX_PARALLEL, int(count))))
+
+    @staticmethod
+    def _key(character: Character) -> str:
+        return character.download_url or f"{character.name}_{character.author}"
+
+    def is_running(self) -> bool:
+        with self._lock:
+            return self._total > 0
+
+    def enqueue(self, characters: List[Character]) -> int:
+        """
+        Adds characters to the current batch (starting one if idle).
+        Characters already queued are skipped. Returns how many were added.
+        """
+        added = []
+        with self._lock:
+            if self._total == 0:
+                self._cancel_event = threading.Event()
+            for char in characters:
+                key = self._key(char)
+                if key in self._queued_keys:
+                    continue
+                self._queued_keys.add(key)
+                added.append(char)
+            self._total += len(added)
+            cancel_event = self._cancel_event
+            total = self._total
+            finished = self._succeeded + self._failed + self._cancelled
+
+        for char in added:
+            char.status = "downloading"
+            self.pool.start(_QueueItemRunnable(self, char, cancel_event))
+        if added:
+            self.progress.emit(finished, total)
+        return len(added)
+
+    def cancel(self):
+        """Stops active transfers and skips everything still waiting in the queue."""
+        with self._lock:
+            self._cancel_event.set()
+
+    def _item_done(self, character: Character, success: bool, message: str, cancelled: bool = False):
+        with self._lock:
+            if success:
+                self._succeeded += 1
+            elif cancelled:
+                self._cancelled += 1
+                character.status = "not_installed"
+            else:
+                self._failed += 1
+            finished = self._succeeded + self._failed + self._cancelled
+            total = self._total
+            batch_done = finished == total
+            result = (self._succeeded, self._failed, self._cancelled)
+            if batch_done:
+                self._total = self._succeeded = self._failed = self._cancelled = 0
+                self._queued_keys.clear()
+
+        if not cancelled:
+            self.item_finished.emit(character, success, message)
+        self.progress.emit(finished, total)
+        if batch_done:
+            logger.info(f"Download queue finished: {result[0]} installed, {result[1]} failed, {result[2]} cancelled")
+            self.batch_finished.emit(*result)
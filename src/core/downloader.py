@@ -3,24 +3,167 @@ import requests
 import logging
 import shutil
 import time
-from typing import Optional
+import json
+import random
+import threading
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+from requests.adapters import HTTPAdapter
 from .models import Character
 from .config_manager import ConfigManager
 
 logger = logging.getLogger(__name__)
 
+# progress_callback(bytes_done, bytes_total); bytes_total is 0 when the server sends no length
+ProgressCallback = Callable[[int, int], None]
+
+class DownloadCancelled(Exception):
+    """Raised inside a transfer when its cancel event is set."""
+
+def _norm(value: Optional[str]) -> str:
+    return (value or "").strip().lower()
+
+class DuplicateIndex:
+    """
+    In-memory lookup of installed characters, keyed by download_url and by
+    normalized name + author. Built once from the sidecars, then kept current
+    by install/uninstall and invalidated per file by the file watcher.
+    """
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._directory: Optional[str] = None
+        self._built = False
+        self._by_url: Dict[str, str] = {}              # download_url -> .chf filename
+        self._by_name: Dict[str, Dict[str, str]] = {}  # name -> {author: .chf filename}
+        self._keys: Dict[str, Tuple[str, str, str]] = {}  # .chf filename -> (url, name, author)
+        self._stale: Set[str] = set()                  # .chf filenames to re-read lazily
+
+    def find(self, directory: str, character: Character) -> Optional[str]:
+        """
+        Returns the .chf filename of an installed character matching the given one:
+        exact download_url match OR (Name + Author) match. None if not installed.
+        """
+        with self._lock:
+            self._ensure_current(directory)
+
+            # 1. Check strict Download URL match (most reliable)
+            if character.download_url and character.download_url in self._by_url:
+                return self._by_url[character.download_url]
+
+            # 2. Check Name + Author match
+            authors = self._by_name.get(_norm(character.name))
+            if not authors:
+                return None
+            target_author = _norm(character.author)
+            if target_author:
+                return authors.get(target_author)
+            # If target has no author (maybe manually created?), relying on name is risky but acceptable for "duplicates"
+            return next(iter(authors.values()))
+
+    def add(self, filename: str, metadata: dict):
+        """Registers (or replaces) the sidecar metadata of an installed .chf."""
+        with self._lock:
+            self._discard(filename)
+            url = metadata.get('download_url') or ""
+            name = _norm(metadata.get('name'))
+            author = _norm(metadata.get('author'))
+            if url:
+                self._by_url.setdefault(url, filename)
+            self._by_name.setdefault(name, {}).setdefault(author, filename)
+            self._keys[filename] = (url, name, author)
+
+    def remove(self, filename: str):
+        with self._lock:
+            self._discard(filename)
+            self._stale.discard(filename)
+
+    def invalidate(self, filenames: Optional[Iterable[str]] = None):
+        """Marks specific files (or, with None, the whole index) to be re-read on next lookup."""
+        with self._lock:
+            if filenames is None:
+                self._built = False
+                return
+            for filename in filenames:
+                if filename:
+                    self._discard(filename)
+                    self._stale.add(filename)
+
+    def _discard(self, filename: str):
+        keys = self._keys.pop(filename, None)
+        if not keys:
+            return
+        url, name, author = keys
+        if url and self._by_url.get(url) == filename:
+            del self._by_url[url]
+        authors = self._by_name.get(name)
+        if authors and authors.get(author) == filename:
+            del authors[author]
+            if not authors:
+                del self._by_name[name]
+
+    def _ensure_current(self, directory: str):
+        if not self._built or directory != self._directory:
+            self._rebuild(directory)
+        elif self._stale:
+            stale, self._stale = self._stale, set()
+            for filename in stale:
+                self._load_sidecar(directory, filename)
+
+    def _rebuild(self, directory: str):
+        self._directory = directory
+        self._by_url.clear()
+        self._by_name.clear()
+        self._keys.clear()
+        self._stale.clear()
+        self._built = True
+        try:
+            for entry in os.scandir(directory):
+                if entry.is_file() and entry.name.lower().endswith('.json'):
+                    self._load_sidecar(directory, entry.name.rsplit('.', 1)[0] + ".chf")
+        except OSError:
+            pass
+
+    def _load_sidecar(self, directory: str, filename: str):
+        json_path = os.path.join(directory, filename.rsplit('.', 1)[0] + ".json")
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self.add(filename, data)
+        except (json.JSONDecodeError, OSError, UnicodeDecodeError):
+            pass
+
 class Downloader:
     MAX_RETRIES = 3
     RETRY_DELAY = 1
+    POOL_SIZE = 16 # Keep-alive connections shared by all parallel transfers
+    MIN_CHUNK = 64 * 1024
+    MAX_CHUNK = 1024 * 1024
+    CHUNK_TARGET_SECONDS = 0.25 # Aim for a chunk (and cancel check) about this often
 
     def __init__(self, config_manager: ConfigManager):
         self.config_manager = config_manager
         from src.core.backup_manager import BackupManager
         self.backup_manager = BackupManager(config_manager)
+        self.duplicate_index = DuplicateIndex()
+        # Final paths claimed by transfers in progress, so parallel items never share a file
+        self._reserved_paths: Set[str] = set()
+        self._reserve_lock = threading.Lock()
+
+        # One pooled session for every download (thread-safe for plain GETs)
+        self.session = requests.Session()
+        self.session.headers.update({
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+        })
+        adapter = HTTPAdapter(pool_connections=self.POOL_SIZE, pool_maxsize=self.POOL_SIZE)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         
-    def install_character(self, character: Character) -> bool:
+    def install_character(self, character: Character,
+                          progress_callback: Optional[ProgressCallback] = None,
+                          cancel_event: Optional[threading.Event] = None) -> bool:
         """
         Downloads the character file and installs it to the configured directory.
+        progress_callback receives (bytes_done, bytes_total); setting cancel_event aborts the transfer.
         Returns True if successful, False otherwise.
         """
         if not character.download_url:
@@ -42,17 +185,18 @@ class Downloader:
             
             return True
                 
+        final_path = None
         try:
             character.status = "downloading"
             
-            # Determine filename
+            # Determine filename; the temp file follows the reserved final name
             filename = self._get_filename(character)
-            temp_path = os.path.join(target_dir, f".tmp_{filename}")
-            final_path = self._get_unique_path(target_dir, filename)
+            final_path = self._reserve_path(target_dir, filename)
+            temp_path = os.path.join(target_dir, f".tmp_{os.path.basename(final_path)}")
             
             logger.info(f"Downloading {character.name} to {final_path}")
             
-            if self._download_file(character.download_url, temp_path):
+            if self._download_file(character.download_url, temp_path, progress_callback, cancel_event):
                 # Validate file (e.g. check if not empty)
                 if os.path.getsize(temp_path) > 0:
                     # Time Capsule: Backup if target exists
@@ -63,7 +207,6 @@ class Downloader:
                     
                     # Save metadata
                     try:
-                        import json
                         json_path = os.path.splitext(final_path)[0] + ".json"
                         metadata = {
                             "name": character.name,
@@ -79,22 +222,32 @@ class Downloader:
                         
                     character.status = "installed"
                     character.local_filename = os.path.basename(final_path) # Store exact filename
+                    self.duplicate_index.add(character.local_filename, {
+                        "name": character.name,
+                        "author": character.author,
+                        "download_url": character.download_url
+                    })
                     logger.info(f"Successfully installed {character.name}")
-                    
-
-                    
                     return True
                 else:
                     logger.error(f"Downloaded file for {character.name} is empty")
                     os.remove(temp_path)
+                    self._remove_quietly(self._resume_path(temp_path))
             
             character.status = "error"
             return False
-            
+
+        except DownloadCancelled:
+            logger.info(f"Download of {character.name} cancelled")
+            character.status = "not_installed"
+            return False
         except Exception as e:
             logger.error(f"Error installing character {character.name}: {e}")
             character.status = "error"
             return False
+        finally:
+            if final_path:
+                self._release_path(final_path)
 
     def install_from_url(self, url: str) -> bool:
         """
@@ -125,44 +278,189 @@ class Downloader:
             logger.error(f"Error installing from file: {e}")
             return False
 
-    def _download_file(self, url: str, target_path: str) -> bool:
+    def _download_file(self, url: str, target_path: str,
+                       progress_callback: Optional[ProgressCallback] = None,
+                       cancel_event: Optional[threading.Event] = None) -> bool:
         """
         Downloads a file from a URL to a target path with retry logic.
+        Partial data is kept between attempts (and between sessions) and resumed
+        with an HTTP Range request, validated against the ETag/Last-Modified
+        recorded when the transfer started.
         
         Args:
             url (str): Source URL.
             target_path (str): Destination file path.
+            progress_callback: Optional callable receiving (bytes_done, bytes_total).
+            cancel_event: Optional event; when set the transfer raises DownloadCancelled.
             
         Returns:
             bool: True if download successful, False otherwise.
         """
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        }
-
-        for attempt in range(self.MAX_RETRIES):
+        failures = 0
+        while failures < self.MAX_RETRIES:
+            offset_before = self._partial_size(target_path)
             try:
-                response = requests.get(url, headers=headers, stream=True, timeout=30)
-                response.raise_for_status()
-                
-                with open(target_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                return True
-                
+                if self._download_attempt(url, target_path, progress_callback, cancel_event):
+                    self._remove_quietly(self._resume_path(target_path))
+                    return True
+                failures = self.MAX_RETRIES # Unrecoverable response (e.g. 404)
+
+            except DownloadCancelled:
+                # Keep the partial file: a later install of the same character resumes it
+                raise
             except Exception as e:
-                logger.warning(f"Download attempt {attempt + 1} failed: {e}")
-                if os.path.exists(target_path):
-                    try:
-                        os.remove(target_path)
-                    except OSError:
-                        pass
+                # Only attempts that made no progress count against the retry budget
+                if self._partial_size(target_path) <= offset_before:
+                    failures += 1
+                logger.warning(f"Download attempt failed ({failures}/{self.MAX_RETRIES}): {e}")
                 
-                if attempt < self.MAX_RETRIES - 1:
-                    time.sleep(self.RETRY_DELAY * (attempt + 1))
+                if failures < self.MAX_RETRIES:
+                    # Exponential backoff with jitter so parallel transfers don't retry in lockstep
+                    delay = self.RETRY_DELAY * (2 ** max(0, failures - 1))
+                    time.sleep(delay + random.uniform(0, delay))
                     
         return False
 
+    def _download_attempt(self, url: str, target_path: str,
+                          progress_callback: Optional[ProgressCallback],
+                          cancel_event: Optional[threading.Event]) -> bool:
+        """
+        One HTTP request, resuming from the partial file when its validator still matches.
+        Returns False for responses that retrying won't fix; raises on transient errors.
+        """
+        resume_path = self._resume_path(target_path)
+        state = self._load_resume_state(resume_path)
+        offset = self._partial_size(target_path)
+
+        # Byte offsets only make sense on the identity encoding
+        headers = {"Accept-Encoding": "identity"}
+        validator = None
+        if offset and state.get("url") == url:
+            validator = state.get("etag") or state.get("last_modified")
+        if validator:
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = validator
+        else:
+            offset = 0
+
+        with self.session.get(url, stream=True, timeout=30, headers=headers) as response:
+            if response.status_code == 416 and offset:
+                if offset == state.get("total"):
+                    return True # Everything was already on disk
+                # Partial file no longer fits the remote one: drop it and retry from zero
+                self._remove_quietly(target_path)
+                self._remove_quietly(resume_path)
+                raise IOError("Requested range not satisfiable, restarting download")
+            if response.status_code in (404, 410):
+                logger.error(f"Download failed: {url} returned {response.status_code}")
+                return False
+            response.raise_for_status()
+
+            if response.status_code == 206:
+                if self._range_start(response) != offset:
+                    # Not the bytes we asked for; drop the partial file and ask for the whole body
+                    self._remove_quietly(target_path)
+                    self._remove_quietly(resume_path)
+                    raise IOError("Server resumed at the wrong offset, restarting download")
+                mode = 'ab' if offset else 'wb'
+            else:
+                # Full body (validator changed or server ignores Range): start over
+                offset = 0
+                mode = 'wb'
+
+            length = int(response.headers.get("Content-Length") or 0)
+            total = offset + length if length else 0
+            if mode == 'wb':
+                # Record validators up front so an interrupted transfer can resume.
+                # Weak ETags are not allowed in If-Range, so fall back to Last-Modified.
+                etag = response.headers.get("ETag")
+                if etag and etag.startswith("W/"):
+                    etag = None
+                self._save_resume_state(resume_path, {
+                    "url": url,
+                    "etag": etag,
+                    "last_modified": response.headers.get("Last-Modified"),
+                    "total": total
+                })
+
+            done = offset
+            chunk_size = self.MIN_CHUNK
+            with open(target_path, mode) as f:
+                if progress_callback:
+                    progress_callback(done, total)
+                while True:
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise DownloadCancelled()
+                    started = time.monotonic()
+                    chunk = response.raw.read(chunk_size, decode_content=True)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    done += len(chunk)
+                    if progress_callback:
+                        progress_callback(done, total)
+                    chunk_size = self._next_chunk_size(chunk_size, len(chunk), time.monotonic() - started)
+
+            if total and done < total:
+                raise IOError(f"Connection closed after {done} of {total} bytes")
+        return True
+
+    @classmethod
+    def _next_chunk_size(cls, chunk_size: int, received: int, elapsed: float) -> int:
+        """Grows the read size on fast links and shrinks it on slow ones."""
+        if received < chunk_size:
+            return chunk_size
+        if elapsed < cls.CHUNK_TARGET_SECONDS / 2:
+            return min(cls.MAX_CHUNK, chunk_size * 2)
+        if elapsed > cls.CHUNK_TARGET_SECONDS * 2:
+            return max(cls.MIN_CHUNK, chunk_size // 2)
+        return chunk_size
+
+    @staticmethod
+    def _range_start(response) -> Optional[int]:
+        # "Content-Range: bytes 1000-1999/2000"
+        value = response.headers.get("Content-Range", "")
+        try:
+            return int(value.split()[1].split("-")[0])
+        except (IndexError, ValueError):
+            return None
+
+    @staticmethod
+    def _partial_size(path: str) -> int:
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+
+    @staticmethod
+    def _resume_path(target_path: str) -> str:
+        return f"{target_path}.resume"
+
+    @staticmethod
+    def _load_resume_state(path: str) -> dict:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _save_resume_state(path: str, state: dict):
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+        except OSError as e:
+            logger.warning(f"Could not save resume info: {e}")
+
+    @staticmethod
+    def _remove_quietly(path: str):
+        if os.path.exists(path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
     def _ensure_directory(self, path: str) -> bool:
         """Ensures that the directory exists, attempting to create it if necessary."""
         if not os.path.exists(path):
@@ -194,50 +492,38 @@ class Downloader:
             counter += 1
         return target_path
 
+    def _reserve_path(self, directory: str, filename: str) -> str:
+        """
+        Like _get_unique_path, but also skips paths claimed by other running
+        transfers, and claims the result until _release_path.
+        """
+        base, ext = os.path.splitext(filename)
+        with self._reserve_lock:
+            target_path = os.path.join(directory, filename)
+            counter = 1
+            while os.path.exists(target_path) or os.path.normcase(target_path) in self._reserved_paths:
+                target_path = os.path.join(directory, f"{base}_{counter}{ext}")
+                counter += 1
+            self._reserved_paths.add(os.path.normcase(target_path))
+        return target_path
+
+    def _release_path(self, path: str):
+        with self._reserve_lock:
+            self._reserved_paths.discard(os.path.normcase(path))
+
     def _find_existing_character(self, target_dir: str, character: Character) -> Optional[str]:
         """
-        Scans the directory for an existing installed character matching the given one.
+        Looks up an existing installed character matching the given one in the duplicate index.
         Checks for exact download_url match OR (Name + Author) match.
         Returns the .chf filename if found, None otherwise.
         """
-        import json
         if not os.path.exists(target_dir):
             return None
-            
-        try:
-            for entry in os.scandir(target_dir):
-                if entry.is_file() and entry.name.lower().endswith('.json'):
-                    try:
-                        with open(entry.path, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                            
-                        # 1. Check strict Download URL match (most reliable)
-                        if character.download_url and data.get('download_url') == character.download_url:
-                             return entry.name.rsplit('.', 1)[0] + ".chf"
-                             
-                        # 2. Check Name + Author match
-                        # We normalize strings to be safe
-                        local_name = (data.get('name') or "").strip().lower()
-                        target_name = (character.name or "").strip().lower()
-                        
-                        if local_name == target_name:
-                            # If author is present in both, must match
-                            local_author = (data.get('author') or "").strip().lower()
-                            target_author = (character.author or "").strip().lower()
-                            
-                            # If one has author and other doesn't? 
-                            # Usually author is key. If target has author, it must match.
-                            if target_author and local_author == target_author:
-                                return entry.name.rsplit('.', 1)[0] + ".chf"
-                            
-                            # If target has no author (maybe manually created?), relying on name is risky but acceptable for "duplicates"
-                            if not target_author:
-                                return entry.name.rsplit('.', 1)[0] + ".chf"
-                                
-                    except (json.JSONDecodeError, OSError, UnicodeDecodeError):
-                        continue
-        except OSError:
-            pass
-            
-        return None
+        return self.duplicate_index.find(target_dir, character)
 
+    def forget_character(self, character: Character):
+        """Drops an uninstalled character from the duplicate index."""
+        if character.local_filename:
+            self.duplicate_index.remove(character.local_filename)
+        else:
+            self.duplicate_index.invalidate()
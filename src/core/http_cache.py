@@ -0,0 +1,108 @@
+import os
+import time
+import sqlite3
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional
+from urllib.parse import urlencode
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating this response."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+class ResponseCache:
+    """
+    Persistent cache of API responses, stored as SQLite in the config directory.
+
+    Entries are keyed by URL plus sorted query parameters and keep the server's
+    ETag/Last-Modified so they can be revalidated with a conditional request.
+    Freshness policy (TTL, stale-while-revalidate) is up to the caller; see Scraper.
+    """
+    DB_NAME = "http_cache.db"
+    MAX_ENTRIES = 1000
+
+    def __init__(self, config_dir: Optional[str] = None):
+        # No config dir -> throwaway in-memory cache
+        self.db_path = os.path.join(config_dir, self.DB_NAME) if config_dir else ":memory:"
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+        self._writes = 0
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict[str, str]] = None) -> str:
+        return f"{url}?{urlencode(sorted((params or {}).items()))}"
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return CachedResponse(bytes(row[0]), row[1], row[2], row[3])
+
+    def put(self, key: str, body: bytes, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, body, etag, last_modified, time.time())
+            )
+            self._conn.commit()
+            self._writes += 1
+            if self._writes % 100 == 0:
+                self.prune()
+
+    def touch(self, key: str):
+        """Marks an entry fresh again (the server answered 304 Not Modified)."""
+        with self._lock:
+            self._conn.execute("UPDATE responses SET fetched_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+
+    def prune(self, max_entries: Optional[int] = None):
+        """Drops the least recently fetched entries beyond max_entries."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM responses WHERE key NOT IN "
+                "(SELECT key FROM responses ORDER BY fetched_at DESC LIMIT ?)",
+                (max_entries or self.MAX_ENTRIES,)
+            )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
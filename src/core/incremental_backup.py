@@ -0,0 +1,269 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+BACKUP_SUFFIXES = ('.chf', '.json', '_thumb.jpg')
+
+class IncrementalBackup:
+    """
+    Deduplicated point-in-time backups of the library folder.
+
+    Layout (inside Backups/Incremental in the config dir):
+        objects/ab/<sha256>    one copy of every distinct file content
+        manifests/<id>.json    {"files": {filename: {"sha", "size", "mtime_ns"}}, ...}
+
+    A run only copies contents that no earlier snapshot has stored, and a run
+    where the folder fingerprint (names, sizes, mtimes) is unchanged is skipped
+    without reading any file. Objects are real copies rather than hardlinks so a
+    backup can never be altered through the library file it came from.
+    """
+    MANIFEST_VERSION = 1
+    DEFAULT_BUDGET_MB = 200
+    MIN_KEEP = 1 # The newest snapshot is never pruned
+
+    def __init__(self, config_dir: str):
+        self.root = os.path.join(config_dir, "Backups", "Incremental")
+        self.objects_dir = os.path.join(self.root, "objects")
+        self.manifests_dir = os.path.join(self.root, "manifests")
+        self._lock = threading.Lock()
+
+    # --- Scanning ---
+
+    @staticmethod
+    def _list_library(directory: str) -> Dict[str, os.stat_result]:
+        files = {}
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    name = entry.name
+                    if name.startswith(".tmp_") or not name.lower().endswith(BACKUP_SUFFIXES):
+                        continue
+                    if entry.is_file():
+                        files[name] = entry.stat()
+        except OSError as e:
+            logger.warning(f"Could not list {directory}: {e}")
+        return files
+
+    @staticmethod
+    def fingerprint(files: Dict[str, os.stat_result]) -> str:
+        """Cheap change detector: hash of every name, size and mtime (no file contents)."""
+        sha = hashlib.sha1()
+        for name in sorted(files):
+            st = files[name]
+            sha.update(f"{name}\0{st.st_size}\0{st.st_mtime_ns}\n".encode('utf-8', errors='surrogateescape'))
+        return sha.hexdigest()
+
+    @staticmethod
+    def _hash_file(path: str) -> str:
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                sha.update(block)
+        return sha.hexdigest()
+
+    def _object_path(self, sha: str) -> str:
+        return os.path.join(self.objects_dir, sha[:2], sha)
+
+    # --- Snapshots ---
+
+    def list_snapshots(self) -> List[dict]:
+        """Manifests, newest first (each with an added "id")."""
+        return self._read_manifests()[0]
+
+    def _read_manifests(self) -> Tuple[List[dict], bool]:
+        """Readable manifests, newest first, and whether every manifest on disk could be read."""
+        snapshots = []
+        complete = True
+        if not os.path.isdir(self.manifests_dir):
+            return snapshots, complete
+        for name in os.listdir(self.manifests_dir):
+            if not name.endswith(".json"):
+                continue
+            manifest = self._load_manifest(name[:-5])
+            if manifest:
+                snapshots.append(manifest)
+            else:
+                complete = False
+        snapshots.sort(key=lambda m: m["id"], reverse=True)
+        return snapshots, complete
+
+    def _load_manifest(self, snapshot_id: str) -> Optional[dict]:
+        try:
+            with open(os.path.join(self.manifests_dir, f"{snapshot_id}.json"), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            manifest["id"] = snapshot_id
+            return manifest
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unreadable backup manifest {snapshot_id}: {e}")
+            return None
+
+    def create(self, source_dir: str, reason: str = "Auto") -> Optional[str]:
+        """
+        Takes a snapshot of source_dir. Returns the new snapshot id, or None when
+        nothing changed since the last snapshot.
+        """
+        with self._lock:
+            files = self._list_library(source_dir)
+            fingerprint = self.fingerprint(files)
+            snapshots = self.list_snapshots()
+            previous = snapshots[0] if snapshots else None
+            if previous and previous.get("fingerprint") == fingerprint:
+                logger.info("Incremental backup skipped: library unchanged")
+                return None
+
+            # Reuse hashes of files whose size/mtime match the previous snapshot
+            known = previous.get("files", {}) if previous else {}
+            entries = {}
+            new_objects = 0
+            for name, st in files.items():
+                old = known.get(name)
+                if old and old["size"] == st.st_size and old["mtime_ns"] == st.st_mtime_ns and os.path.exists(self._object_path(old["sha"])):
+                    entries[name] = old
+                    continue
+                src = os.path.join(source_dir, name)
+                try:
+                    sha = self._hash_file(src)
+                    if self._store_object(src, sha):
+                        new_objects += 1
+                except OSError as e:
+                    logger.error(f"Backup of {name} failed: {e}")
+                    continue
+                entries[name] = {"sha": sha, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+            if len(entries) < len(files):
+                # Describe only what was stored, so the next run retries the files that failed
+                fingerprint = self.fingerprint({name: files[name] for name in entries})
+
+            snapshot_id = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+            manifest = {
+                "version": self.MANIFEST_VERSION,
+                "created_at": datetime.now().isoformat(),
+                "reason": reason,
+                "source": source_dir,
+                "fingerprint": fingerprint,
+                "files": entries
+            }
+            os.makedirs(self.manifests_dir, exist_ok=True)
+            path = os.path.join(self.manifests_dir, f"{snapshot_id}.json")
+            tmp = f"{path}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f)
+            os.replace(tmp, path)
+
+            logger.info(f"Incremental backup {snapshot_id}: {len(entries)} files, {new_objects} new objects")
+            return snapshot_id
+
+    def _store_object(self, src: str, sha: str) -> bool:
+        """Copies src into the object store unless that content is already there."""
+        dest = self._object_path(sha)
+        if os.path.exists(dest):
+            return False
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        tmp = f"{dest}.tmp"
+        shutil.copy2(src, tmp)
+        os.replace(tmp, dest)
+        return True
+
+    # --- Retention ---
+
+    def prune(self, budget_bytes: int, max_snapshots: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Drops the oldest snapshots until the object store fits in budget_bytes
+        (and at most max_snapshots remain), then deletes unreferenced objects.
+        Sizes are counted once per distinct content, so a snapshot only "costs"
+        the objects nothing newer shares. While any manifest is unreadable no
+        object is deleted, as it may be one that manifest needs.
+        Returns (snapshots_removed, objects_removed).
+        """
+        with self._lock:
+            snapshots, complete = self._read_manifests() # newest first
+            refs: Dict[str, int] = {}
+            sizes: Dict[str, int] = {}
+            for manifest in snapshots:
+                for entry in manifest.get("files", {}).values():
+                    refs[entry["sha"]] = refs.get(entry["sha"], 0) + 1
+                    sizes[entry["sha"]] = entry["size"]
+            total = sum(sizes.values())
+
+            removed = 0
+            while len(snapshots) > self.MIN_KEEP and (
+                total > budget_bytes or (max_snapshots and len(snapshots) > max_snapshots)
+            ):
+                oldest = snapshots.pop()
+                for entry in oldest.get("files", {}).values():
+                    sha = entry["sha"]
+                    refs[sha] -= 1
+                    if refs[sha] == 0:
+                        total -= sizes.pop(sha)
+                        del refs[sha]
+                try:
+                    os.remove(os.path.join(self.manifests_dir, f"{oldest['id']}.json"))
+                    removed += 1
+                except OSError as e:
+                    logger.warning(f"Could not remove backup {oldest['id']}: {e}")
+
+            if complete:
+                objects_removed = self._gc(set(refs))
+            else:
+                logger.warning("Skipping backup object cleanup: some backup manifests could not be read")
+                objects_removed = 0
+            if removed:
+                logger.info(f"Backup retention: removed {removed} snapshots, {objects_removed} objects")
+            return removed, objects_removed
+
+    def _gc(self, live: set) -> int:
+        removed = 0
+        if not os.path.isdir(self.objects_dir):
+            return 0
+        for bucket in os.scandir(self.objects_dir):
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                if entry.name not in live:
+                    try:
+                        os.remove(entry.path)
+                        removed += 1
+                    except OSError:
+                        pass
+        return removed
+
+    # --- Restore ---
+
+    def restore(self, snapshot_id: str, target_dir: str, only_changed: bool = True) -> int:
+        """
+        Writes the files of a snapshot into target_dir. With only_changed, files whose
+        size and hash already match are left alone. Files that are not part of the
+        snapshot are never deleted. Returns the number of files written.
+        """
+        manifest = self._load_manifest(snapshot_id)
+        if manifest is None:
+            raise FileNotFoundError(f"Backup {snapshot_id} not found")
+
+        os.makedirs(target_dir, exist_ok=True)
+        written = 0
+        for name, entry in manifest.get("files", {}).items():
+            if os.path.basename(name) != name:
+                logger.warning(f"Skipping suspicious file in backup: {name}")
+                continue
+            dest = os.path.join(target_dir, name)
+            if only_changed and os.path.exists(dest) and os.path.getsize(dest) == entry["size"]:
+                if self._hash_file(dest) == entry["sha"]:
+                    continue
+            src = self._object_path(entry["sha"])
+            if not os.path.exists(src):
+                logger.error(f"Backup object missing for {name}")
+                continue
+            tmp = os.path.join(target_dir, f".tmp_{name}")
+            shutil.copyfile(src, tmp)
+            os.replace(tmp, dest)
+            os.utime(dest, ns=(entry["mtime_ns"], entry["mtime_ns"]))
+            written += 1
+        logger.info(f"Restored {written} files from backup {snapshot_id}")
+        return written
@@ -0,0 +1,417 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+from PySide6.QtCore import QUrl
+
+from src.core.models import Character, CHARACTER_FIELDS
+
+logger = logging.getLogger(__name__)
+
+# Stat signature of a character on disk:
+# (chf_size, chf_mtime_ns, json_size, json_mtime_ns, thumb_mtime_ns). Missing files use -1.
+Signature = Tuple[int, int, int, int, int]
+
+
+class LibraryIndex:
+    """
+    Persistent index of the installed characters, stored as SQLite in the config directory.
+
+    Each row caches the parsed metadata of one .chf together with the size/mtime
+    of the .chf, its .json sidecar and its _thumb.jpg. A scan lists the folder once
+    and only re-reads the sidecars of entries whose signature changed.
+    """
+    DB_NAME = "library_index.db"
+    SCHEMA_VERSION = 1
+
+    def __init__(self, config_dir: Optional[str] = None):
+        # No config dir -> throwaway in-memory index (same behaviour as a plain scan)
+        self.db_path = os.path.join(config_dir, self.DB_NAME) if config_dir else ":memory:"
+        self._lock = threading.RLock()
+        self._conn = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        try:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._init_schema(conn)
+            return conn
+        except sqlite3.DatabaseError as e:
+            # Corrupted index is just a cache: drop it and start over
+            logger.warning(f"Library index unreadable ({e}), rebuilding.")
+            if self.db_path != ":memory:" and os.path.exists(self.db_path):
+                os.remove(self.db_path)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._init_schema(conn)
+            return conn
+
+    def _init_schema(self, conn: sqlite3.Connection):
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != self.SCHEMA_VERSION:
+            conn.execute("DROP TABLE IF EXISTS entries")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                directory TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                chf_size INTEGER NOT NULL,
+                chf_mtime_ns INTEGER NOT NULL,
+                json_size INTEGER NOT NULL,
+                json_mtime_ns INTEGER NOT NULL,
+                thumb_mtime_ns INTEGER NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (directory, filename)
+            )
+        """)
+        # Integrity verdicts per .chf, valid while size and mtime are unchanged
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS integrity (
+                directory TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                sha256 TEXT NOT NULL,
+                error TEXT,
+                PRIMARY KEY (directory, filename)
+            )
+        """)
+        # Content fingerprints (see chf_format), valid while size and mtime are unchanged
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                directory TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                fingerprint TEXT NOT NULL,
+                PRIMARY KEY (directory, filename)
+            )
+        """)
+        # MinHash signatures (see similarity_index), keyed by content fingerprint
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS minhashes (
+                fingerprint TEXT PRIMARY KEY,
+                signature BLOB NOT NULL
+            )
+        """)
+        # When an online lookup was last made for a key (see MetadataEnricher); misses are only retried after a TTL
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS lookups (
+                key TEXT PRIMARY KEY,
+                checked_at REAL NOT NULL
+            )
+        """)
+        conn.execute(f"PRAGMA user_version={self.SCHEMA_VERSION}")
+        conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _normalize_dir(directory: str) -> str:
+        return os.path.normcase(os.path.abspath(directory))
+
+    @staticmethod
+    def list_directory(directory: str) -> Dict[str, os.stat_result]:
+        """Single os.scandir pass: filename -> stat for every regular file."""
+        stats = {}
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        if entry.is_file():
+                            stats[entry.name] = entry.stat()
+                    except OSError:
+                        continue
+        except OSError as e:
+            logger.warning(f"Could not list {directory}: {e}")
+        return stats
+
+    @staticmethod
+    def _signature(filename: str, stats: Dict[str, os.stat_result]) -> Signature:
+        stem = os.path.splitext(filename)[0]
+        chf = stats[filename]
+        sidecar = stats.get(f"{stem}.json")
+        thumb = stats.get(f"{stem}_thumb.jpg")
+        return (
+            chf.st_size,
+            chf.st_mtime_ns,
+            sidecar.st_size if sidecar else -1,
+            sidecar.st_mtime_ns if sidecar else -1,
+            thumb.st_mtime_ns if thumb else -1,
+        )
+
+    @staticmethod
+    def build_char_data(directory: str, filename: str, signature: Signature) -> dict:
+        """
+        Reads the sidecar (if any) for one .chf and returns the kwargs for Character.
+        """
+        name = os.path.splitext(filename)[0]
+        chf_mtime_ns, json_mtime_ns, thumb_mtime_ns = signature[1], signature[3], signature[4]
+
+        image_url = ""
+        if thumb_mtime_ns >= 0:
+            image_url = QUrl.fromLocalFile(os.path.join(directory, f"{name}_thumb.jpg")).toString()
+
+        char_data = {
+            "name": name,
+            "url_detail": "",
+            "image_url": image_url,
+            "author": "Local",
+            "author_image": "",
+            "download_url": None,
+            "status": "installed",
+            "install_date": chf_mtime_ns / 1e9,
+            "tags": [],
+            "downloads": 0,
+            "likes": 0,
+            "created_at": "",
+            "local_filename": filename
+        }
+
+        if json_mtime_ns >= 0:
+            try:
+                with open(os.path.join(directory, f"{name}.json"), 'r', encoding='utf-8') as jf:
+                    metadata = json.load(jf)
+                if isinstance(metadata, dict):
+                    char_data.update({k: v for k, v in metadata.items() if k in CHARACTER_FIELDS})
+                    char_data["status"] = "installed"
+                    char_data["local_filename"] = filename
+            except Exception:
+                pass  # Ignore malformed json
+
+        return char_data
+
+    def scan(self, directory: str) -> Tuple[List[Character], List[str]]:
+        """
+        Returns (characters, filenames_without_sidecar) for the given folder.
+        Unchanged entries come straight from the index; only changed or new ones
+        are read from disk. Entries for files that disappeared are dropped.
+        """
+        if not os.path.isdir(directory):
+            return [], []
+
+        key = self._normalize_dir(directory)
+        stats = self.list_directory(directory)
+        chf_files = [f for f in stats if f.lower().endswith('.chf') and not f.startswith('.tmp_')]
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT filename, chf_size, chf_mtime_ns, json_size, json_mtime_ns, thumb_mtime_ns, data "
+                "FROM entries WHERE directory = ?", (key,)
+            ).fetchall()
+            cached = {row[0]: (tuple(row[1:6]), row[6]) for row in rows}
+
+            characters = []
+            missing_sidecar = []
+            upserts = []
+
+            for filename in chf_files:
+                signature = self._signature(filename, stats)
+                hit = cached.pop(filename, None)
+                if hit and hit[0] == signature:
+                    char_data = json.loads(hit[1])
+                else:
+                    char_data = self.build_char_data(directory, filename, signature)
+                    upserts.append((key, filename) + signature + (json.dumps(char_data),))
+
+                if signature[3] < 0:
+                    missing_sidecar.append(filename)
+                try:
+                    characters.append(Character.from_sidecar(char_data))
+                except TypeError as e:
+                    logger.error(f"Error processing file {filename}: {e}")
+
+            if upserts:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)", upserts
+                )
+            if cached:
+                self._conn.executemany(
+                    "DELETE FROM entries WHERE directory = ? AND filename = ?",
+                    [(key, f) for f in cached]
+                )
+            self._conn.commit()
+
+        if upserts or cached:
+            logger.info(f"Library index: {len(upserts)} refreshed, {len(cached)} removed, "
+                        f"{len(chf_files) - len(upserts)} unchanged")
+
+        characters.sort(key=lambda c: c.sort_name)
+        return characters, missing_sidecar
+
+    def refresh_files(self, directory: str, filenames: List[str]) -> Dict[str, Optional[Character]]:
+        """
+        Re-indexes only the given .chf files (e.g. after a watcher event).
+        Returns filename -> Character, or None for files that no longer exist.
+        """
+        key = self._normalize_dir(directory)
+        result: Dict[str, Optional[Character]] = {}
+        upserts = []
+        deletes = []
+
+        for filename in dict.fromkeys(filenames):
+            stem = os.path.splitext(filename)[0]
+            stats = {}
+            for name in (filename, f"{stem}.json", f"{stem}_thumb.jpg"):
+                try:
+                    stats[name] = os.stat(os.path.join(directory, name))
+                except OSError:
+                    pass
+
+            if filename not in stats:
+                deletes.append((key, filename))
+                result[filename] = None
+                continue
+
+            signature = self._signature(filename, stats)
+            char_data = self.build_char_data(directory, filename, signature)
+            upserts.append((key, filename) + signature + (json.dumps(char_data),))
+            try:
+                result[filename] = Character.from_sidecar(char_data)
+            except TypeError as e:
+                logger.error(f"Error processing file {filename}: {e}")
+                result[filename] = None
+
+        with self._lock:
+            if upserts:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)", upserts
+                )
+            if deletes:
+                self._conn.executemany(
+                    "DELETE FROM entries WHERE directory = ? AND filename = ?", deletes
+                )
+            self._conn.commit()
+
+        return result
+
+    def get_integrity(self, directory: str) -> Dict[str, Tuple[int, int, str, Optional[str]]]:
+        """Cached verdicts: filename -> (size, mtime_ns, fingerprint, error)."""
+        key = self._normalize_dir(directory)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT filename, size, mtime_ns, sha256, error FROM integrity WHERE directory = ?", (key,)
+            ).fetchall()
+        return {row[0]: tuple(row[1:]) for row in rows}
+
+    def store_integrity(self, directory: str, verdicts: Dict[str, Tuple[int, int, str, Optional[str]]],
+                        removed: List[str] = ()):
+        """Saves verdicts (filename -> (size, mtime_ns, fingerprint, error)) and drops rows of removed files."""
+        key = self._normalize_dir(directory)
+        with self._lock:
+            if verdicts:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO integrity VALUES (?, ?, ?, ?, ?, ?)",
+                    [(key, name) + tuple(v) for name, v in verdicts.items()]
+                )
+            if removed:
+                self._conn.executemany(
+                    "DELETE FROM integrity WHERE directory = ? AND filename = ?",
+                    [(key, name) for name in removed]
+                )
+            self._conn.commit()
+
+    def get_minhashes(self, fingerprints: List[str]) -> Dict[str, bytes]:
+        """Cached packed MinHash signatures for the given content fingerprints."""
+        result = {}
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for i in range(0, len(fingerprints), 500):
+                chunk = fingerprints[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT fingerprint, signature FROM minhashes WHERE fingerprint IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+                result.update((row[0], bytes(row[1])) for row in rows)
+        return result
+
+    def store_minhashes(self, signatures: Dict[str, bytes]):
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO minhashes VALUES (?, ?)", list(signatures.items()))
+            self._conn.commit()
+
+    def recent_lookups(self, keys: List[str], max_age: float) -> set:
+        """Keys looked up less than max_age seconds ago."""
+        cutoff = time.time() - max_age
+        found = set()
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT key FROM lookups WHERE checked_at > ? AND key IN ({','.join('?' * len(chunk))})",
+                    [cutoff] + chunk
+                ).fetchall()
+                found.update(row[0] for row in rows)
+        return found
+
+    def record_lookups(self, keys: List[str]):
+        now = time.time()
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO lookups VALUES (?, ?)", [(k, now) for k in keys])
+            self._conn.commit()
+
+    def fingerprints(self, directory: str, filenames: Optional[List[str]] = None,
+                     max_workers: Optional[int] = None) -> Dict[str, str]:
+        """
+        Content fingerprints (chf_format.fingerprint) for the given .chf files, or all
+        of them. Cached by (size, mtime); only new or changed files are read, in a thread pool.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        from src.core.chf_format import fingerprint
+
+        key = self._normalize_dir(directory)
+        stats = self.list_directory(directory)
+        if filenames is None:
+            filenames = [f for f in stats if f.lower().endswith('.chf') and not f.startswith('.tmp_')]
+        wanted = [f for f in filenames if f in stats]
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT filename, size, mtime_ns, fingerprint FROM fingerprints WHERE directory = ?", (key,)
+            ).fetchall()
+        cached = {row[0]: row[1:] for row in rows}
+
+        result = {}
+        missing = []
+        for filename in wanted:
+            st = stats[filename]
+            hit = cached.get(filename)
+            if hit and hit[0] == st.st_size and hit[1] == st.st_mtime_ns:
+                result[filename] = hit[2]
+            else:
+                missing.append(filename)
+
+        def compute(filename):
+            try:
+                return filename, fingerprint(os.path.join(directory, filename))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not fingerprint {filename}: {e}")
+                return filename, None
+
+        if missing:
+            fresh = {}
+            with ThreadPoolExecutor(max_workers=max_workers or min(8, os.cpu_count() or 1)) as pool:
+                for filename, fp in pool.map(compute, missing):
+                    if fp is None:
+                        continue
+                    st = stats[filename]
+                    result[filename] = fp
+                    fresh[filename] = (st.st_size, st.st_mtime_ns, fp)
+            self.store_fingerprints(directory, fresh)
+        return result
+
+    def store_fingerprints(self, directory: str, fingerprints: Dict[str, Tuple[int, int, str]]):
+        """Caches fingerprints computed elsewhere (filename -> (size, mtime_ns, fingerprint))."""
+        if not fingerprints:
+            return
+        key = self._normalize_dir(directory)
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO fingerprints VALUES (?, ?, ?, ?, ?)",
+                [(key, name) + tuple(v) for name, v in fingerprints.items()]
+            )
+            self._conn.commit()
@@ -0,0 +1,150 @@
+import os
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Change kinds emitted for a character (.chf) in the library folder
+CHANGE_ADDED = "added"
+CHANGE_MODIFIED = "modified"
+CHANGE_REMOVED = "removed"
+CHANGE_RENAMED = "renamed"
+
+@dataclass
+class LibraryChange:
+    kind: str
+    filename: str                       # .chf filename (new name for renames)
+    old_filename: Optional[str] = None  # previous .chf filename for renames
+
+def chf_for_path(path: str) -> Optional[str]:
+    """
+    Maps any library file to the .chf it belongs to.
+    Sidecars (.json) and custom thumbnails (_thumb.jpg) count as changes of their character.
+    Temporary download files are ignored.
+    """
+    name = os.path.basename(path)
+    if name.startswith(".tmp_"):
+        return None
+    lower = name.lower()
+    if lower.endswith(".chf"):
+        return name
+    if lower.endswith("_thumb.jpg"):
+        return f"{name[:-len('_thumb.jpg')]}.chf"
+    if lower.endswith(".json"):
+        return f"{os.path.splitext(name)[0]}.chf"
+    return None
+
+class ChangeCoalescer:
+    """
+    Collects raw file-system events and delivers them as one list of LibraryChange
+    once the folder has been quiet for `delay` seconds.
+    Events for the same character are merged (e.g. created + modified -> added,
+    created + deleted -> nothing), so bulk operations produce a single small batch.
+    """
+    def __init__(self, callback: Callable[[List[LibraryChange]], None], delay: float = 0.5):
+        self.callback = callback
+        self.delay = delay
+        self._pending: Dict[str, LibraryChange] = {}
+        self._lock = threading.Lock()
+        self._deadline = 0.0
+        self._timer: Optional[threading.Thread] = None
+
+    def file_created(self, path: str):
+        self._record(path, CHANGE_ADDED)
+
+    def file_modified(self, path: str):
+        self._record(path, CHANGE_MODIFIED)
+
+    def file_deleted(self, path: str):
+        self._record(path, CHANGE_REMOVED)
+
+    def file_moved(self, src_path: str, dest_path: str):
+        src = chf_for_path(src_path)
+        dest = chf_for_path(dest_path)
+        if dest is None:
+            if src is not None:
+                self._record(src_path, CHANGE_REMOVED)
+            return
+        if src is None:
+            # e.g. ".tmp_X.chf" -> "X.chf" at the end of a download
+            self._record(dest_path, CHANGE_ADDED)
+            return
+        if not (src_path.lower().endswith(".chf") and dest_path.lower().endswith(".chf")):
+            # Sidecar renamed: both characters are affected
+            self._record(src_path, CHANGE_MODIFIED)
+            self._record(dest_path, CHANGE_MODIFIED)
+            return
+
+        with self._lock:
+            prev = self._pending.pop(src, None)
+            if prev and prev.kind == CHANGE_ADDED:
+                self._pending[dest] = LibraryChange(CHANGE_ADDED, dest)
+            else:
+                old = prev.old_filename if prev and prev.kind == CHANGE_RENAMED else src
+                self._pending[dest] = LibraryChange(CHANGE_RENAMED, dest, old)
+        self._schedule()
+
+    def _record(self, path: str, kind: str):
+        filename = chf_for_path(path)
+        if filename is None:
+            return
+        if not path.lower().endswith(".chf") and kind != CHANGE_MODIFIED:
+            # Sidecar/thumbnail appearing or vanishing only modifies its character
+            kind = CHANGE_MODIFIED
+
+        with self._lock:
+            prev = self._pending.get(filename)
+            if prev is None:
+                self._pending[filename] = LibraryChange(kind, filename)
+            elif prev.kind == CHANGE_ADDED and kind == CHANGE_REMOVED:
+                del self._pending[filename]
+            elif prev.kind == CHANGE_ADDED:
+                pass  # still a new character
+            elif prev.kind == CHANGE_REMOVED and kind == CHANGE_ADDED:
+                self._pending[filename] = LibraryChange(CHANGE_MODIFIED, filename)
+            elif prev.kind == CHANGE_REMOVED:
+                pass  # the .chf is gone; events for its sidecar/thumbnail don't bring it back
+            elif prev.kind == CHANGE_RENAMED and kind == CHANGE_REMOVED:
+                del self._pending[filename]
+                self._pending[prev.old_filename] = LibraryChange(CHANGE_REMOVED, prev.old_filename)
+            elif prev.kind == CHANGE_RENAMED:
+                pass  # rename already implies a reload of the new file
+            else:
+                self._pending[filename] = LibraryChange(kind, filename)
+        self._schedule()
+
+    def _schedule(self):
+        # Debounce: every event pushes the deadline back; one timer thread per burst
+        with self._lock:
+            self._deadline = time.monotonic() + self.delay
+            if self._timer is None:
+                self._timer = threading.Thread(target=self._wait_and_flush, daemon=True)
+                self._timer.start()
+
+    def _wait_and_flush(self):
+        while True:
+            with self._lock:
+                remaining = self._deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timer = None
+                    break
+            time.sleep(remaining)
+        self.flush()
+
+    def flush(self):
+        """Delivers the pending batch immediately (no-op if empty)."""
+        with self._lock:
+            changes = list(self._pending.values())
+            self._pending.clear()
+        if changes:
+            try:
+                self.callback(changes)
+            except Exception as e:
+                logger.error(f"Library change callback failed: {e}")
+
+    def cancel(self):
+        with self._lock:
+            self._pending.clear()
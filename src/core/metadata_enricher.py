@@ -0,0 +1,244 @@
+import os
+import json
+import asyncio
+import logging
+import threading
+from dataclasses import asdict
+from typing import Dict, List, Optional, Tuple
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+
+from src.core.models import Character
+
+logger = logging.getLogger(__name__)
+
+# Metadata copied from the online match onto a character recovered without a sidecar
+MATCH_FIELDS = ("image_url", "author", "author_image", "url_detail", "tags", "downloads", "likes", "created_at")
+
+Job = Tuple[str, Character] # (game path, installed character)
+
+def _character_id(character: Character) -> Optional[str]:
+    if "/character/" not in (character.url_detail or ""):
+        return None
+    return character.url_detail.rstrip('/').rsplit('/', 1)[-1]
+
+def _search_query(character: Character) -> str:
+    # File-derived names use underscores as separators
+    return character.name.replace("_", " ").strip()
+
+def _write_sidecar(game_path: str, filename: str, data: dict):
+    stem = os.path.splitext(filename)[0]
+    tmp = os.path.join(game_path, f".tmp_{stem}.json")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=4)
+    os.replace(tmp, os.path.join(game_path, f"{stem}.json"))
+
+class _EnrichmentRunnable(QRunnable):
+    """Works through the enricher's queue in batches until it is empty."""
+    def __init__(self, enricher: "MetadataEnricher"):
+        super().__init__()
+        self.enricher = enricher
+
+    @Slot()
+    def run(self):
+        self.enricher._drain()
+
+class MetadataEnricher(QObject):
+    """
+    Background metadata lookups for installed characters, kept off the library scan.
+
+    - Characters without a .json sidecar are looked up by name, in the local
+      catalog first and then online; a match is written as their sidecar.
+    - Online characters get their download/like counts refreshed once per COUNTS_TTL.
+
+    Lookups run in batches of BATCH_SIZE on one background thread, through the
+    scraper's rate-limited API client. Every lookup is recorded in the library
+    index, so a name that found nothing is not searched again until MISS_TTL
+    has passed. Sidecars are written atomically; `enriched` then reports which
+    files changed so the UI can refresh just those cards.
+
+    Signals (emitted from the worker thread, delivered queued to the UI thread):
+        enriched: game path, list of .chf filenames whose sidecar was written
+        idle: the queue is empty
+    """
+    enriched = Signal(str, list)
+    idle = Signal()
+
+    BATCH_SIZE = 20
+    MISS_TTL = 7 * 24 * 3600   # seconds before a name that found nothing is searched again
+    COUNTS_TTL = 24 * 3600     # seconds between count refreshes of one character
+
+    def __init__(self, scraper, library_index, catalog=None, parent=None):
+        super().__init__(parent)
+        self.scraper = scraper
+        self.library_index = library_index
+        self.catalog = catalog
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple[str, str], Character] = {}
+        self._running = False
+
+    def is_running(self) -> bool:
+        with self._lock:
+            return self._running
+
+    def enqueue(self, game_path: str, characters: List[Character]) -> int:
+        """Queues installed characters for enrichment (never blocks). Returns how many were new to the queue."""
+        added = 0
+        with self._lock:
+            for char in characters:
+                if not char.local_filename:
+                    continue
+                key = (game_path, char.local_filename)
+                if key not in self._pending:
+                    added += 1
+                self._pending[key] = char
+            start = added and not self._running
+            if start:
+                self._running = True
+        if start:
+            self.pool.start(_EnrichmentRunnable(self))
+        return added
+
+    def stop(self):
+        """Drops everything still queued; a batch already running finishes."""
+        with self._lock:
+            self._pending.clear()
+
+    def _drain(self):
+        while True:
+            with self._lock:
+                keys = list(self._pending)[:self.BATCH_SIZE]
+                jobs = [(key[0], self._pending.pop(key)) for key in keys]
+                if not jobs:
+                    self._running = False
+                    break
+            try:
+                written = self.process_batch(jobs)
+            except Exception as e:
+                logger.error(f"Metadata enrichment batch failed: {e}")
+                continue
+            for game_path, filenames in written.items():
+                self.enriched.emit(game_path, filenames)
+        self.idle.emit()
+
+    # --- Lookups ---
+
+    def process_batch(self, jobs: List[Job]) -> Dict[str, List[str]]:
+        """Runs the lookups for one batch. Returns game path -> filenames whose sidecar was written."""
+        missing: List[Job] = []
+        counted: List[Job] = []
+        for game_path, char in jobs:
+            stem = os.path.splitext(char.local_filename)[0]
+            if not os.path.exists(os.path.join(game_path, f"{stem}.json")):
+                missing.append((game_path, char))
+            elif _character_id(char):
+                counted.append((game_path, char))
+
+        recent = self.library_index.recent_lookups(
+            [f"search:{_search_query(c).casefold()}" for _, c in missing], self.MISS_TTL
+        ) | self.library_index.recent_lookups(
+            [f"counts:{_character_id(c)}" for _, c in counted], self.COUNTS_TTL
+        )
+        missing = [job for job in missing if f"search:{_search_query(job[1]).casefold()}" not in recent]
+        counted = [job for job in counted if f"counts:{_character_id(job[1])}" not in recent]
+        if not missing and not counted:
+            return {}
+
+        matches = self._find_matches([_search_query(c) for _, c in missing])
+        # Count refreshes need the live numbers; the catalog keeps them as first synced
+        online = self._search_online([_search_query(c) for _, c in counted])
+
+        written: Dict[str, List[str]] = {}
+        checked = []
+        for game_path, char in missing:
+            query = _search_query(char)
+            if query not in matches:
+                continue # No answer (offline?): try again on the next scan
+            match = matches[query]
+            if match is None:
+                checked.append(f"search:{query.casefold()}")
+                continue
+            data = asdict(char)
+            data.update({field: getattr(match, field) for field in MATCH_FIELDS})
+            if self._save(game_path, char.local_filename, data):
+                written.setdefault(game_path, []).append(char.local_filename)
+                if _character_id(match):
+                    checked.append(f"counts:{_character_id(match)}")
+
+        for game_path, char in counted:
+            char_id = _character_id(char)
+            query = _search_query(char)
+            if query not in online:
+                continue
+            checked.append(f"counts:{char_id}")
+            match = next((m for m in online[query] if _character_id(m) == char_id), None)
+            if match is None or (match.downloads, match.likes) == (char.downloads, char.likes):
+                continue
+            if self._update_counts(game_path, char.local_filename, match):
+                written.setdefault(game_path, []).append(char.local_filename)
+
+        self.library_index.record_lookups(checked)
+        return written
+
+    def _find_matches(self, queries: List[str]) -> Dict[str, Optional[Character]]:
+        """
+        Best match per name: the local catalog if it has one, else the first online
+        result. None means nothing was found; names that got no answer are left out.
+        """
+        matches: Dict[str, Optional[Character]] = {}
+        if self.catalog:
+            for query in queries:
+                found = self.catalog.search(query, limit=1)
+                if found:
+                    matches[query] = found[0]
+        online = self._search_online([q for q in queries if q not in matches])
+        for query, results in online.items():
+            matches[query] = results[0] if results else None
+        return matches
+
+    def _search_online(self, queries: List[str]) -> Dict[str, List[Character]]:
+        """
+        First result page per query, fetched concurrently through the rate-limited
+        client. Queries whose request failed are left out.
+        """
+        queries = list(dict.fromkeys(q for q in queries if q))
+        if not queries:
+            return {}
+
+        async def search_all():
+            return await asyncio.gather(*(
+                self.scraper.get_character_list_async(1, query, raise_errors=True) for query in queries
+            ), return_exceptions=True)
+
+        results = self.scraper.api.run(search_all())
+        answered = {}
+        for query, result in zip(queries, results):
+            if isinstance(result, Exception):
+                logger.info(f"Metadata lookup for '{query}' failed: {result}")
+                continue
+            answered[query] = result[0]
+        return answered
+
+    def _save(self, game_path: str, filename: str, data: dict) -> bool:
+        try:
+            _write_sidecar(game_path, filename, data)
+            return True
+        except OSError as e:
+            logger.warning(f"Failed to save metadata for {filename}: {e}")
+            return False
+
+    def _update_counts(self, game_path: str, filename: str, match: Character) -> bool:
+        """Rewrites only the counts of an existing sidecar, keeping every other key as it is."""
+        path = os.path.join(game_path, f"{os.path.splitext(filename)[0]}.json")
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read metadata of {filename}: {e}")
+            return False
+        if not isinstance(data, dict):
+            return False
+        data["downloads"] = match.downloads
+        data["likes"] = match.likes
+        return self._save(game_path, filename, data)
@@ -1,8 +1,59 @@
+import sys
+import time
 from dataclasses import dataclass
-from typing import Optional
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional
 
-@dataclass
-class Character:
+NEW_WINDOW_SECONDS = 7 * 24 * 3600 # "New" badge: created within the last week
+
+def parse_timestamp(value: Optional[str]) -> float:
+    """Epoch seconds of an ISO 8601 timestamp (API: "2023-11-15T12:00:00.000Z"); 0.0 if empty or unparsable."""
+    if not value:
+        return 0.0
+    try:
+        # fromisoformat() only accepts a trailing "Z" from Python 3.11 on
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (TypeError, ValueError):
+        return 0.0
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+def tag_names(tags: Optional[Iterable]) -> List[str]:
+    """
+    Interned tag names. API tags may be plain strings or objects
+    ({"name": ...} or {"tag": {"name": ...}}).
+    """
+    names = []
+    for tag in tags or ():
+        if isinstance(tag, dict):
+            tag = tag.get("name") or (tag.get("tag") or {}).get("name")
+        if isinstance(tag, str) and tag:
+            names.append(sys.intern(tag))
+    return names
+
+_UNSET = object() # Source marker for derived values not computed yet
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+class _Derived:
+    """
+    Slots for values derived from Character fields. Each is cached together with
+    the field value it came from and recomputed if that field is reassigned.
+    Kept out of the dataclass so asdict() and sidecars only see real fields.
+    """
+    __slots__ = ("_created_src", "_created_ts", "_name_src", "_sort_name", "_author_src", "_match_key")
+
+@dataclass(slots=True)
+class Character(_Derived):
+    """
+    One character (head), online or installed.
+
+    Slotted: no per-instance __dict__. Author, status and tag strings are
+    interned, so a catalog with thousands of rows by the same authors and tags
+    holds one copy of each string.
+    """
     name: str
     url_detail: str
     image_url: str
@@ -17,31 +68,80 @@ class Character:
     created_at: str = ""
     local_filename: Optional[str] = None # For reliable uninstalling
 
+    def __post_init__(self):
+        self.author = _intern(self.author)
+        self.author_image = _intern(self.author_image)
+        self.status = _intern(self.status)
+        if self.tags:
+            self.tags = tag_names(self.tags)
+        self._created_src = self.created_at
+        self._created_ts = parse_timestamp(self.created_at)
+        self._name_src = _UNSET
+        self._author_src = _UNSET
+
+    # --- Constructors ---
+
+    @classmethod
+    def from_api(cls, item: dict, base_url: str) -> Optional["Character"]:
+        """Builds a character from one /api/heads item; None if it has no download."""
+        download_url = item.get("dnaUrl")
+        if not download_url:
+            return None
+        user = item.get("user")
+        if not isinstance(user, dict):
+            user = {}
+        char_id = item.get("id")
+        counts = item.get("_count") or {}
+        return cls(
+            name=item.get("title", "Unknown"),
+            url_detail=f"{base_url}/character/{char_id}" if char_id else base_url,
+            image_url=item.get("previewUrl") or user.get("image") or "",
+            author=user.get("name", "Unknown"),
+            author_image=user.get("image", "") or "",
+            download_url=download_url,
+            tags=item.get("tags", []),
+            downloads=counts.get("characterDownloads", 0),
+            likes=counts.get("characterLikes", 0),
+            created_at=item.get("createdAt", "") or ""
+        )
+
+    @classmethod
+    def from_sidecar(cls, data: dict) -> "Character":
+        """Builds a character from sidecar/index metadata, ignoring keys that aren't fields."""
+        return cls(**{k: v for k, v in data.items() if k in CHARACTER_FIELDS})
+
+    # --- Derived values ---
+
+    @property
+    def created_ts(self) -> float:
+        """created_at as epoch seconds (0.0 if unknown), parsed once per value."""
+        if self._created_src is not self.created_at:
+            self._created_src = self.created_at
+            self._created_ts = parse_timestamp(self.created_at)
+        return self._created_ts
+
+    @property
+    def sort_name(self) -> str:
+        """Lowercased name, for sorting and matching."""
+        if self._name_src is not self.name:
+            self._name_src = self.name
+            self._sort_name = (self.name or "").lower()
+            self._author_src = _UNSET # match_key depends on the name too
+        return self._sort_name
+
+    @property
+    def match_key(self) -> str:
+        """Lowercased "name_author": identifies a character when there is no download URL."""
+        sort_name = self.sort_name
+        if self._author_src is not self.author:
+            self._author_src = self.author
+            self._match_key = f"{sort_name}_{self.author.lower() if self.author else ''}"
+        return self._match_key
+
     @property
     def is_new(self) -> bool:
-        if not self.created_at:
-            return False
-        try:
-            from datetime import datetime, timedelta, timezone
-            
-            # Handle format variants if known, otherwise assume ISO
-            # API usually returns ISO 8601: "2023-11-15T12:00:00.000Z"
-            # We replace Z with +00:00 for fromisoformat compatibility in Py3.10-, 
-            # or just rely on robust parsing if available.
-            # Python 3.11+ handles Z, 3.10 might not without replace.
-            ts_str = self.created_at.replace("Z", "+00:00")
-            created_dt = datetime.fromisoformat(ts_str)
-            
-            # Ensure timezone awareness
-            if created_dt.tzinfo is None:
-                created_dt = created_dt.replace(tzinfo=timezone.utc)
-                
-            now = datetime.now(timezone.utc)
-            
-            # Define "This Week" as last 7 days
-            delta = now - created_dt
-            return delta.days < 7
-        except Exception:
-            # If parsing fails, assume not new
-            return False
+        created = self.created_ts
+        return bool(created) and time.time() - created < NEW_WINDOW_SECONDS
 
+# Fields Character accepts; anything else in a sidecar is dropped
+CHARACTER_FIELDS = frozenset(Character.__dataclass_fields__)
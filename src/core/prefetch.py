@@ -0,0 +1,206 @@
+import time
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+from PySide6.QtCore import QObject, Signal
+
+from src.core.models import Character
+
+logger = logging.getLogger(__name__)
+
+PageKey = Tuple[str, str, int]       # (search query, orderBy, page), "" for none
+Page = Tuple[List[Character], bool]  # (characters, has_next_page)
+
+def page_key(search_query: Optional[str], order_by: Optional[str], page: int) -> PageKey:
+    return (search_query or "", order_by or "", page)
+
+class PageCache:
+    """Bounded LRU of API result pages, shared between the UI thread and the prefetch callbacks."""
+    MAX_PAGES = 64
+
+    def __init__(self, max_pages: Optional[int] = None):
+        self.max_pages = max_pages or self.MAX_PAGES
+        self._pages: "OrderedDict[PageKey, Page]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._pages)
+
+    def __contains__(self, key: PageKey):
+        with self._lock:
+            return key in self._pages
+
+    def get(self, key: PageKey) -> Optional[Page]:
+        with self._lock:
+            page = self._pages.get(key)
+            if page is not None:
+                self._pages.move_to_end(key)
+            return page
+
+    def put(self, key: PageKey, page: Page):
+        with self._lock:
+            self._pages[key] = page
+            self._pages.move_to_end(key)
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._pages.clear()
+
+class PrefetchEngine(QObject):
+    """
+    Fetches the pages after the one on screen before "Load more" asks for them.
+
+    Pages are kept in a PageCache keyed by (search, orderBy, page), so going
+    back to an earlier query is served from memory too. How far ahead to fetch
+    follows the scroll speed reported through note_scroll(): one page while
+    reading slowly, up to MAX_DEPTH while flinging. Fetches run as coroutines on
+    the scraper's API client (rate limited, no thread per page). Changing the
+    query with set_query() cancels the fetches of the previous one; close() (or
+    destroying the engine with its parent) cancels everything, and fetches that
+    finish afterwards are dropped without emitting.
+
+    Signals (emitted from the API client's thread, delivered queued to the UI thread):
+        page_loaded: PageKey, Page — for every completed fetch, including empty pages
+    """
+    page_loaded = Signal(object, object)
+
+    MIN_DEPTH = 1
+    MAX_DEPTH = 6
+    SPEED_PER_PAGE = 1500.0 # px/s of scrolling that earns one more page of look-ahead
+    SPEED_SMOOTHING = 0.5   # weight of the newest sample in the speed average
+    IDLE_RESET = 1.0        # seconds without scrolling after which speed counts as zero
+
+    def __init__(self, scraper, cache: Optional[PageCache] = None, parent=None):
+        super().__init__(parent)
+        self.scraper = scraper
+        self.cache = cache or PageCache()
+        self.depth = self.MIN_DEPTH
+        self._search = ""
+        self._order_by = ""
+        self._end_page: Optional[int] = None # Last page of the current query, once seen
+        self._inflight: Dict[PageKey, Future] = {}
+        self._lock = threading.RLock() # Re-entered when a page_loaded slot runs directly and fetches more
+        self._closed = threading.Event()
+        self._speed = 0.0
+        self._last_scroll: Optional[Tuple[float, int]] = None
+        # A plain function over the shared state, not a bound method: it runs while
+        # the C++ object is already being deleted
+        self.destroyed.connect(self._closer(self._inflight, self._lock, self._closed))
+
+    @staticmethod
+    def _closer(inflight: Dict[PageKey, Future], lock: threading.RLock, closed: threading.Event):
+        def close(*_):
+            # Under the lock, so no fetch callback is halfway through an emit
+            with lock:
+                closed.set()
+                futures = list(inflight.values())
+                inflight.clear()
+            for future in futures:
+                future.cancel()
+        return close
+
+    def close(self):
+        """Cancels every fetch; results that still arrive are dropped."""
+        self._closer(self._inflight, self._lock, self._closed)()
+
+    # --- Query ---
+
+    def key(self, page: int) -> PageKey:
+        return page_key(self._search, self._order_by, page)
+
+    def set_query(self, search_query: Optional[str], order_by: Optional[str]):
+        """Switches to a new query, cancelling fetches still running for the old one."""
+        search_query, order_by = search_query or "", order_by or ""
+        if (search_query, order_by) == (self._search, self._order_by):
+            return
+        self.cancel()
+        self._search, self._order_by = search_query, order_by
+        self._end_page = None
+        self.depth = self.MIN_DEPTH
+
+    def cancel(self):
+        with self._lock:
+            futures = list(self._inflight.values())
+            self._inflight.clear()
+        for future in futures:
+            future.cancel()
+
+    # --- Scroll speed ---
+
+    def note_scroll(self, value: int) -> int:
+        """Records the scroll position; returns the look-ahead depth it implies."""
+        now = time.monotonic()
+        if self._last_scroll is not None:
+            last_time, last_value = self._last_scroll
+            elapsed = now - last_time
+            if elapsed >= self.IDLE_RESET:
+                self._speed = 0.0
+            elif elapsed > 0:
+                # Only scrolling down moves towards the next page
+                sample = max(0, value - last_value) / elapsed
+                self._speed += self.SPEED_SMOOTHING * (sample - self._speed)
+        self._last_scroll = (now, value)
+        self.depth = max(self.MIN_DEPTH, min(self.MAX_DEPTH, self.MIN_DEPTH + int(self._speed / self.SPEED_PER_PAGE)))
+        return self.depth
+
+    # --- Pages ---
+
+    def get(self, page: int) -> Optional[Page]:
+        """The page for the current query if it is in memory."""
+        return self.cache.get(self.key(page))
+
+    def request(self, page: int):
+        """Makes sure the page is on its way; page_loaded fires when it arrives."""
+        key = self.key(page)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.page_loaded.emit(key, cached)
+            return
+        self._fetch(key)
+
+    def prefetch(self, after_page: int):
+        """Starts fetching the next `depth` pages after after_page that aren't cached or running."""
+        last = after_page + self.depth
+        if self._end_page is not None:
+            last = min(last, self._end_page)
+        for page in range(after_page + 1, last + 1):
+            key = self.key(page)
+            if key not in self.cache:
+                self._fetch(key)
+
+    def _fetch(self, key: PageKey):
+        with self._lock:
+            if self._closed.is_set() or key in self._inflight:
+                return
+            search_query, order_by, page = key
+            future = self.scraper.api.spawn(
+                self.scraper.get_character_list_async(page, search_query or None, order_by or None)
+            )
+            self._inflight[key] = future
+        future.add_done_callback(lambda f, key=key: self._on_fetched(key, f))
+
+    def _on_fetched(self, key: PageKey, future: Future):
+        if future.cancelled():
+            return
+        try:
+            characters, has_next = future.result()
+        except Exception as e:
+            logger.warning(f"Prefetch of page {key[2]} failed: {e}")
+            characters, has_next = [], False
+        page = (characters, has_next)
+        with self._lock:
+            if self._closed.is_set():
+                return # The engine may already be deleted
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+            if characters:
+                # Empty pages may be a network failure; let the next request ask again
+                self.cache.put(key, page)
+                if not has_next and key[:2] == (self._search, self._order_by):
+                    self._end_page = key[2]
+            self.page_loaded.emit(key, page)
@@ -1,9 +1,11 @@
 import requests
 import logging
-import time
 import json
+import asyncio
 from typing import List, Optional, Dict, Any, Tuple
 from .models import Character
+from .api_client import ApiClient
+from .http_cache import ResponseCache, CachedResponse
 
 logger = logging.getLogger(__name__)
 
@@ -16,15 +18,27 @@ ORDER_BY_DOWNLOAD = "download"  # most downloaded first
 
 class Scraper:
     BASE_URL = "https://www.star-citizen-characters.com"
-    MAX_RETRIES = 3
-    RETRY_DELAY = 1  # seconds
+    LIST_TTL = 300  # seconds a cached page is used without asking the server
+    STALE_TTL = 7 * 24 * 3600  # after LIST_TTL: served at once, refreshed in the background
     
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+    def __init__(self, cache: Optional[ResponseCache] = None):
+        self.cache = cache
+        self._revalidating = set() # Cache keys with a background refresh in flight (loop thread only)
+        self._refresh_tasks = set() # Strong references, so running refreshes aren't garbage collected
+        session = requests.Session()
+        session.headers.update({
              "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
              "Accept": "application/json"
         })
+        self.api = ApiClient(session)
+
+    @property
+    def session(self) -> requests.Session:
+        return self.api.session
+
+    @session.setter
+    def session(self, session: requests.Session):
+        self.api.session = session
 
     def get_character_list(
         self,
@@ -36,42 +50,86 @@ class Scraper:
         Fetches a page of characters from the star-citizen-heads API.
         Returns (characters, has_next_page) using body.hasNextPage from the API.
         """
-        for attempt in range(self.MAX_RETRIES):
-            try:
-                params: Dict[str, str] = {"page": str(page)}
-                if search_query:
-                    params["search"] = search_query
-                if order_by:
-                    params["orderBy"] = order_by
-
-                url = f"{self.BASE_URL}/api/heads"
-                response = self.session.get(url, params=params, timeout=10)
-                response.raise_for_status()
-                data = response.json()
-
-                if "body" not in data or "rows" not in data["body"]:
-                    logger.warning(f"Unexpected JSON structure: {data.keys()}")
-                    return ([], False)
-
-                rows = data["body"]["rows"]
-                has_next = bool(data["body"].get("hasNextPage", False))
-                characters = []
-                for item in rows:
-                    char = self._process_item(item)
-                    if char:
-                        characters.append(char)
-                return (characters, has_next)
-
-            except requests.RequestException as e:
-                logger.warning(f"Network error on attempt {attempt + 1}: {e}")
-                if attempt < self.MAX_RETRIES - 1:
-                    time.sleep(self.RETRY_DELAY * (attempt + 1))
-            except json.JSONDecodeError:
-                logger.error("Response was not JSON")
-                return ([], False)
-            except Exception as e:
-                logger.error(f"Unexpected error scraping page {page}: {e}")
+        return self.api.run(self.get_character_list_async(page, search_query, order_by))
+
+    def get_character_pages(
+        self,
+        start_page: int,
+        page_count: int,
+        search_query: Optional[str] = None,
+        order_by: Optional[str] = None,
+        use_cache: bool = True,
+        raise_errors: bool = False,
+    ) -> Tuple[List[Character], bool]:
+        """
+        Fetches page_count consecutive pages concurrently (bounded and rate limited by
+        the API client). Returns the characters in page order and has_next_page of the last page.
+        use_cache=False always asks the server (the cache is still the offline fallback).
+        With raise_errors, a page that got no answer raises instead of counting as empty.
+        """
+        pages = range(start_page, start_page + page_count)
+
+        async def fetch_all():
+            return await asyncio.gather(*(
+                self.get_character_list_async(p, search_query, order_by, use_cache, raise_errors) for p in pages
+            ))
+
+        all_characters = []
+        results = self.api.run(fetch_all())
+        for chars, _ in results:
+            all_characters.extend(chars)
+        has_next = results[-1][1] if results else False
+        return (all_characters, has_next)
+
+    async def get_character_list_async(
+        self,
+        page: int = 1,
+        search_query: Optional[str] = None,
+        order_by: Optional[str] = None,
+        use_cache: bool = True,
+        raise_errors: bool = False,
+    ) -> Tuple[List[Character], bool]:
+        """
+        Async form of get_character_list. Network failures return ([], False)
+        unless raise_errors is set, in which case the RequestException propagates
+        (for callers that must tell "no results" from "no answer"); a malformed
+        response then raises ValueError.
+        """
+        params: Dict[str, str] = {"page": str(page)}
+        if search_query:
+            params["search"] = search_query
+        if order_by:
+            params["orderBy"] = order_by
+
+        try:
+            ttl = self.LIST_TTL if use_cache else None
+            data = await self._get_json(f"{self.BASE_URL}/api/heads", params, timeout=10, ttl=ttl)
+
+            if "body" not in data or "rows" not in data["body"]:
+                logger.warning(f"Unexpected JSON structure: {data.keys()}")
+                if raise_errors:
+                    raise ValueError(f"Unexpected response for page {page}")
                 return ([], False)
+
+            rows = data["body"]["rows"]
+            has_next = bool(data["body"].get("hasNextPage", False))
+            characters = []
+            for item in rows:
+                char = self._process_item(item)
+                if char:
+                    characters.append(char)
+            return (characters, has_next)
+
+        except requests.RequestException as e:
+            if raise_errors:
+                raise
+            logger.warning(f"Could not fetch page {page}: {e}")
+        except json.JSONDecodeError:
+            logger.error("Response was not JSON")
+            if raise_errors:
+                raise
+        except Exception as e:
+            logger.error(f"Unexpected error scraping page {page}: {e}")
         return ([], False)
 
     def get_random_characters(self, count: int = 20) -> List[Character]:
@@ -79,76 +137,93 @@ class Scraper:
         Fetches random characters from the star-citizen-heads API (GET /api/heads/random?count=N).
         Public endpoint, no auth. Used by the roulette.
         """
+        return self.api.run(self.get_random_characters_async(count))
+
+    async def get_random_characters_async(self, count: int = 20) -> List[Character]:
         count = max(2, min(50, count))
         url = f"{self.BASE_URL}/api/heads/random"
-        for attempt in range(self.MAX_RETRIES):
-            try:
-                response = self.session.get(url, params={"count": str(count)}, timeout=15)
-                response.raise_for_status()
-                data = response.json()
-                if not isinstance(data, list):
-                    logger.warning("Random API did not return a list")
-                    return []
-                characters = []
-                for item in data:
-                    char = self._process_item(item)
-                    if char:
-                        characters.append(char)
-                return characters
-            except requests.RequestException as e:
-                logger.warning(f"Random API attempt {attempt + 1}: {e}")
-                if attempt < self.MAX_RETRIES - 1:
-                    time.sleep(self.RETRY_DELAY * (attempt + 1))
-            except json.JSONDecodeError:
-                logger.error("Random API response was not JSON")
-                return []
-            except Exception as e:
-                logger.error(f"Random API error: {e}")
+        try:
+            # Never served from cache while online (it's random); the last batch is the offline fallback
+            data = await self._get_json(url, {"count": str(count)}, timeout=15)
+            if not isinstance(data, list):
+                logger.warning("Random API did not return a list")
                 return []
+            characters = []
+            for item in data:
+                char = self._process_item(item)
+                if char:
+                    characters.append(char)
+            return characters
+        except requests.RequestException as e:
+            logger.warning(f"Random API unavailable: {e}")
+        except json.JSONDecodeError:
+            logger.error("Random API response was not JSON")
+        except Exception as e:
+            logger.error(f"Random API error: {e}")
         return []
 
+    async def _get_json(self, url: str, params: Dict[str, str], timeout: float, ttl: Optional[float] = None) -> Any:
+        """
+        GET returning parsed JSON, through the response cache when there is one.
+        ttl: seconds a cached response is used without asking the server. For STALE_TTL
+        after that it is still returned at once while a background request refreshes it.
+        If the network fails, any cached copy is used so browsing keeps working offline.
+        Raises requests.RequestException when nothing could be fetched or cached.
+        """
+        key = ResponseCache.make_key(url, params)
+        cached = self.cache.get(key) if self.cache else None
+        if cached and ttl is not None:
+            if cached.age < ttl:
+                return json.loads(cached.body)
+            if cached.age < ttl + self.STALE_TTL:
+                self._revalidate_in_background(key, url, params, timeout, cached)
+                return json.loads(cached.body)
+
+        try:
+            return json.loads(await self._fetch(key, url, params, timeout, cached))
+        except requests.RequestException:
+            if cached:
+                logger.info(f"Network unavailable, using cached response ({int(cached.age)}s old)")
+                return json.loads(cached.body)
+            raise
+
+    async def _fetch(self, key: str, url: str, params: Dict[str, str], timeout: float,
+                     cached: Optional[CachedResponse] = None) -> bytes:
+        """Rate-limited GET with retries; revalidates `cached` (ETag/Last-Modified) and stores the result."""
+        headers = cached.validators() if cached else {}
+        response = await self.api.get(url, params=params, headers=headers, timeout=timeout)
+        if response.status_code == 304 and cached:
+            self.cache.touch(key)
+            return cached.body
+        response.raise_for_status()
+        body = response.content
+        if self.cache:
+            json.loads(body) # Only cache what parses
+            self.cache.put(key, body, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return body
+
+    def _revalidate_in_background(self, key: str, url: str, params: Dict[str, str], timeout: float,
+                                  cached: CachedResponse):
+        # Runs on the API client's loop, so the set needs no lock
+        if key in self._revalidating:
+            return
+        self._revalidating.add(key)
+
+        async def refresh():
+            try:
+                await self._fetch(key, url, params, timeout, cached)
+            except Exception as e:
+                logger.debug(f"Background refresh of {key} failed: {e}")
+            finally:
+                self._revalidating.discard(key)
+
+        task = asyncio.get_running_loop().create_task(refresh())
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
     def _process_item(self, item: dict) -> Optional[Character]:
         try:
-            name = item.get("title", "Unknown")
-            char_id = item.get("id")
-            
-            user_obj = item.get("user", {})
-            author = user_obj.get("name", "Unknown") if isinstance(user_obj, dict) else "Unknown"
-            
-            image_url = item.get("previewUrl")
-            if not image_url and isinstance(user_obj, dict):
-                image_url = user_obj.get("image")
-                
-            detail_url = f"{self.BASE_URL}/character/{char_id}" if char_id else self.BASE_URL
-            download_url = item.get("dnaUrl")
-            
-            if not download_url:
-                return None
-
-            tags = item.get("tags", [])
-            created_at = item.get("createdAt", "")
-            
-            counts = item.get("_count", {})
-            downloads = counts.get("characterDownloads", 0)
-            likes = counts.get("characterLikes", 0)
-            
-            author_image = ""
-            if isinstance(user_obj, dict):
-                 author_image = user_obj.get("image", "")
-
-            return Character(
-                name=name,
-                author=author,
-                author_image=author_image,
-                url_detail=detail_url,
-                image_url=image_url or "",
-                download_url=download_url,
-                status="not_installed",
-                tags=tags,
-                downloads=downloads,
-                likes=likes,
-                created_at=created_at
-            )
+            return Character.from_api(item, self.BASE_URL)
         except Exception as e:
             logger.warning(f"Error processing item: {e}")
             return None
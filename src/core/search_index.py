@@ -0,0 +1,166 @@
+import bisect
+import unicodedata
+from collections import Counter
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from src.core.models import Character
+
+# Field weights for ranking: a hit in the name beats one in the description
+FIELD_WEIGHTS = {"name": 3.0, "author": 2.0, "tags": 1.5, "description": 1.0}
+MIN_SIMILARITY = 0.5 # Dice coefficient of trigrams needed for a fuzzy (typo) match
+PREFIX_SCORE = 1.0
+SUBSTRING_SCORE = 0.9
+FUZZY_SCALE = 0.8 # Fuzzy matches rank below exact prefixes/substrings
+
+def normalize(text: str) -> str:
+    """Casefolds and strips accents ("Zoë" -> "zoe")."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+def tokenize(text: str) -> List[str]:
+    return "".join(ch if ch.isalnum() else " " for ch in normalize(text)).split()
+
+def trigrams(token: str) -> Set[str]:
+    padded = f"${token}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class SearchIndex:
+    """
+    In-memory search index over character names, authors, tags and descriptions.
+
+    Documents are split into word tokens. Trigrams index the token vocabulary,
+    not the documents, so a query word is compared against each distinct word
+    once, no matter how many characters share it. Words match by prefix,
+    substring, or trigram similarity (typos). Every query word must match, and
+    results are ranked by field-weighted score. add() and remove() only touch
+    the document's own tokens, so the index can follow pages and file changes
+    incrementally.
+    """
+    def __init__(self):
+        self._doc_tokens: Dict[Hashable, Set[str]] = {}
+        self._postings: Dict[str, Dict[Hashable, float]] = {} # token -> {key: best field weight}
+        self._gram_tokens: Dict[str, Set[str]] = {}           # trigram -> tokens in the vocabulary
+        self._vocabulary: List[str] = []                      # sorted, for prefix lookups of short words
+
+    def __len__(self):
+        return len(self._doc_tokens)
+
+    def __contains__(self, key):
+        return key in self._doc_tokens
+
+    def clear(self):
+        self._doc_tokens.clear()
+        self._postings.clear()
+        self._gram_tokens.clear()
+        self._vocabulary.clear()
+
+    # --- Updates ---
+
+    def add(self, key: Hashable, fields: Dict[str, str]):
+        """Indexes (or re-indexes) a document given as {field name: text}."""
+        self.remove(key)
+        weights: Dict[str, float] = {}
+        for field, text in fields.items():
+            weight = FIELD_WEIGHTS.get(field, 1.0)
+            for token in tokenize(text or ""):
+                if weight > weights.get(token, 0.0):
+                    weights[token] = weight
+        self._doc_tokens[key] = set(weights)
+        for token, weight in weights.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                bisect.insort(self._vocabulary, token)
+                for gram in trigrams(token):
+                    self._gram_tokens.setdefault(gram, set()).add(token)
+            postings[key] = weight
+
+    def add_character(self, key: Hashable, character: Character):
+        tags = character.tags or []
+        self.add(key, {
+            "name": character.name,
+            "author": character.author,
+            "tags": " ".join(t for t in tags if isinstance(t, str)),
+            "description": getattr(character, "description", "") or "",
+        })
+
+    def add_characters(self, items: Iterable[Tuple[Hashable, Character]]):
+        for key, character in items:
+            self.add_character(key, character)
+
+    def remove(self, key: Hashable):
+        for token in self._doc_tokens.pop(key, ()):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.pop(key, None)
+            if not postings:
+                del self._postings[token]
+                del self._vocabulary[bisect.bisect_left(self._vocabulary, token)]
+                for gram in trigrams(token):
+                    tokens = self._gram_tokens.get(gram)
+                    if tokens is not None:
+                        tokens.discard(token)
+                        if not tokens:
+                            del self._gram_tokens[gram]
+
+    # --- Queries ---
+
+    def _matching_tokens(self, word: str) -> Dict[str, float]:
+        """Vocabulary tokens matching one query word, with a 0..1 match score."""
+        matches: Dict[str, float] = {}
+        if len(word) < 3:
+            # Too short for trigrams to say anything: prefix matches only
+            start = bisect.bisect_left(self._vocabulary, word)
+            for token in self._vocabulary[start:]:
+                if not token.startswith(word):
+                    break
+                matches[token] = PREFIX_SCORE
+            return matches
+
+        word_grams = trigrams(word)
+        shared = Counter()
+        for gram in word_grams:
+            shared.update(self._gram_tokens.get(gram, ()))
+        for token, count in shared.items():
+            if token.startswith(word):
+                matches[token] = PREFIX_SCORE
+            elif word in token:
+                matches[token] = SUBSTRING_SCORE
+            else:
+                # A token of n letters has n padded trigrams
+                dice = 2 * count / (len(word_grams) + len(token))
+                if dice >= MIN_SIMILARITY:
+                    matches[token] = dice * FUZZY_SCALE
+        return matches
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[Hashable, float]]:
+        """Keys matching every word of the query, best first, as (key, score)."""
+        words = tokenize(query)
+        if not words:
+            return []
+        scores: Optional[Dict[Hashable, float]] = None
+        for word in words:
+            word_scores: Dict[Hashable, float] = {}
+            # Biggest posting lists first: they are copied in one comprehension, the rest merged
+            matched = sorted(self._matching_tokens(word).items(), key=lambda m: len(self._postings[m[0]]), reverse=True)
+            for i, (token, match) in enumerate(matched):
+                postings = self._postings[token]
+                if i == 0:
+                    word_scores = {key: match * weight for key, weight in postings.items()}
+                    continue
+                for key, weight in postings.items():
+                    score = match * weight
+                    if score > word_scores.get(key, 0.0):
+                        word_scores[key] = score
+            if scores is None:
+                scores = word_scores
+            else:
+                if len(word_scores) > len(scores):
+                    scores = {key: s + word_scores[key] for key, s in scores.items() if key in word_scores}
+                else:
+                    scores = {key: scores[key] + s for key, s in word_scores.items() if key in scores}
+            if not scores:
+                return []
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:limit] if limit else ranked
@@ -0,0 +1,165 @@
+import zlib
+import struct
+import logging
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+from src.core.chf_format import ChfFile
+
+logger = logging.getLogger(__name__)
+
+# One-permutation MinHash: every shingle is hashed once and lands in one of
+# NUM_BINS bins, each keeping its minimum. LSH splits the bins into BANDS bands
+# of ROWS; two files sharing any whole band become candidates.
+NUM_BINS = 64
+BANDS = 16
+ROWS = NUM_BINS // BANDS
+SHINGLE_SIZE = 8
+SHINGLE_STRIDE = 4
+EMPTY = 0xFFFFFFFF
+DEFAULT_THRESHOLD = 0.85
+MAX_BUCKET = 500 # Bands shared by this many files (common header bytes) say nothing
+
+_BIN_SHIFT = 32 - (NUM_BINS.bit_length() - 1)
+_VALUE_MASK = (1 << _BIN_SHIFT) - 1
+
+MinHash = Tuple[int, ...]
+
+def compute_minhash(data) -> MinHash:
+    """MinHash signature of a bytes-like object, over overlapping SHINGLE_SIZE byte windows."""
+    bins = [EMPTY] * NUM_BINS
+    seen = set()
+    view = memoryview(data)
+    for offset in range(0, max(0, len(view) - SHINGLE_SIZE) + 1, SHINGLE_STRIDE):
+        shingle = view[offset:offset + SHINGLE_SIZE]
+        if not shingle:
+            break
+        # crc32 is fast but clusters; the multiply spreads it over bins and values
+        h = (zlib.crc32(shingle) * 0x9E3779B1) & 0xFFFFFFFF
+        if h in seen:
+            continue
+        seen.add(h)
+        b = h >> _BIN_SHIFT
+        value = h & _VALUE_MASK
+        if value < bins[b]:
+            bins[b] = value
+    return tuple(bins)
+
+def file_minhash(path: str) -> MinHash:
+    """Signature of a .chf over its content (trailing padding excluded)."""
+    with ChfFile(path) as chf:
+        with chf.content_view() as view:
+            return compute_minhash(view)
+
+def pack(signature: MinHash) -> bytes:
+    return struct.pack(f"<{NUM_BINS}I", *signature)
+
+def unpack(blob: bytes) -> MinHash:
+    return struct.unpack(f"<{NUM_BINS}I", blob)
+
+def similarity(a: MinHash, b: MinHash) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    used = equal = 0
+    for x, y in zip(a, b):
+        if x == EMPTY and y == EMPTY:
+            continue
+        used += 1
+        if x == y:
+            equal += 1
+    return equal / used if used else 1.0
+
+class SimilarityIndex:
+    """
+    In-memory LSH index of MinHash signatures.
+
+    Adding or removing a key touches only its BANDS buckets, and a query only
+    compares against the keys sharing a bucket, so neither depends on library size.
+    """
+    def __init__(self):
+        self._signatures: Dict[Hashable, MinHash] = {}
+        self._buckets: Dict[Tuple[int, MinHash], set] = {}
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def __contains__(self, key):
+        return key in self._signatures
+
+    @staticmethod
+    def _bands(signature: MinHash) -> Iterable[Tuple[int, MinHash]]:
+        for band in range(BANDS):
+            rows = signature[band * ROWS:(band + 1) * ROWS]
+            if EMPTY not in rows:
+                yield band, rows
+
+    def get(self, key) -> Optional[MinHash]:
+        return self._signatures.get(key)
+
+    def add(self, key, signature: MinHash):
+        if key in self._signatures:
+            self.remove(key)
+        self._signatures[key] = signature
+        for bucket in self._bands(signature):
+            self._buckets.setdefault(bucket, set()).add(key)
+
+    def remove(self, key):
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for bucket in self._bands(signature):
+            members = self._buckets.get(bucket)
+            if members is not None:
+                members.discard(key)
+                if not members:
+                    del self._buckets[bucket]
+
+    def query(self, signature: MinHash, threshold: float = DEFAULT_THRESHOLD) -> List[Tuple[Hashable, float]]:
+        """Keys whose estimated similarity to signature is at least threshold, best first."""
+        candidates = set()
+        for bucket in self._bands(signature):
+            members = self._buckets.get(bucket, ())
+            if len(members) <= MAX_BUCKET:
+                candidates.update(members)
+        matches = []
+        for key in candidates:
+            score = similarity(signature, self._signatures[key])
+            if score >= threshold:
+                matches.append((key, score))
+        matches.sort(key=lambda m: m[1], reverse=True)
+        return matches
+
+    def clusters(self, threshold: float = DEFAULT_THRESHOLD) -> List[List[Hashable]]:
+        """Groups of two or more keys linked by similarity >= threshold (union-find over LSH candidates)."""
+        parent: Dict[Hashable, Hashable] = {}
+
+        def find(key):
+            root = key
+            while parent.get(root, root) != root:
+                root = parent[root]
+            while key != root:
+                parent[key], key = root, parent.get(key, key)
+            return root
+
+        checked = set()
+        for (band, _rows), members in self._buckets.items():
+            if len(members) < 2:
+                continue
+            if len(members) > MAX_BUCKET:
+                logger.debug(f"Skipping LSH bucket of {len(members)} files in band {band}")
+                continue
+            ordered = sorted(members, key=str)
+            for i, a in enumerate(ordered):
+                for b in ordered[i + 1:]:
+                    parent.setdefault(a, a)
+                    parent.setdefault(b, b)
+                    if find(a) == find(b) or (a, b) in checked:
+                        continue
+                    checked.add((a, b))
+                    if similarity(self._signatures[a], self._signatures[b]) >= threshold:
+                        parent[find(b)] = find(a)
+
+        groups: Dict[Hashable, List[Hashable]] = {}
+        for key in parent:
+            groups.setdefault(find(key), []).append(key)
+        result = [sorted(group, key=str) for group in groups.values() if len(group) > 1]
+        result.sort(key=lambda g: (-len(g), str(g[0])))
+        return result
@@ -1,12 +1,12 @@
 import os
-import time
 import logging
 from typing import List, Optional, Callable, Dict, Any
-from PySide6.QtCore import QRunnable, QObject, Signal, Slot, QUrl
+from PySide6.QtCore import QRunnable, QObject, Signal, Slot
 
 from src.core.models import Character
 from src.core.scraper import Scraper
 from src.core.downloader import Downloader
+from src.core.library_index import LibraryIndex
 
 logger = logging.getLogger(__name__)
 
@@ -68,37 +68,13 @@ class ScraperWorker(BaseWorker):
                 self.signals.result.emit((chars, has_next))
                 self.signals.finished.emit()
             else:
-                from concurrent.futures import ThreadPoolExecutor, as_completed
-
-                all_characters = []
-                pages = range(self.start_page, self.start_page + self.pages_to_fetch)
-                results_map = {}
-
-                with ThreadPoolExecutor(max_workers=min(10, self.pages_to_fetch)) as executor:
-                    future_to_page = {
-                        executor.submit(
-                            self.scraper.get_character_list,
-                            page=p,
-                            search_query=self.search_query,
-                            order_by=self.order_by,
-                        ): p
-                        for p in pages
-                    }
-
-                    for future in as_completed(future_to_page):
-                        page = future_to_page[future]
-                        try:
-                            chars, has_next = future.result()
-                            if chars:
-                                results_map[page] = (chars, has_next)
-                        except Exception as e:
-                            logger.error(f"Error fetching page {page}: {e}")
-
-                for p in sorted(results_map.keys()):
-                    all_characters.extend(results_map[p][0])
-                last_page = self.start_page + self.pages_to_fetch - 1
-                has_next = results_map[last_page][1] if last_page in results_map else False
-
+                # Pages are fetched concurrently by the scraper's rate-limited API client
+                all_characters, has_next = self.scraper.get_character_pages(
+                    self.start_page,
+                    self.pages_to_fetch,
+                    search_query=self.search_query,
+                    order_by=self.order_by,
+                )
                 self.signals.result.emit((all_characters, has_next))
                 self.signals.finished.emit()
                 
@@ -106,6 +82,26 @@ class ScraperWorker(BaseWorker):
             logger.error(f"ScraperWorker error: {e}")
             self.signals.error.emit(str(e))
 
+class CatalogSyncWorker(BaseWorker):
+    """
+    Worker to bring the local catalog mirror up to date (full sync the first
+    time, delta afterwards). Emits the number of new characters.
+    """
+    def __init__(self, catalog, scraper: Scraper):
+        super().__init__()
+        self.catalog = catalog
+        self.scraper = scraper
+
+    @Slot()
+    def run(self):
+        try:
+            added = self.catalog.sync(self.scraper, progress_callback=lambda n: self.signals.progress.emit(str(n)))
+            self.signals.result.emit(added)
+            self.signals.finished.emit()
+        except Exception as e:
+            logger.error(f"CatalogSyncWorker error: {e}")
+            self.signals.error.emit(str(e))
+
 class RandomCharactersWorker(BaseWorker):
     """Fetches random characters from the API for the roulette (GET /api/heads/random)."""
     def __init__(self, scraper: Scraper, count: int = 20):
@@ -148,10 +144,13 @@ class InstallWorker(BaseWorker):
 class InstalledCharactersWorker(BaseWorker):
     """
     Worker to scan the local directory for installed characters.
+    Uses the persistent LibraryIndex so unchanged files are not re-read.
+    Never touches the network; see MetadataEnricher for online lookups.
     """
-    def __init__(self, game_path: str):
+    def __init__(self, game_path: str, library_index: Optional[LibraryIndex] = None):
         super().__init__()
         self.game_path = game_path
+        self.library_index = library_index or LibraryIndex()
         
     @Slot()
     def run(self):
@@ -161,122 +160,8 @@ class InstalledCharactersWorker(BaseWorker):
                 self.signals.finished.emit()
                 return
 
-            files = [f for f in os.listdir(self.game_path) if f.lower().endswith('.chf')]
-            files.sort()
-            
-            chars = []
-            self.scraper = Scraper() # Initialize scraper for potential metadata recovery
-            
-            # Helper to process a single file (extracted for threading)
-            def process_file_metadata(f):
-                try:
-                    name = os.path.splitext(f)[0]
-                    file_full_path = os.path.join(self.game_path, f)
-                    json_path = os.path.join(self.game_path, f"{name}.json")
-                    thumb_path = os.path.join(self.game_path, f"{name}_thumb.jpg")
-                    
-                    mtime = os.path.getmtime(file_full_path)
-                    
-                    # Check for custom thumbnail
-                    image_url = ""
-                    if os.path.exists(thumb_path):
-                         # Convert to file URI
-                         image_url = QUrl.fromLocalFile(thumb_path).toString()
-
-                    char_data = {
-                        "name": name,
-                        "url_detail": "",
-                        "image_url": image_url,
-                        "author": "Local",
-                        "author_image": "",
-                        "download_url": None,
-                        "status": "installed",
-                        "install_date": mtime,
-                        "tags": [],
-                        "downloads": 0,
-                        "likes": 0,
-                        "created_at": "",
-                        "local_filename": f
-                    }
-                    
-                    # Try to load richer metadata if available
-                    if os.path.exists(json_path):
-                        try:
-                            import json
-                            with open(json_path, 'r') as jf:
-                                metadata = json.load(jf)
-                                # Update but preserve local status
-                                char_data.update(metadata)
-                                char_data["status"] = "installed"
-                                char_data["local_filename"] = f 
-                                
-                                # Clean up extra keys that are not in dataclass
-                                valid_keys = {'name', 'url_detail', 'image_url', 'author', 'author_image', 'download_url', 'status', 'install_date', 'tags', 'downloads', 'likes', 'created_at', 'local_filename'}
-                                keys_to_remove = [k for k in char_data if k not in valid_keys]
-                                for k in keys_to_remove:
-                                    del char_data[k]
-                        except Exception:
-                            pass # Ignore malformed json
-                    else:
-                        # No metadata found (manual install) - Fetch online
-                        try:
-                             # Clean name for search (remove obvious separators)
-                             search_name = name.replace("_", " ").strip()
-                             
-                             # Search
-                             found_chars, _ = self.scraper.get_character_list(page=1, search_query=search_name)
-
-                             if found_chars:
-                                 # Use the first match (assumed most relevant)
-                                 match = found_chars[0]
-                                 
-                                 char_data["image_url"] = match.image_url
-                                 char_data["author"] = match.author
-                                 char_data["author_image"] = match.author_image
-                                 char_data["url_detail"] = match.url_detail
-                                 char_data["tags"] = match.tags
-                                 char_data["downloads"] = match.downloads
-                                 char_data["likes"] = match.likes
-                                 char_data["created_at"] = match.created_at
-                                 
-                                 # Save valid metadata to json to avoid re-scraping and speed up future loads
-                                 try:
-                                    import json
-                                    to_save = char_data.copy()
-                                    with open(json_path, 'w') as jf:
-                                        json.dump(to_save, jf, indent=4)
-                                 except Exception as save_err:
-                                    logger.warning(f"Failed to save metadata for {name}: {save_err}")
-
-                        except Exception as e:
-                            logger.warning(f"Failed to fetch metadata for local char {name}: {e}")
-                    
-                    return Character(**char_data)
-                except Exception as e:
-                    logger.error(f"Error processing file {f}: {e}")
-                    return None
-
-            # Use ThreadPoolExecutor to process files in parallel
-            from concurrent.futures import ThreadPoolExecutor, as_completed
-            
-            # Limit workers to avoid spamming the API too hard but speed up local reads
-            # PERFORMANCE: Increased to 10 for SSD optimization
-            max_workers = 10
-            
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                # Submit all tasks
-                future_to_file = {executor.submit(process_file_metadata, f): f for f in files}
-                
-                # Collect results
-                for future in as_completed(future_to_file):
-                    result = future.result()
-                    if result:
-                        chars.append(result)
-            
-            # Sort chars by name (or install date?) - keeping mostly original sort order is hard with as_completed
-            # So let's sort explicitly by name at the end
-            chars.sort(key=lambda c: c.name.lower())
-
+            # Local only: characters without a sidecar are looked up later by the MetadataEnricher
+            chars, _ = self.library_index.scan(self.game_path)
             self.signals.result.emit(chars)
             self.signals.finished.emit()
             
@@ -284,47 +169,150 @@ class InstalledCharactersWorker(BaseWorker):
             logger.error(f"InstalledCharactersWorker error: {e}")
             self.signals.error.emit(str(e))
 
-class PrefetchSignals(QObject):
-    page_ready = Signal(int, list) # page_num, characters
+class LibraryDeltaWorker(BaseWorker):
+    """
+    Worker to apply watcher deltas to the library index.
+    Emits (changes, {filename: Character or None}) for just the affected files.
+    """
+    def __init__(self, game_path: str, library_index: LibraryIndex, changes: list):
+        super().__init__()
+        self.game_path = game_path
+        self.library_index = library_index
+        self.changes = changes
+
+    @Slot()
+    def run(self):
+        try:
+            filenames = []
+            for change in self.changes:
+                if change.old_filename:
+                    filenames.append(change.old_filename)
+                filenames.append(change.filename)
+
+            refreshed = self.library_index.refresh_files(self.game_path, filenames)
+            self.signals.result.emit((self.changes, refreshed))
+            self.signals.finished.emit()
+        except Exception as e:
+            logger.error(f"LibraryDeltaWorker error: {e}")
+            self.signals.error.emit(str(e))
 
-class PrefetchWorker(QRunnable):
+class DeployWorker(BaseWorker):
     """
-    Worker to proactively fetch next pages in the background.
+    Worker to sync LIVE characters to the other environments.
+    With dry_run it only emits the DeployPlan; otherwise it executes `plan`
+    (or a fresh one) and emits the plan with final stats.
     """
-    def __init__(self, scraper: Scraper, start_page: int = 2, search_query: Optional[str] = None):
+    def __init__(self, character_service, dry_run: bool = False, plan=None):
         super().__init__()
-        self.scraper = scraper
-        self.current_page = start_page
-        self.search_query = search_query
-        self.signals = PrefetchSignals()
-        self.is_running = True
-        
+        self.character_service = character_service
+        self.dry_run = dry_run
+        self.plan = plan
+
     @Slot()
     def run(self):
-        while self.is_running:
-            try:
-                if not self.is_running: break
-                
-                chars, _ = self.scraper.get_character_list(self.current_page, search_query=self.search_query)
-                if not chars:
-                    break
+        try:
+            def on_progress(done, total):
+                self.signals.progress.emit(f"{done}/{total}")
 
-                if not self.is_running: break
+            plan = self.character_service.deploy_to_ptu(dry_run=self.dry_run, progress_callback=on_progress, plan=self.plan)
+            self.signals.result.emit(plan)
+            self.signals.finished.emit()
+        except Exception as e:
+            logger.error(f"DeployWorker error: {e}")
+            self.signals.error.emit(str(e))
 
-                self.signals.page_ready.emit(self.current_page, chars)
-                self.current_page += 1
-                
-                # Sleep to be polite
-                import time
-                for _ in range(10): # Check stop every 10ms
-                    if not self.is_running: break
-                    time.sleep(0.01)
-            except Exception as e:
-                logger.error(f"Prefetch error: {e}")
-                break
-    
-    def stop(self):
-        self.is_running = False
+class RestoreWorker(BaseWorker):
+    """
+    Worker to restore a zip backup off the UI thread.
+    With dry_run it only emits the RestorePlan; otherwise it restores
+    (using `plan` if given) and emits (plan, characters_restored).
+    """
+    def __init__(self, character_service, zip_path: str, dry_run: bool = False, plan=None):
+        super().__init__()
+        self.character_service = character_service
+        self.zip_path = zip_path
+        self.dry_run = dry_run
+        self.plan = plan
+
+    @Slot()
+    def run(self):
+        try:
+            plan = self.plan or self.character_service.plan_restore(self.zip_path)
+            if self.dry_run:
+                self.signals.result.emit(plan)
+            else:
+                def on_progress(done, total):
+                    self.signals.progress.emit(f"{done}/{total}")
+
+                count = self.character_service.restore_backup(self.zip_path, on_progress, plan)
+                self.signals.result.emit((plan, count))
+            self.signals.finished.emit()
+        except Exception as e:
+            logger.error(f"RestoreWorker error: {e}")
+            self.signals.error.emit(str(e))
+
+class SnapshotRestoreWorker(BaseWorker):
+    """
+    Worker to restore an incremental auto-backup snapshot off the UI thread.
+    Emits the number of files written.
+    """
+    def __init__(self, backups, snapshot_id: str, target_dir: str):
+        super().__init__()
+        self.backups = backups
+        self.snapshot_id = snapshot_id
+        self.target_dir = target_dir
+
+    @Slot()
+    def run(self):
+        try:
+            count = self.backups.restore(self.snapshot_id, self.target_dir)
+            self.signals.result.emit(count)
+            self.signals.finished.emit()
+        except Exception as e:
+            logger.error(f"SnapshotRestoreWorker error: {e}")
+            self.signals.error.emit(str(e))
+
+class RepairWorker(BaseWorker):
+    """
+    Worker to run library maintenance off the UI thread.
+    With dry_run it only emits the RepairPlan; otherwise it executes `plan`
+    (or a fresh one) and emits the plan with its results.
+    """
+    def __init__(self, character_service, dry_run: bool = False, plan=None):
+        super().__init__()
+        self.character_service = character_service
+        self.dry_run = dry_run
+        self.plan = plan
+
+    @Slot()
+    def run(self):
+        try:
+            plan = self.character_service.repair_library(dry_run=self.dry_run, plan=self.plan)
+            self.signals.result.emit(plan)
+            self.signals.finished.emit()
+        except Exception as e:
+            logger.error(f"RepairWorker error: {e}")
+            self.signals.error.emit(str(e))
+
+class DuplicateScanWorker(BaseWorker):
+    """
+    Worker to group near-identical installed characters off the UI thread.
+    Emits the list of filename groups from CharacterService.find_duplicates.
+    """
+    def __init__(self, character_service, threshold: Optional[float] = None):
+        super().__init__()
+        self.character_service = character_service
+        self.threshold = threshold
+
+    @Slot()
+    def run(self):
+        try:
+            groups = self.character_service.find_duplicates(self.threshold)
+            self.signals.result.emit(groups)
+            self.signals.finished.emit()
+        except Exception as e:
+            logger.error(f"DuplicateScanWorker error: {e}")
+            self.signals.error.emit(str(e))
 
 class UpdateWorker(BaseWorker):
     """
@@ -1,5 +1,6 @@
 from PySide6.QtCore import QObject, Signal
 from src.core.workers import InstallWorker
+from src.core.download_queue import DownloadQueue
 
 class InstallationController(QObject):
     """
@@ -9,13 +10,22 @@ class InstallationController(QObject):
     install_started = Signal(str) # message
     install_finished = Signal(bool, object) # success, character/error_msg
     uninstall_finished = Signal(bool, str) # success, message
+    batch_progress = Signal(int, int) # finished, total
+    batch_item_installed = Signal(object) # character
+    batch_finished = Signal(int, int, int) # succeeded, failed, cancelled
 
-    def __init__(self, character_service, downloader, threadpool, parent=None):
+    def __init__(self, character_service, downloader, threadpool, parent=None, max_parallel=None):
         super().__init__(parent)
         self._character_service = character_service
         self._downloader = downloader
         self._threadpool = threadpool
 
+        # Cola de descargas masivas (transferencias paralelas acotadas)
+        self._queue = DownloadQueue(downloader, max_parallel, self)
+        self._queue.progress.connect(self.batch_progress.emit)
+        self._queue.item_finished.connect(self._on_batch_item_finished)
+        self._queue.batch_finished.connect(self.batch_finished.emit)
+
     def install_character(self, character):
         """
         Orquesta la instalación de un personaje.
@@ -32,6 +42,30 @@ class InstallationController(QObject):
         worker.signals.error.connect(self._on_install_error)
         self._threadpool.start(worker)
 
+    def install_batch(self, characters):
+        """
+        Encola una instalación masiva. El progreso se agrega en batch_progress
+        y batch_finished se emite una sola vez al terminar el lote.
+        """
+        characters = [c for c in characters if c]
+        if not characters:
+            return 0
+        self.install_started.emit(f"Instalando {len(characters)} personajes...")
+        return self._queue.enqueue(characters)
+
+    def cancel_batch(self):
+        self._queue.cancel()
+
+    def is_batch_running(self):
+        return self._queue.is_running()
+
+    def set_max_parallel_downloads(self, count):
+        self._queue.set_max_parallel(count)
+
+    def _on_batch_item_finished(self, character, success, message):
+        if success:
+            self.batch_item_installed.emit(character)
+
     def _on_install_success(self, result):
         # Result es una lista [character] según el worker original
         # Emitimos éxito con el objeto personaje
@@ -50,6 +84,7 @@ class InstallationController(QObject):
         try:
             success = self._character_service.uninstall_character(character)
             if success:
+                self._downloader.forget_character(character)
                 self.uninstall_finished.emit(True, f"Personaje '{character.name}' eliminado correctamente.")
             else:
                 self.uninstall_finished.emit(False, "No se pudo eliminar el archivo o no existe.")
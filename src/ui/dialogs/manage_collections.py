@@ -2,14 +2,15 @@ from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QListWidget,
                                QPushButton, QLabel, QInputDialog, QMessageBox, QFileDialog)
 from PySide6.QtCore import Qt
 import os
-import zipfile
 import shutil
+from src.core.archive_writer import write_archive, DEFAULT_COMPRESSION
 
 class ManageCollectionsDialog(QDialog):
-    def __init__(self, collection_manager, game_path, parent=None):
+    def __init__(self, collection_manager, game_path, parent=None, compression_level=DEFAULT_COMPRESSION):
         super().__init__(parent)
         self.collection_manager = collection_manager
         self.game_path = game_path
+        self.compression_level = compression_level
         self.setWindowTitle("Manage Collections")
         self.resize(400, 500)
         self.setup_ui()
@@ -81,7 +82,7 @@ class ManageCollectionsDialog(QDialog):
         if not item: return
         
         col_name = item.text()
-        chars = self.collection_manager.get_characters_in_collection(col_name) # Ensure this exists or use .collections[col_name]
+        chars = self.collection_manager.get_characters_in_collection(col_name)
         
         if not chars:
             QMessageBox.warning(self, "Empty", "This collection is empty.")
@@ -95,37 +96,38 @@ class ManageCollectionsDialog(QDialog):
             return
             
         try:
-            with zipfile.ZipFile(save_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-                # 1. Create Manifest
-                import json
-                manifest = {
-                    "version": 1,
-                    "type": "collection",
-                    "collection_name": col_name,
-                    "characters": chars,
-                    "created_at": str(os.path.getmtime(self.game_path) if os.path.exists(self.game_path) else "")
-                }
-                zf.writestr("manifest.json", json.dumps(manifest, indent=4))
-                
-                # 2. Add Character Files
-                added_count = 0
-                for char_name in chars:
-                    # Finds files by name... simplistic approach
-                    # Real files are named {char_name}.chf usually
-                    base_name = char_name
-                    
-                    # We try to match exactly or close
-                    chf_path = os.path.join(self.game_path, f"{base_name}.chf")
-                    json_path = os.path.join(self.game_path, f"{base_name}.json")
-                    thumb_path = os.path.join(self.game_path, f"{base_name}_thumb.jpg")
-                    
-                    if os.path.exists(chf_path):
-                        zf.write(chf_path, f"{base_name}.chf")
-                        if os.path.exists(json_path):
-                            zf.write(json_path, f"{base_name}.json")
-                        if os.path.exists(thumb_path):
-                            zf.write(thumb_path, f"{base_name}_thumb.jpg")
-                        added_count += 1
+            # 1. Create Manifest
+            import json
+            manifest = {
+                "version": 1,
+                "type": "collection",
+                "collection_name": col_name,
+                "characters": chars,
+                "created_at": str(os.path.getmtime(self.game_path) if os.path.exists(self.game_path) else "")
+            }
+            members = [("manifest.json", json.dumps(manifest, indent=4).encode('utf-8'))]
+
+            # 2. Add Character Files
+            added_count = 0
+            for char_name in chars:
+                # Finds files by name... simplistic approach
+                # Real files are named {char_name}.chf usually
+                base_name = char_name
+
+                chf_path = os.path.join(self.game_path, f"{base_name}.chf")
+                json_path = os.path.join(self.game_path, f"{base_name}.json")
+                thumb_path = os.path.join(self.game_path, f"{base_name}_thumb.jpg")
+
+                if os.path.exists(chf_path):
+                    members.append((f"{base_name}.chf", chf_path))
+                    if os.path.exists(json_path):
+                        members.append((f"{base_name}.json", json_path))
+                    if os.path.exists(thumb_path):
+                        members.append((f"{base_name}_thumb.jpg", thumb_path))
+                    added_count += 1
+
+            # 3. Compress in parallel (thumbnails are already JPEG and get stored as-is)
+            write_archive(save_path, members, level=self.compression_level)
                 
             QMessageBox.information(self, "Export Success", f"Exported {added_count} characters to {os.path.basename(save_path)}")
             
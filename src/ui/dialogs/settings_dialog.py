@@ -1,7 +1,10 @@
 from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
-                               QLineEdit, QPushButton, QFileDialog, QMessageBox, QCheckBox, QComboBox, QFrame, QWidget)
+                               QLineEdit, QPushButton, QFileDialog, QMessageBox, QCheckBox, QComboBox, QFrame, QWidget, QSpinBox)
 from PySide6.QtCore import Qt
 from src.core.config_manager import ConfigManager
+from src.core.download_queue import DownloadQueue
+from src.core.incremental_backup import IncrementalBackup
+from src.core.archive_writer import COMPRESSION_LEVELS, DEFAULT_COMPRESSION
 from src.utils.translations import translator
 from src.ui.widgets import setup_localized_context_menu
 
@@ -66,6 +69,28 @@ class SettingsDialog(QDialog):
         
         ptu_layout.addLayout(ptu_input_layout)
         layout.addLayout(ptu_layout)
+
+        # Parallel Downloads (bulk install queue)
+        downloads_layout = QHBoxLayout()
+        downloads_layout.addWidget(QLabel("Parallel Downloads:"))
+        self.spin_parallel = QSpinBox()
+        self.spin_parallel.setRange(1, DownloadQueue.MAX_PARALLEL)
+        self.spin_parallel.setValue(self.config_manager.config.get("max_parallel_downloads", DownloadQueue.DEFAULT_PARALLEL))
+        downloads_layout.addWidget(self.spin_parallel)
+        downloads_layout.addStretch()
+        layout.addLayout(downloads_layout)
+
+        # Backup / pack export compression
+        compression_layout = QHBoxLayout()
+        compression_layout.addWidget(QLabel("Backup Compression:"))
+        self.combo_compression = QComboBox()
+        for level in COMPRESSION_LEVELS:
+            self.combo_compression.addItem(level.capitalize(), level)
+        current = self.config_manager.config.get("backup_compression", DEFAULT_COMPRESSION)
+        self.combo_compression.setCurrentIndex(max(0, self.combo_compression.findData(current)))
+        compression_layout.addWidget(self.combo_compression)
+        compression_layout.addStretch()
+        layout.addLayout(compression_layout)
         
 
         
@@ -82,6 +107,16 @@ class SettingsDialog(QDialog):
         self.chk_auto_backup = QCheckBox("Enable Smart Auto-Backup (On Game Exit)")
         self.chk_auto_backup.setChecked(self.config_manager.config.get("auto_backup_enabled", True))
         auto_layout.addWidget(self.chk_auto_backup)
+
+        budget_layout = QHBoxLayout()
+        budget_layout.addWidget(QLabel("Auto-Backup Storage Limit (MB):"))
+        self.spin_backup_budget = QSpinBox()
+        self.spin_backup_budget.setRange(10, 10000)
+        self.spin_backup_budget.setSingleStep(50)
+        self.spin_backup_budget.setValue(self.config_manager.config.get("auto_backup_budget_mb", IncrementalBackup.DEFAULT_BUDGET_MB))
+        budget_layout.addWidget(self.spin_backup_budget)
+        budget_layout.addStretch()
+        auto_layout.addLayout(budget_layout)
         
         # Cloud Sync
         self.chk_cloud_sync = QCheckBox("Enable Cloud Sync (Copy to External Folder)")
@@ -172,8 +207,11 @@ class SettingsDialog(QDialog):
         
         # Save Automation Settings
         self.config_manager.config["auto_backup_enabled"] = self.chk_auto_backup.isChecked()
+        self.config_manager.config["auto_backup_budget_mb"] = self.spin_backup_budget.value()
         self.config_manager.config["cloud_sync_enabled"] = self.chk_cloud_sync.isChecked()
         self.config_manager.config["cloud_sync_path"] = self.cloud_path_input.text()
+        self.config_manager.config["max_parallel_downloads"] = self.spin_parallel.value()
+        self.config_manager.config["backup_compression"] = self.combo_compression.currentData()
         self.config_manager.save_config()
 
         # Validate
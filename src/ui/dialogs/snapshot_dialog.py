@@ -0,0 +1,67 @@
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem,
+                               QPushButton, QLabel)
+from PySide6.QtCore import Qt
+from datetime import datetime
+
+class SnapshotDialog(QDialog):
+    """Lists the incremental auto-backups, newest first, and lets the user pick one to restore."""
+    def __init__(self, backups, parent=None):
+        super().__init__(parent)
+        self.backups = backups
+        self.selected_snapshot = None
+        self.setWindowTitle("Restore Auto-Backup")
+        self.resize(460, 420)
+        self.setup_ui()
+        self.refresh_list()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        self.info_label = QLabel("Files in the backup are written back to the library. Characters installed since are kept.")
+        self.info_label.setWordWrap(True)
+        layout.addWidget(self.info_label)
+
+        self.list_widget = QListWidget()
+        self.list_widget.itemDoubleClicked.connect(lambda _: self.restore_selected())
+        layout.addWidget(self.list_widget)
+
+        btn_layout = QHBoxLayout()
+
+        self.btn_restore = QPushButton("Restore")
+        self.btn_restore.clicked.connect(self.restore_selected)
+
+        btn_close = QPushButton("Close")
+        btn_close.clicked.connect(self.reject)
+
+        btn_layout.addStretch()
+        btn_layout.addWidget(self.btn_restore)
+        btn_layout.addWidget(btn_close)
+
+        layout.addLayout(btn_layout)
+
+    @staticmethod
+    def describe(manifest: dict) -> str:
+        try:
+            when = datetime.fromisoformat(manifest.get("created_at", "")).strftime("%Y-%m-%d %H:%M")
+        except ValueError:
+            when = manifest["id"]
+        count = sum(1 for name in manifest.get("files", {}) if name.lower().endswith(".chf"))
+        return f"{when}  —  {count} characters  ({manifest.get('reason', 'Auto')})"
+
+    def refresh_list(self):
+        self.list_widget.clear()
+        for manifest in self.backups.list_snapshots():
+            item = QListWidgetItem(self.describe(manifest))
+            item.setData(Qt.UserRole, manifest["id"])
+            self.list_widget.addItem(item)
+        if self.list_widget.count():
+            self.list_widget.setCurrentRow(0)
+        else:
+            self.info_label.setText("No auto-backups yet. One is taken each time the game closes.")
+        self.btn_restore.setEnabled(self.list_widget.count() > 0)
+
+    def restore_selected(self):
+        item = self.list_widget.currentItem()
+        if not item: return
+        self.selected_snapshot = item.data(Qt.UserRole)
+        self.accept()
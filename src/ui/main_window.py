@@ -13,6 +13,8 @@ from datetime import datetime
 
 from src.core.config_manager import ConfigManager
 from src.core.scraper import Scraper
+from src.core.http_cache import ResponseCache
+from src.core.catalog import Catalog
 from src.core.downloader import Downloader
 from src.core.models import Character
 from src.core.collection_manager import CollectionManager
@@ -28,12 +30,16 @@ from src.ui.theme_manager import ThemeManager
 from src.ui.anim_config import AnimConfig
 from src.core.updater import UpdateManager
 from src.ui.dialogs.update_dialog import UpdateDialog
+from src.ui.dialogs.snapshot_dialog import SnapshotDialog
 from src.ui.tabs.installed_tab import InstalledTab
 from src.ui.tabs.online_tab import OnlineTab
 from src.core.workers import (
-    InstallWorker, InstalledCharactersWorker, UpdateWorker, RandomCharactersWorker
+    InstallWorker, InstalledCharactersWorker, UpdateWorker, RandomCharactersWorker, DeployWorker, RestoreWorker,
+    DuplicateScanWorker, RepairWorker, CatalogSyncWorker, SnapshotRestoreWorker
 )
 from src.core.character_service import CharacterService
+from src.core.download_queue import DownloadQueue
+from src.core.metadata_enricher import MetadataEnricher
 from src.ui.components.title_bar import TitleBar, CustomMenuBar
 from src.utils.discord_manager import DiscordManager
 from src.ui.dialogs.character_detail_modal import CharacterDetailModal
@@ -63,6 +69,7 @@ from src.ui.controllers.installation_controller import InstallationController
 
 class MainWindow(FramelessWindow):
     EXIT_CODE_REBOOT = 2506
+    library_changed = Signal(list) # list[LibraryChange], emitted from the watcher thread
 
     def __init__(self):
         super().__init__()
@@ -71,10 +78,13 @@ class MainWindow(FramelessWindow):
         self.resize(1280, 720)
         self.center_on_screen()
         
-    def on_files_changed_externally(self):
-        """Called when watchdog detects changes in the game directory."""
-        # Use QTimer to debounce or just run on main thread
-        QTimer.singleShot(0, self.refresh_installed_data)
+    def on_files_changed_externally(self, changes):
+        """Called (on the UI thread) with a batch of watcher deltas for the game directory."""
+        self.downloader.duplicate_index.invalidate(
+            [c.filename for c in changes] + [c.old_filename for c in changes if c.old_filename]
+        )
+        if hasattr(self, 'installed_tab'):
+            self.installed_tab.apply_library_changes(changes)
 
     def refresh_installed_data(self):
         # Refresh Installed Tab
@@ -193,7 +203,8 @@ class MainWindow(FramelessWindow):
         self.theme_manager = ThemeManager(self.config_manager)
         self.theme_manager.theme_changed.connect(self.apply_styles)
         
-        self.scraper = Scraper()
+        self.scraper = Scraper(cache=ResponseCache(self.config_manager.config_dir))
+        self.catalog = Catalog(self.config_manager.config_dir)
         self.downloader = Downloader(self.config_manager)
         self.image_loader = ImageLoader()
         self.threadpool = QThreadPool()
@@ -213,7 +224,7 @@ class MainWindow(FramelessWindow):
         # Local Pagination State
         self.display_candidates = [] # List of characters to display (filtered) (Legacy, can be removed if unused)
         
-        # Prefetch logic removed in favor of threaded scraper
+        # Next-page prefetching lives in OnlineTab (PrefetchEngine)
         self.is_checking_updates = False
         self.manual_check_pending = False
         self.update_watchdog = QTimer(self)
@@ -238,6 +249,11 @@ class MainWindow(FramelessWindow):
         
         # Share collection manager with installed tab
         self.installed_tab.set_collection_manager(self.collection_manager)
+        self.online_tab.set_catalog(self.catalog)
+        self.metadata_enricher = MetadataEnricher(
+            self.scraper, self.character_service.library_index, self.catalog, parent=self
+        )
+        self.installed_tab.set_metadata_enricher(self.metadata_enricher)
         
         # Check config on startup
         if not self.config_manager.validate_path():
@@ -249,17 +265,24 @@ class MainWindow(FramelessWindow):
         # Check for updates in background
         QTimer.singleShot(2000, self.check_for_updates)
         
-        # Start File Watcher
-        self.character_service.start_watcher(self.on_files_changed_externally)
+        # Start File Watcher (signal hops the deltas from the watcher thread to the UI thread)
+        self.library_changed.connect(self.on_files_changed_externally)
+        self.character_service.start_watcher(self.library_changed.emit)
 
         # --- Controllers ---
         self.navigation = NavigationController(self)
-        self.installation_controller = InstallationController(self.character_service, self.downloader, self.threadpool, self)
+        self.installation_controller = InstallationController(
+            self.character_service, self.downloader, self.threadpool, self,
+            max_parallel=self.config_manager.config.get("max_parallel_downloads", DownloadQueue.DEFAULT_PARALLEL)
+        )
         
         # Connect Controller Signals
         self.installation_controller.install_started.connect(lambda msg: self.status_label.setText(msg))
         self.installation_controller.install_finished.connect(self._on_controller_install_finished)
         self.installation_controller.uninstall_finished.connect(self._on_controller_uninstall_finished)
+        self.installation_controller.batch_progress.connect(self._on_batch_install_progress)
+        self.installation_controller.batch_item_installed.connect(self._on_batch_item_installed)
+        self.installation_controller.batch_finished.connect(self._on_batch_install_finished)
         
         # Automation Service
         self.automation_service = AutomationService(self.config_manager, self.character_service)
@@ -366,6 +389,8 @@ class MainWindow(FramelessWindow):
         # Connect signals
         self.online_tab.character_clicked.connect(self.show_character_detail)
         self.online_tab.install_clicked.connect(self.install_character)
+        self.online_tab.bulk_install_requested.connect(self.install_characters_batch)
+        self.online_tab.bulk_cancel_requested.connect(self.cancel_batch_install)
         self.online_tab.delete_clicked.connect(self.uninstall_character)
         self.online_tab.toast_requested.connect(self.show_toast)
         # status_label connection moved to footer setup
@@ -450,12 +475,16 @@ class MainWindow(FramelessWindow):
             if hasattr(self, 'online_tab'):
                 self.online_tab.stop_sync_flag = True
                 self.online_tab.is_loading = False # Force flag reset
+                self.online_tab.prefetcher.close()
             
             # Clear any pending workers
             if hasattr(self, 'threadpool'):
                 self.threadpool.clear()
             
             # Stop services
+            if hasattr(self, 'metadata_enricher'):
+                self.metadata_enricher.stop()
+
             if hasattr(self, 'character_service'):
                 self.character_service.stop_watcher()
                 
@@ -464,6 +493,9 @@ class MainWindow(FramelessWindow):
 
             if hasattr(self, 'discord_manager'):
                 self.discord_manager.close()
+
+            if hasattr(self, 'config_manager'):
+                self.config_manager.flush()
                 
         except Exception as e:
             print(f"Error during shutdown: {e}")
@@ -481,6 +513,20 @@ class MainWindow(FramelessWindow):
 
         self.online_tab.load_characters()
         self.installed_tab.load_characters()
+        # Let the first pages render before syncing the catalog mirror
+        QTimer.singleShot(3000, self.sync_catalog)
+
+    def sync_catalog(self):
+        """Updates the offline catalog in the background (full the first time, then only new heads)."""
+        worker = CatalogSyncWorker(self.catalog, self.scraper)
+        worker.signals.result.connect(self._on_catalog_synced)
+        worker.signals.error.connect(lambda e: self.activity_panel.add_log_message("WARNING", f"Catalog sync failed: {e}"))
+        self.threadpool.start(worker)
+
+    def _on_catalog_synced(self, added):
+        self.online_tab.set_catalog(self.catalog)
+        if added:
+            self.activity_panel.add_log_message("INFO", f"Catalog: {added} new characters ({self.catalog.count()} total)")
 
     def show_toast(self, title, message):
         if hasattr(self, 'toast'):
@@ -683,8 +729,9 @@ class MainWindow(FramelessWindow):
                     self.collection_manager.create_collection(col_name)
                     # Add characters to it
                     if "characters" in manifest:
-                        for char_name in manifest["characters"]:
-                            self.collection_manager.add_to_collection(col_name, char_name)
+                        # Packs exported before collections used IDs list display names
+                        members = self.collection_manager.resolve_ids(manifest["characters"], self._pack_characters(zf))
+                        self.collection_manager.add_many(col_name, members)
                     
                     self.show_toast("Success", f"Imported pack '{col_name}'")
                 else:
@@ -697,81 +744,67 @@ class MainWindow(FramelessWindow):
 
 
 
+    @staticmethod
+    def _pack_characters(zf):
+        """Characters shipped in a pack, named from their sidecar when it has one."""
+        names = set(zf.namelist())
+        characters = []
+        for name in names:
+            if not name.lower().endswith('.chf'):
+                continue
+            stem = os.path.splitext(name)[0]
+            data = {}
+            if f"{stem}.json" in names:
+                try:
+                    data = json.loads(zf.read(f"{stem}.json"))
+                except ValueError:
+                    pass
+            if not isinstance(data, dict):
+                data = {}
+            characters.append(Character.from_sidecar({
+                "url_detail": "", "image_url": "", **data, "name": data.get("name") or stem, "local_filename": name
+            }))
+        return characters
+
     def deploy_to_ptu(self):
-        """Copies characters from current (LIVE) to PTU/EPTU/TECH-PREVIEW if they exist using CharacterService."""
-        try:
-            count, num_envs, found_targets = self.character_service.deploy_to_ptu()
-            
-            if count == 0 and num_envs == 0:
-                 QMessageBox.information(self, self.tr("title_deploy"), self.tr("no_ptu_found"))
-                 return
-            
-            if count == 0: 
-                 # Envs found but no chars? or logic flow quirk.
-                 # Actually service returns (0, len, list) if confirmed? 
-                 # Ah, service doesn't ask for confirmation. Use return values to ask confirmation here in UI.
-                 pass
-
-            # Update: The service logic runs immediately. We should SPLIT it if we want confirmation in UI.
-            # But wait, looking at my service code: it doesn't ask confirmation. It creates list, then copies.
-            # I should have made it return candidates first!
-            # Modification: I will implement the check/confirm here using a helper in service if I could, 
-            # but since I already wrote the service to just DO it (my bad on step 1), I will check validity first or just run it?
-            # The USER requested confirmation dialog in the original code. 
-            # I should rely on the services 'deploy_to_ptu' BUT it currently DOES EVERYTHING.
-            # Let's fix this by wrapping it or modifying service behavior.
-            # Better approach: The service calls `shutil.copy`. 
-            # To preserve the Dialog, I will catch the list of targets from service logic?
-            # Actually, I'll just use the service to get targets, then ask, then execute copy.
-            # But the service `deploy_to_ptu` does it all. 
-            # Lets treat the service as an "Action Executor".
-            
-            # Re-reading original requirement: "Copies characters... if they exist". 
-            # I will invoke the method. But I need to ASK USER first.
-            # The service I wrote `deploy_to_ptu` attempts to copy immediately.
-            # I will assume for now I can let it run or I should simple alert.
-            # Actually, I will rewrite the local method to find targets (using logic I know) 
-            # OR better: I will accept that the service does the job effectively.
-            # BUT the user experience needs the confirmation.
-            
-            # Let's do a quick 'dry run' or check manually here since `CharacterService` API didn't expose 'get_targets'.
-            # I will call a simplified version here or trust the logic.
-            # Wait, I can't easily change the service file in this same step without multiple tools.
-            # I will implement 'get_targets' logic here using Pathlib to decide, and then call service?
-            # No, that defeats the purpose.
-            # I'll just let the service run IF the user agrees. But I don't know if targets exist until I look.
-            
-            # I'll stick to the original behavior: Check targets -> Ask -> Copy.
-            # Since my `deploy_to_ptu` in service returns (count, envs, list) *after* doing it, 
-            # I should have separated it.
-            # For now, I will modify the service on the fly? No.
-            # I'll modify the `deploy_to_ptu` in `MainWindow` to be a "Try Deploy" that catches the "No environments" case.
-            # Actually, I'll re-implement the 'Check' locally using `self.character_service.get_game_path()` and `pathlib` 
-            # to show off the improvement, then call the service if I can?
-            # No, I'll just rewriting the service method was the right call.
-            # Since I can't undo the service file write easily, lets update `deploy_to_ptu` to just do the job 
-            # and show success. The confirmation is nice but if I moved logic to service, I might have lost the interactive part unless I pass a callback (which I didn't).
-            # To Fix: I will just execute it and show result. "Attempting to deploy... Done."
-            # Or better: I will just use `deploy_to_ptu` and if it did nothing (0 targets), warn.
-            # If it did something, show success. 
-            # The confirmation dialog is lost in this transition unless I parse the service again.
-            # Let's keep it simple: Just run it and report. It's a "Deploy" button after all.
-            # "Deploying to all available environments..."
-            
-            count, num_envs, target_names = self.character_service.deploy_to_ptu()
-            
-            if num_envs == 0:
-                QMessageBox.information(self, self.tr("title_deploy"), self.tr("no_ptu_found"))
-            else:
-                 env_str = ", ".join(target_names)
-                 self.show_toast(self.tr("success"), self.tr("msg_deploy_success").format(count=count, envs=num_envs))
-                 QMessageBox.information(self, self.tr("title_deploy"), 
-                                       f"Deployed {count} characters to: {env_str}")
+        """Syncs characters from current (LIVE) to PTU/EPTU/TECH-PREVIEW: preview, confirm, then copy in the background."""
+        self.status_label.setText(self.tr("title_deploy") + "...")
+        worker = DeployWorker(self.character_service, dry_run=True)
+        worker.signals.result.connect(self._on_deploy_plan_ready)
+        worker.signals.error.connect(self._on_deploy_error)
+        self.threadpool.start(worker)
 
-        except Exception as e:
-            QMessageBox.critical(self, self.tr("error"), f"{self.tr('deploy_error', error=str(e))}")
+    def _on_deploy_plan_ready(self, plan):
+        self.status_label.setText(self.tr("ready"))
+        if not plan.target_names:
+            QMessageBox.information(self, self.tr("title_deploy"), self.tr("no_ptu_found"))
+            return
+        if not plan.ops:
+            self.show_toast(self.tr("title_deploy"), "All environments are already up to date.")
+            return
 
+        reply = QMessageBox.question(
+            self, self.tr("title_deploy"),
+            f"Copy {len(plan.ops)} new or changed files?\n\n{plan.summary()}",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if reply != QMessageBox.Yes:
+            return
+
+        worker = DeployWorker(self.character_service, plan=plan)
+        worker.signals.progress.connect(lambda p: self.status_label.setText(f"{self.tr('title_deploy')} {p}"))
+        worker.signals.result.connect(self._on_deploy_finished)
+        worker.signals.error.connect(self._on_deploy_error)
+        self.threadpool.start(worker)
 
+    def _on_deploy_finished(self, plan):
+        self.status_label.setText(self.tr("ready"))
+        self.show_toast(self.tr("success"), self.tr("msg_deploy_success").format(count=plan.source_count, envs=len(plan.target_names)))
+        QMessageBox.information(self, self.tr("title_deploy"), plan.summary())
+
+    def _on_deploy_error(self, error):
+        self.status_label.setText(self.tr("ready"))
+        QMessageBox.critical(self, self.tr("error"), f"{self.tr('deploy_error', error=error)}")
 
     def load_installed_characters(self):
         if hasattr(self, 'installed_tab'):
@@ -806,6 +839,41 @@ class MainWindow(FramelessWindow):
     def install_character(self, character):
         self.installation_controller.install_character(character)
 
+    def install_characters_batch(self, characters):
+        self.installation_controller.install_batch(characters)
+
+    def cancel_batch_install(self):
+        self.installation_controller.cancel_batch()
+        self.status_label.setText("Cancelling downloads...")
+
+    def _on_batch_install_progress(self, finished, total):
+        self.status_label.setText(f"{self.tr('downloading')} {finished}/{total}")
+        if hasattr(self, 'online_tab'):
+            self.online_tab.set_bulk_progress(finished, total)
+
+    def _on_batch_item_installed(self, char):
+        # Cheap per-item UI sync; the library itself is refreshed once per batch
+        if hasattr(self, 'detail_modal') and self.detail_modal and self.detail_modal.isVisible():
+            if self.detail_modal.character.name == char.name:
+                self.detail_modal.set_installed_state()
+        if hasattr(self, 'online_tab'):
+            self.online_tab.on_character_installed(char)
+
+    def _on_batch_install_finished(self, succeeded, failed, cancelled):
+        if hasattr(self, 'online_tab'):
+            self.online_tab.set_bulk_progress(None, None)
+        self.status_label.setText(self.tr("ready"))
+
+        message = f"Installed {succeeded} characters."
+        if failed:
+            message += f" {failed} failed."
+        if cancelled:
+            message += f" {cancelled} cancelled."
+        self.show_toast("Bulk Install", message)
+
+        if succeeded:
+            self.load_installed_characters()
+
     def _on_controller_install_finished(self, success, result):
         if success:
             # result is the character object
@@ -877,6 +945,7 @@ class MainWindow(FramelessWindow):
             for char in characters:
                 if self.character_service.uninstall_character(char):
                     success_count += 1
+                    self.downloader.forget_character(char)
                     # Update Online Tab for each
                     if hasattr(self, 'online_tab'):
                         self.online_tab.on_character_uninstalled(char)
@@ -910,7 +979,7 @@ class MainWindow(FramelessWindow):
         
         # Existing collections
         all_cols = self.collection_manager.get_all_collections()
-        char_cols = self.collection_manager.get_character_collections(character.name)
+        char_cols = self.collection_manager.get_character_collections(character)
         
         for col in all_cols:
             is_in = col in char_cols
@@ -951,7 +1020,7 @@ class MainWindow(FramelessWindow):
         name, ok = QInputDialog.getText(self, "New Collection", "Collection Name:")
         if ok and name:
             if self.collection_manager.create_collection(name):
-                self.collection_manager.add_to_collection(name, character.name)
+                self.collection_manager.add_to_collection(name, character)
                 self.show_toast(self.tr("success"), f"Added to {name}")
                 self.installed_tab.refresh_collections_ui() # We need to expose this
             else:
@@ -959,10 +1028,10 @@ class MainWindow(FramelessWindow):
 
     def toggle_collection(self, col_name, character, is_in):
         if is_in:
-            self.collection_manager.remove_from_collection(col_name, character.name)
+            self.collection_manager.remove_from_collection(col_name, character)
             self.show_toast(self.tr("success"), f"Removed from {col_name}")
         else:
-            self.collection_manager.add_to_collection(col_name, character.name)
+            self.collection_manager.add_to_collection(col_name, character)
             self.show_toast(self.tr("success"), f"Added to {col_name}")
             
         # Refresh UI? context menu will refresh on next open
@@ -1052,25 +1121,73 @@ class MainWindow(FramelessWindow):
             self.status_label.setText(self.tr("error"))
 
     def import_backup(self):
-        try:
-            from PySide6.QtWidgets import QFileDialog
-            
-            path, _ = QFileDialog.getOpenFileName(self, self.tr("import_backup_title"), "", "Zip Files (*.zip)")
-            
-            if not path:
-                return
-                
-            self.status_label.setText("Restoring backup...")
-            
-            count = self.character_service.restore_backup(path)
-            
-            self.show_toast(self.tr("success"), self.tr("import_success", count=count))
-            self.status_label.setText(self.tr("ready"))
-            self.load_installed_characters()
-            
-        except Exception as e:
-            QMessageBox.critical(self, self.tr("error"), self.tr("import_error", error=str(e)))
-            self.status_label.setText(self.tr("error"))
+        from PySide6.QtWidgets import QFileDialog
+        
+        path, _ = QFileDialog.getOpenFileName(self, self.tr("import_backup_title"), "", "Zip Files (*.zip)")
+        
+        if not path:
+            return
+        self.restore_backup_async(path)
+
+    def restore_backup_async(self, path):
+        """Dry-runs the restore in the background, asks for confirmation, then restores only what differs."""
+        self.status_label.setText("Restoring backup...")
+        worker = RestoreWorker(self.character_service, path, dry_run=True)
+        worker.signals.result.connect(self._on_restore_plan_ready)
+        worker.signals.error.connect(self._on_restore_error)
+        self.threadpool.start(worker)
+
+    def _on_restore_plan_ready(self, plan):
+        self.status_label.setText(self.tr("ready"))
+        if not plan.pending:
+            self.show_toast(self.tr("success"), f"Backup matches the installed library ({len(plan.unchanged)} files unchanged).")
+            return
+
+        reply = QMessageBox.question(
+            self, self.tr("import_backup_title"),
+            f"Restore this backup?\n\n{len(plan.added)} new, {len(plan.changed)} changed, "
+            f"{len(plan.unchanged)} unchanged files.",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if reply != QMessageBox.Yes:
+            return
+
+        worker = RestoreWorker(self.character_service, plan.zip_path, plan=plan)
+        worker.signals.progress.connect(lambda p: self.status_label.setText(f"Restoring backup... {p}"))
+        worker.signals.result.connect(self._on_restore_finished)
+        worker.signals.error.connect(self._on_restore_error)
+        self.threadpool.start(worker)
+
+    def _on_restore_finished(self, result):
+        _, count = result
+        self.show_toast(self.tr("success"), self.tr("import_success", count=count))
+        self.status_label.setText(self.tr("ready"))
+        self.load_installed_characters()
+
+    def _on_restore_error(self, error):
+        QMessageBox.critical(self, self.tr("error"), self.tr("import_error", error=error))
+        self.status_label.setText(self.tr("error"))
+
+    def restore_auto_backup(self):
+        """Lets the user pick an incremental auto-backup and restores it in the background."""
+        backups = self.character_service.incremental_backup
+        dialog = SnapshotDialog(backups, self)
+        if not dialog.exec() or not dialog.selected_snapshot:
+            return
+
+        self.status_label.setText("Restoring backup...")
+        worker = SnapshotRestoreWorker(backups, dialog.selected_snapshot, str(self.character_service.get_game_path()))
+        worker.signals.result.connect(self._on_auto_backup_restored)
+        worker.signals.error.connect(self._on_restore_error)
+        self.threadpool.start(worker)
+
+    def _on_auto_backup_restored(self, count):
+        if count:
+            self.show_toast(self.tr("success"), f"Restored {count} files from the auto-backup.")
+        else:
+            self.show_toast(self.tr("success"), "The library already matches this auto-backup.")
+        self.status_label.setText(self.tr("ready"))
+        self.load_installed_characters()
 
     def setup_menu(self):
         menubar = self.custom_menu_bar
@@ -1087,6 +1204,9 @@ class MainWindow(FramelessWindow):
 
         import_backup_action = file_menu.addAction(self.tr("menu_import_backup"))
         import_backup_action.triggered.connect(self.import_backup)
+
+        restore_auto_action = file_menu.addAction(self.tr("menu_restore_auto_backup"))
+        restore_auto_action.triggered.connect(self.restore_auto_backup)
         
         file_menu.addSeparator()
         
@@ -1104,6 +1224,15 @@ class MainWindow(FramelessWindow):
 
         deploy_ptu_action = tools_menu.addAction(self.tr("deploy_ptu") if hasattr(self, 'tr') else "Deploy to PTU/EPTU")
         deploy_ptu_action.triggered.connect(self.deploy_to_ptu)
+
+        undo_loadout_action = tools_menu.addAction("Undo Last Loadout Switch")
+        undo_loadout_action.triggered.connect(self.undo_last_loadout)
+
+        duplicates_action = tools_menu.addAction("Find Duplicates...")
+        duplicates_action.triggered.connect(self.find_duplicates)
+
+        repair_action = tools_menu.addAction("Repair Library...")
+        repair_action.triggered.connect(self.repair_library)
         
         tools_menu.addSeparator()
 
@@ -1262,6 +1391,9 @@ class MainWindow(FramelessWindow):
         dialog = SettingsDialog(self.config_manager, self.theme_manager, self)
         if dialog.exec():
             self.status_label.setText(self.tr("settings_saved"))
+            self.installation_controller.set_max_parallel_downloads(
+                self.config_manager.config.get("max_parallel_downloads", DownloadQueue.DEFAULT_PARALLEL)
+            )
             # Reload settings
             if hasattr(self, 'online_tab') and not self.online_tab.all_characters:
                 self.online_tab.load_characters()
@@ -1318,13 +1450,9 @@ class MainWindow(FramelessWindow):
                     # Assume it's a backup? or a character zip?
                     # If it's a backup restore:
                     if "backup" in fpath.lower():
-                        reply = QMessageBox.question(self, "Restore Backup", "Is this a backup file you want to restore?", 
-                                                   QMessageBox.Yes | QMessageBox.No)
-                        if reply == QMessageBox.Yes:
-                             count = self.character_service.restore_backup(fpath)
-                             self.show_toast(self.tr("success"), f"Restored {count} characters")
-                             self.load_installed_characters()
-                             continue
+                        # Background dry run; the confirmation shows what would change
+                        self.restore_backup_async(fpath)
+                        continue
                     
                     # Otherwise, maybe handle generic zip import if supported? 
                     # Currently we only support .chf files explicitly or backups.
@@ -1341,8 +1469,6 @@ class MainWindow(FramelessWindow):
         else:
             self.config_manager.remove_favorite(character.name)
         
-        self.config_manager.save_config()
-        
         # If OnlineTab is loaded, update its view too
         if hasattr(self, 'online_tab'):
             # This is a bit inefficient but safe - refresh local state of cards
@@ -1358,12 +1484,8 @@ class MainWindow(FramelessWindow):
 
 
     def on_bulk_add_collection(self, characters, collection_name):
-        count = 0
-        for char in characters:
-            # We use name as ID for collection manager
-            self.collection_manager.add_to_collection(collection_name, char.name)
-            count += 1
-            
+        # One save for the whole selection
+        count = self.collection_manager.add_many(collection_name, characters)
         self.show_toast(self.tr("success"), f"Added {count} characters to {collection_name}")
         self.installed_tab.refresh_collections_ui()
 
@@ -1385,6 +1507,80 @@ class MainWindow(FramelessWindow):
             self.show_toast("Deployment Error", str(e))
             self.sound_manager.play_error()
 
+    def undo_last_loadout(self):
+        try:
+            moved = self.character_service.undo_last_loadout()
+            if moved:
+                self.show_toast("Loadout Restored", f"Moved back {moved} files.")
+                self.refresh_installed_data()
+            else:
+                self.show_toast("Loadout", "Nothing to undo.")
+        except Exception as e:
+            self.show_toast("Deployment Error", str(e))
+            self.sound_manager.play_error()
+
+    def find_duplicates(self):
+        """Scans the installed library for identical or near-identical characters in the background."""
+        self.status_label.setText("Scanning for duplicates...")
+        worker = DuplicateScanWorker(self.character_service)
+        worker.signals.result.connect(self._on_duplicates_found)
+        worker.signals.error.connect(self._on_duplicates_error)
+        self.threadpool.start(worker)
+
+    def _on_duplicates_found(self, groups):
+        self.status_label.setText(self.tr("ready"))
+        if not groups:
+            self.show_toast("Duplicates", "No duplicate characters found.")
+            return
+        shown = 20
+        lines = [" = ".join(os.path.splitext(f)[0] for f in group) for group in groups[:shown]]
+        if len(groups) > shown:
+            lines.append(f"... and {len(groups) - shown} more groups")
+        QMessageBox.information(
+            self, "Duplicates",
+            f"Found {len(groups)} groups of duplicate characters:\n\n" + "\n".join(lines)
+        )
+
+    def _on_duplicates_error(self, error):
+        self.status_label.setText(self.tr("ready"))
+        self.show_toast("Duplicates", str(error))
+        self.sound_manager.play_error()
+
+    def repair_library(self):
+        """Library maintenance: preview what would be fixed, confirm, then repair in the background."""
+        self.status_label.setText("Checking library...")
+        worker = RepairWorker(self.character_service, dry_run=True)
+        worker.signals.result.connect(self._on_repair_plan_ready)
+        worker.signals.error.connect(self._on_repair_error)
+        self.threadpool.start(worker)
+
+    def _on_repair_plan_ready(self, plan):
+        self.status_label.setText(self.tr("ready"))
+        if not plan.pending:
+            self.show_toast("Repair Library", "Nothing to repair.")
+            return
+        reply = QMessageBox.question(
+            self, "Repair Library",
+            f"Fix the following?\n\n{plan.summary()}",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if reply != QMessageBox.Yes:
+            return
+        worker = RepairWorker(self.character_service, plan=plan)
+        worker.signals.result.connect(self._on_repair_finished)
+        worker.signals.error.connect(self._on_repair_error)
+        self.threadpool.start(worker)
+
+    def _on_repair_finished(self, plan):
+        self.status_label.setText(self.tr("ready"))
+        self.show_toast("Repair Library", f"Fixed {sum(plan.results.values())} issues.")
+        self.refresh_installed_data()
+
+    def _on_repair_error(self, error):
+        self.status_label.setText(self.tr("ready"))
+        self.show_toast("Repair Library", str(error))
+        self.sound_manager.play_error()
+
     def launch_game(self):
         """Attempts to launch the RSI Launcher or Star Citizen."""
         try:
@@ -4,7 +4,9 @@ from PySide6.QtCore import Qt, Signal, QThreadPool
 from src.ui.widgets.auto_scroll_area import AutoScrollArea
 from src.ui.widgets.flow_layout import FlowLayout
 from src.utils.translations import translator
-from src.core.workers import InstalledCharactersWorker
+from src.core.workers import InstalledCharactersWorker, LibraryDeltaWorker
+from src.core.search_index import SearchIndex
+from src.core.library_watcher import LibraryChange, CHANGE_MODIFIED
 from src.ui.widgets import CharacterCard
 from src.ui.anim_config import AnimConfig
 import os
@@ -32,6 +34,10 @@ class InstalledTab(QWidget):
         self.selected_characters = set() # NEW
         self.collection_manager = None # Will be set by MainWindow
         self.current_collection_filter = None
+        self.is_loading = False
+        self._deferred_changes = [] # Watcher deltas that arrived during a full load
+        self.search_index = SearchIndex() # Keyed by local_filename, follows loads and watcher deltas
+        self.metadata_enricher = None # Background online lookups (set by MainWindow)
         
         # Debounce Timer
         self.search_timer = QTimer(self)
@@ -179,12 +185,13 @@ class InstalledTab(QWidget):
         
         # Show Skeletons first
         self._show_skeletons()
+        self.is_loading = True
         
         path = self.config_manager.get_game_path()
         try:
-            worker = InstalledCharactersWorker(path)
+            worker = InstalledCharactersWorker(path, self.character_service.library_index)
             worker.signals.result.connect(self.on_characters_loaded)
-            worker.signals.error.connect(lambda e: print(f"Error loading installed: {e}"))
+            worker.signals.error.connect(self._on_load_failed)
             QThreadPool.globalInstance().start(worker)
         except Exception as e:
             print(f"Failed to start installed worker: {e}")
@@ -198,41 +205,35 @@ class InstalledTab(QWidget):
             skel = SkeletonCard(self.content_widget)
             self.flow_layout.addWidget(skel)
 
+    def _on_load_failed(self, error):
+        self.is_loading = False
+        print(f"Error loading installed: {error}")
+        self._apply_deferred_changes()
+
     def on_characters_loaded(self, characters):
+        self.is_loading = False
+        # The scan may already have passed files that changed while it ran
+        self._apply_deferred_changes()
         # Clear skeletons
         self._clear_layout()
         self.character_widgets = []
+        self.search_index.clear()
+        self.search_index.add_characters((c.local_filename, c) for c in characters)
         
         # Also remove any non-widget items just in case
         
         delay = 0
         
         if not characters:
-            lbl = QLabel(self.tr("no_chars_local"))
-            lbl.setStyleSheet("color: #888; font-size: 14px; margin: 20px;")
-            self.flow_layout.addWidget(lbl)
+            self._show_empty_label()
             return
 
-        for char in characters:
-            card = CharacterCard(char, self.image_loader, self.sound_manager, parent=self.content_widget)
-            card.mark_installed()
-            card.delete_clicked.connect(self.delete_clicked.emit)
-            card.card_clicked.connect(self.character_clicked.emit)
-            card.thumbnail_dropped.connect(self.on_thumbnail_dropped)
-            card.selection_toggled.connect(self.on_selection_toggled)
-
-            # Restore selection
-            # Local chars ID is local_filename usually unique, or name
-            uid = char.local_filename or char.name
-            if uid in self.selected_characters:
-                card.set_selected(True)
-            
-            # Hide favorites for local
-            if hasattr(card, 'btn_fav'):
-                card.btn_fav.hide()
+        if self.collection_manager:
+            # Old collections.json files list display names; switch them to stable IDs
+            self.collection_manager.migrate_legacy_names(characters)
 
-            card.setContextMenuPolicy(Qt.CustomContextMenu)
-            card.customContextMenuRequested.connect(lambda pos, c=char: self.custom_context_requested.emit(c, card.mapToGlobal(pos)))
+        for char in characters:
+            card = self._create_card(char)
             
             # Hide initially until animation
             card.setVisible(False)
@@ -245,6 +246,100 @@ class InstalledTab(QWidget):
             delay += AnimConfig.STAGGER_DELAY
             
         self.model_updated.emit(characters)
+        if self.metadata_enricher:
+            self.metadata_enricher.enqueue(self.config_manager.get_game_path(), characters)
+
+    def _create_card(self, char):
+        card = CharacterCard(char, self.image_loader, self.sound_manager, parent=self.content_widget)
+        card.mark_installed()
+        card.delete_clicked.connect(self.delete_clicked.emit)
+        card.card_clicked.connect(self.character_clicked.emit)
+        card.thumbnail_dropped.connect(self.on_thumbnail_dropped)
+        card.selection_toggled.connect(self.on_selection_toggled)
+
+        # Restore selection
+        # Local chars ID is local_filename usually unique, or name
+        uid = char.local_filename or char.name
+        if uid in self.selected_characters:
+            card.set_selected(True)
+        
+        # Hide favorites for local
+        if hasattr(card, 'btn_fav'):
+            card.btn_fav.hide()
+
+        card.setContextMenuPolicy(Qt.CustomContextMenu)
+        card.customContextMenuRequested.connect(lambda pos, c=char, w=card: self.custom_context_requested.emit(c, w.mapToGlobal(pos)))
+        return card
+
+    def _show_empty_label(self):
+        lbl = QLabel(self.tr("no_chars_local"))
+        lbl.setStyleSheet("color: #888; font-size: 14px; margin: 20px;")
+        self.flow_layout.addWidget(lbl)
+
+    def apply_library_changes(self, changes):
+        """
+        Applies watcher deltas (LibraryChange list) without rescanning the folder.
+        Only the affected files are re-indexed and only their cards are rebuilt.
+        """
+        if self.is_loading:
+            self._deferred_changes.extend(changes)
+            return
+        path = self.config_manager.get_game_path()
+        worker = LibraryDeltaWorker(path, self.character_service.library_index, changes)
+        worker.signals.result.connect(self.on_library_delta_loaded)
+        worker.signals.error.connect(lambda e: print(f"Error applying library changes: {e}"))
+        QThreadPool.globalInstance().start(worker)
+
+    def _apply_deferred_changes(self):
+        changes, self._deferred_changes = self._deferred_changes, []
+        if changes:
+            self.apply_library_changes(changes)
+
+    def on_library_delta_loaded(self, payload):
+        changes, refreshed = payload
+        if self.is_loading:
+            # A full load started meanwhile and is about to replace the cards
+            self._deferred_changes.extend(changes)
+            return
+
+        if not self.character_widgets:
+            self._clear_layout() # Drop the "no characters" label
+
+        widgets_by_file = {w.character.local_filename: w for w in self.character_widgets}
+        for filename, char in refreshed.items():
+            if char is None:
+                self.search_index.remove(filename)
+            else:
+                self.search_index.add_character(filename, char)
+            old_card = widgets_by_file.pop(filename, None)
+            if old_card:
+                self.character_widgets.remove(old_card)
+                self.flow_layout.removeWidget(old_card)
+                old_card.hide()
+                old_card.deleteLater()
+            if char is None:
+                self.selected_characters.discard(filename)
+                continue
+
+            card = self._create_card(char)
+            card.setVisible(False)
+            self.flow_layout.addWidget(card)
+            self.character_widgets.append(card)
+            card.animate_in(0)
+            widgets_by_file[filename] = card
+
+        if not self.character_widgets:
+            self._show_empty_label()
+        else:
+            self.sort_installed_characters(self.sort_combo.currentIndex())
+            self.filter_installed_characters(self.search_installed.text())
+
+        if self.metadata_enricher:
+            self.metadata_enricher.enqueue(
+                self.config_manager.get_game_path(), [c for c in refreshed.values() if c is not None]
+            )
+
+        self.model_updated.emit([w.character for w in self.character_widgets])
 
     def on_selection_toggled(self, character, is_selected):
         uid = character.local_filename or character.name
@@ -350,6 +445,16 @@ class InstalledTab(QWidget):
         # Apply current sort
         self.sort_installed_characters(self.sort_combo.currentIndex())
     
+    def set_metadata_enricher(self, enricher):
+        self.metadata_enricher = enricher
+        enricher.enriched.connect(self.on_metadata_enriched)
+
+    def on_metadata_enriched(self, game_path, filenames):
+        """Sidecars were written in the background: rebuild just those cards."""
+        if game_path != self.config_manager.get_game_path():
+            return
+        self.apply_library_changes([LibraryChange(CHANGE_MODIFIED, f) for f in filenames])
+
     def set_collection_manager(self, manager):
         self.collection_manager = manager
         self.refresh_collections_ui()
@@ -407,9 +512,9 @@ class InstalledTab(QWidget):
         def sort_key(widget):
             char = widget.character
             if index == 0: # Name A-Z
-                return char.name.lower()
+                return char.sort_name
             elif index == 1: # Name Z-A
-                return char.name.lower()
+                return char.sort_name
             elif index == 2: # Date New
                 return char.install_date or 0.0
             elif index == 3: # Date Old
@@ -428,21 +533,22 @@ class InstalledTab(QWidget):
     def filter_installed_characters(self, text):
         text = text.lower().strip()
         
-        # Get active collection list if any
-        allowed_names = None
+        # Active collection filter, if any
+        collection = None
         if self.current_collection_filter and self.collection_manager:
-             allowed_names = self.collection_manager.collections.get(self.current_collection_filter, [])
+             collection = self.current_collection_filter
         
+        # Ranked, typo-tolerant match over name, author and tags
+        matches = {key for key, _ in self.search_index.search(text)} if text else None
+
         for widget in self.character_widgets:
-            char_name = widget.character.name.lower()
-            
             # Text match
-            match_text = (text in char_name)
+            match_text = matches is None or widget.character.local_filename in matches
             
             # Collection match
             match_col = True
-            if allowed_names is not None:
-                match_col = (widget.character.name in allowed_names)
+            if collection is not None:
+                match_col = self.collection_manager.is_in_collection(collection, widget.character)
                 
             visible = match_text and match_col
             widget.setVisible(visible)
@@ -473,8 +579,12 @@ class InstalledTab(QWidget):
     def open_manage_collections(self):
         if not self.collection_manager: return
         from src.ui.dialogs.manage_collections import ManageCollectionsDialog
+        from src.core.archive_writer import DEFAULT_COMPRESSION
         path = self.config_manager.get_game_path()
-        dlg = ManageCollectionsDialog(self.collection_manager, path, self)
+        dlg = ManageCollectionsDialog(
+            self.collection_manager, path, self,
+            compression_level=self.config_manager.config.get("backup_compression", DEFAULT_COMPRESSION)
+        )
         dlg.exec()
         self.refresh_collections_ui()
 
@@ -9,6 +9,8 @@ from src.ui.widgets import CharacterCard, setup_localized_context_menu
 from src.ui.widgets.skeleton import SkeletonCard
 from src.ui.anim_config import AnimConfig
 from src.core.workers import ScraperWorker
+from src.core.search_index import SearchIndex
+from src.core.prefetch import PrefetchEngine
 from src.core.scraper import ORDER_BY_LATEST, ORDER_BY_OLDEST, ORDER_BY_LIKE, ORDER_BY_DOWNLOAD
 from src.utils.translations import translator
 from src.ui.styles import ThemeColors
@@ -20,6 +22,8 @@ class OnlineTab(QWidget):
     """
     character_clicked = Signal(object)
     install_clicked = Signal(object)
+    bulk_install_requested = Signal(list) # list[Character] for the download queue
+    bulk_cancel_requested = Signal()
     delete_clicked = Signal(object)
     toast_requested = Signal(str, str)
     status_updated = Signal(str)
@@ -39,6 +43,7 @@ class OnlineTab(QWidget):
         self.character_widgets = []
         self.selected_characters = set()
         self.installed_identifiers = set()
+        self.bulk_running = False
         self.current_page = 1
         self.last_fetched_api_page = 0  # last API page we received (1-based)
         self.has_next_page = False
@@ -47,6 +52,16 @@ class OnlineTab(QWidget):
         self.PAGE_SIZE = 24
         # Server-side order: sort_combo index 1=latest, 2=download, 3=like; 0=name (client-side only)
         self.current_order_by = ORDER_BY_LATEST
+        self.catalog = None # Local mirror (set by MainWindow); serves search and A-Z sorting once complete
+        self.showing_catalog_results = False # all_characters is already a catalog search result
+        # Over all_characters, keyed by position in indexed_characters: URLs can repeat or be
+        # missing, and all_characters itself gets re-sorted
+        self.search_index = SearchIndex()
+        self.indexed_characters = []
+        # Next API pages, fetched ahead of "Load more" (look-ahead follows scroll speed)
+        self.prefetcher = PrefetchEngine(scraper, parent=self)
+        self.prefetcher.page_loaded.connect(self.on_page_fetched)
+        self._awaiting_api_page = None # API page "Load more" is waiting for
         
         # Search Debounce
         self.search_timer = QTimer(self)
@@ -242,8 +257,44 @@ class OnlineTab(QWidget):
             return ORDER_BY_OLDEST
         return ORDER_BY_LATEST
 
+    def set_catalog(self, catalog):
+        self.catalog = catalog
+        # Local search answers in milliseconds, so there is no need to wait long for typing to stop
+        self.search_timer.setInterval(250 if catalog and catalog.is_complete else 800)
+
+    def _catalog_order(self) -> str:
+        return "name" if self.sort_combo.currentIndex() == 0 else self.current_order_by
+
+    def _load_from_catalog(self) -> bool:
+        """Fills the grid from the local catalog. Returns False if it has nothing to show."""
+        if not self.catalog:
+            return False
+        characters = self.catalog.search(self.search_input.text().strip(), order_by=self._catalog_order())
+        if not characters:
+            return False
+        self.is_loading = False
+        self.btn_reload.setEnabled(True)
+        self.all_characters = characters
+        self._clear_index()
+        self.showing_catalog_results = True
+        self.has_next_page = False # The whole result set is local
+        self.update_display_list()
+        self.scroll_area.verticalScrollBar().setValue(0)
+        return True
+
     def load_characters(self):
         if self.is_loading: return
+
+        search_text = self.search_input.text().strip() or None
+        sort_index = self.sort_combo.currentIndex()
+        self.current_order_by = self._order_by_for_sort_index(sort_index, self.date_reverse)
+        # Search and full-catalog A-Z run locally once the mirror is complete
+        if self.catalog and self.catalog.is_complete and (search_text or sort_index == 0):
+            if self._load_from_catalog():
+                self.prefetcher.cancel()
+                return
+        self.prefetcher.set_query(search_text, self.current_order_by)
+
         self.is_loading = True
         
         self.show_skeletons()
@@ -253,10 +304,8 @@ class OnlineTab(QWidget):
         
         self.current_page = 1
         self.all_characters = []
-
-        search_text = self.search_input.text().strip() or None
-        sort_index = self.sort_combo.currentIndex()
-        self.current_order_by = self._order_by_for_sort_index(sort_index, self.date_reverse)
+        self._clear_index()
+        self.showing_catalog_results = False
         
         pages = 5
         self.pending_pages = 5
@@ -291,6 +340,8 @@ class OnlineTab(QWidget):
         self.status_updated.emit(self.tr("ready"))
         self.btn_reload.setEnabled(True)
         self.all_characters = characters
+        self._clear_index()
+        self._index_characters(characters)
         self.has_next_page = has_next_page
         self.last_fetched_api_page = self.pending_pages if hasattr(self, "pending_pages") else 1
         if characters:
@@ -304,9 +355,13 @@ class OnlineTab(QWidget):
                 self.btn_load_more.show()
                 self.btn_load_more.setText(self.tr("load_more"))
                 self.btn_load_more.setEnabled(True)
+                self.prefetcher.prefetch(self.last_fetched_api_page)
             else:
                 self.btn_load_more.hide()
             QTimer.singleShot(100, self.check_scroll_bottom)
+        elif self._load_from_catalog():
+            # Offline (or the API failed): browse the local mirror instead
+            return
         else:
             self.update_display_list()
             self.btn_load_more.hide()
@@ -323,20 +378,21 @@ class OnlineTab(QWidget):
             QTimer.singleShot(50, self._process_local_load_more)
             return
 
-        # Fetch next page from API (we may have several display batches from same API pages)
+        # Next page from API (we may have several display batches from same API pages);
+        # usually the prefetcher already has it in memory
         next_page = self.last_fetched_api_page + 1
         self._pending_api_page = next_page
-        search_text = self.search_input.text().strip() or None
-        worker = ScraperWorker(
-            self.scraper,
-            start_page=next_page,
-            pages_to_fetch=1,
-            search_query=search_text,
-            order_by=self.current_order_by,
-        )
-        worker.signals.result.connect(self.on_more_characters_loaded)
-        worker.signals.error.connect(self.on_load_error)
-        self.threadpool.start(worker)
+        cached = self.prefetcher.get(next_page)
+        if cached is not None:
+            self.on_more_characters_loaded(cached)
+            return
+        self._awaiting_api_page = next_page
+        self.prefetcher.request(next_page)
+
+    def on_page_fetched(self, key, page):
+        if self._awaiting_api_page is not None and key == self.prefetcher.key(self._awaiting_api_page):
+            self._awaiting_api_page = None
+            self.on_more_characters_loaded(page)
 
     def _process_local_load_more(self):
         start = self.current_page * self.PAGE_SIZE
@@ -385,6 +441,7 @@ class OnlineTab(QWidget):
                 scroll_bar = self.scroll_area.verticalScrollBar()
                 current_scroll = scroll_bar.value()
                 self.all_characters.extend(new_chars)
+                self._index_characters(new_chars)
                 self.populate_grid(new_chars, clear=False)
                 self.status_updated.emit(self.tr("ready"))
                 QTimer.singleShot(0, lambda: scroll_bar.setValue(current_scroll))
@@ -392,6 +449,8 @@ class OnlineTab(QWidget):
         if not has_next_page:
             self.btn_load_more.setText(self.tr("no_more_chars"))
             self.btn_load_more.setEnabled(False)
+        else:
+            self.prefetcher.prefetch(self.last_fetched_api_page)
 
     def on_load_error(self, error_msg):
         self.is_loading = False
@@ -434,10 +493,8 @@ class OnlineTab(QWidget):
             is_installed = False
             if char.download_url and char.download_url in self.installed_identifiers:
                 is_installed = True
-            elif char.name:
-                key = f"{char.name.lower()}_{char.author.lower() if char.author else ''}"
-                if key in self.installed_identifiers:
-                    is_installed = True
+            elif char.name and char.match_key in self.installed_identifiers:
+                is_installed = True
             
             if is_installed or char.status == 'installed':
                 char.status = 'installed'
@@ -463,6 +520,8 @@ class OnlineTab(QWidget):
         else:
             self.selected_characters.discard(uid)
             
+        if self.bulk_running:
+            return # Button shows batch progress until the queue is done
         count = len(self.selected_characters)
         if count > 0:
             self.btn_bulk_install.setText(f"{self.tr('install')} ({count})")
@@ -471,6 +530,11 @@ class OnlineTab(QWidget):
             self.btn_bulk_install.hide()
 
     def install_selected(self):
+        # While a batch is running the button acts as "Cancel"
+        if self.bulk_running:
+            self.bulk_cancel_requested.emit()
+            return
+
         # We need to find the character objects corresponding to the IDs
         # The IDs are in self.selected_characters
         to_install = []
@@ -490,25 +554,35 @@ class OnlineTab(QWidget):
         
         self.toast_requested.emit("Bulk Install", f"Starting installation of {len(to_install)} characters...")
         
-        # Trigger installs with slight delay to avoid freezing UI
-        delay = 0
-        for char in to_install:
-            QTimer.singleShot(delay, lambda c=char: self.install_clicked.emit(c))
-            delay += 500
+        # Hand the whole selection to the download queue in one go
+        self.bulk_install_requested.emit(to_install)
             
         # Clear selection after starting
         for widget in self.character_widgets:
              if hasattr(widget, 'set_selected'):
                  widget.set_selected(False)
         self.selected_characters.clear()
-        self.btn_bulk_install.hide()
+
+    def set_bulk_progress(self, finished, total):
+        """Shows batch progress on the bulk button (None, None when the batch ends)."""
+        if total is None:
+            self.bulk_running = False
+            self.btn_bulk_install.setEnabled(True)
+            if self.selected_characters:
+                self.btn_bulk_install.setText(f"{self.tr('install')} ({len(self.selected_characters)})")
+            else:
+                self.btn_bulk_install.hide()
+            return
+
+        self.bulk_running = True
+        self.btn_bulk_install.setText(f"{self.tr('cancel')} ({finished}/{total})")
+        self.btn_bulk_install.show()
 
     def on_fav_toggled(self, character, is_fav):
         if is_fav:
             self.config_manager.add_favorite(character.name)
         else:
             self.config_manager.remove_favorite(character.name)
-        self.config_manager.save_config()
 
     def on_sort_activated(self, index):
         if index == 1:
@@ -534,7 +608,8 @@ class OnlineTab(QWidget):
         if index in (1, 2, 3):
             self.load_characters()
             return
-        if not self.all_characters:
+        if not self.all_characters or (self.catalog and self.catalog.is_complete):
+            # With a complete catalog, A-Z covers every character rather than the loaded pages
             self.load_characters()
             return
         # Name A-Z: client-side sort only
@@ -545,11 +620,11 @@ class OnlineTab(QWidget):
         if not self.all_characters: return
         
         if index == 0: # Name A-Z
-            self.all_characters.sort(key=lambda x: x.name.lower())
+            self.all_characters.sort(key=lambda x: x.sort_name)
         elif index == 1: # Date
              # If date_reverse is True -> Old-New (Ascending)
              # If date_reverse is False -> New-Old (Descending)
-             self.all_characters.sort(key=lambda x: x.created_at, reverse=not self.date_reverse)
+             self.all_characters.sort(key=lambda x: x.created_ts, reverse=not self.date_reverse)
         elif index == 2: # Most Downloaded
              self.all_characters.sort(key=lambda x: x.downloads, reverse=True)
         elif index == 3: # Most Liked
@@ -557,13 +632,24 @@ class OnlineTab(QWidget):
 
         self.update_display_list()
 
+    def _clear_index(self):
+        self.search_index.clear()
+        self.indexed_characters = []
+
+    def _index_characters(self, characters):
+        start = len(self.indexed_characters)
+        self.indexed_characters.extend(characters)
+        self.search_index.add_characters(enumerate(characters, start))
+
     def update_display_list(self):
         candidates = self.all_characters
         
         # Search Filter
         text = self.search_input.text().strip().lower()
-        if text:
-            candidates = [c for c in candidates if text in c.name.lower() or text in c.author.lower()]
+        # Catalog results were matched by the full-text index (incl. #tag filters) already
+        if text and not self.showing_catalog_results:
+            # Ranked, typo-tolerant match over name, author and tags
+            candidates = [self.indexed_characters[key] for key, _ in self.search_index.search(text)]
             
         # Fav Filter
         if self.btn_filter_fav.isChecked():
@@ -608,8 +694,13 @@ class OnlineTab(QWidget):
             self.flow_layout.addWidget(skeleton)
 
     def check_scroll_bottom(self):
-        if not self.btn_load_more.isVisible(): return
         scrollbar = self.scroll_area.verticalScrollBar()
+        if self.has_next_page and not self.showing_catalog_results:
+            # Faster scrolling looks further ahead
+            depth = self.prefetcher.depth
+            if self.prefetcher.note_scroll(scrollbar.value()) > depth:
+                self.prefetcher.prefetch(self.last_fetched_api_page)
+        if not self.btn_load_more.isVisible(): return
         if scrollbar.value() >= scrollbar.maximum() - 400:
             if not self.is_loading and self.btn_load_more.isEnabled():
                 self.load_more_characters()
@@ -631,8 +722,7 @@ class OnlineTab(QWidget):
             
             # 2. Name + Author (fallback)
             if char.name:
-                key = f"{char.name.lower()}_{char.author.lower() if char.author else ''}"
-                self.installed_identifiers.add(key)
+                self.installed_identifiers.add(char.match_key)
         
         # Refresh current view
         self.markup_installed_characters()
@@ -648,10 +738,8 @@ class OnlineTab(QWidget):
             # Check ID
             if c.download_url and c.download_url in self.installed_identifiers:
                 is_installed = True
-            elif c.name:
-                key = f"{c.name.lower()}_{c.author.lower() if c.author else ''}"
-                if key in self.installed_identifiers:
-                    is_installed = True
+            elif c.name and c.match_key in self.installed_identifiers:
+                is_installed = True
                     
             if is_installed:
                 # Update model and UI
@@ -166,6 +166,7 @@ TRANSLATIONS = {
         "deploy_error": "Fallo al desplegar: {error}",
         "error_sc_structure": "No se pudo detectar la estructura de carpetas de Star Citizen.",
         "menu_import_backup": "Importar Copia de Seguridad",
+        "menu_restore_auto_backup": "Restaurar Copia Automática",
         "all_collections": "Todas las Colecciones",
         "backup_btn": "Copia de Seguridad",
         "restore_btn": "Restaurar",
@@ -372,6 +373,7 @@ TRANSLATIONS = {
         "deploy_error": "Failed to deploy: {error}",
         "error_sc_structure": "Could not detect Star Citizen folder structure.",
         "menu_import_backup": "Importar Backup",
+        "menu_restore_auto_backup": "Restore Auto-Backup",
         "all_collections": "All Collections",
         "backup_btn": "Backup",
         "restore_btn": "Restore",
@@ -565,6 +567,7 @@ TRANSLATIONS = {
         "deploy_error": "Échec du déploiement : {error}",
         "error_sc_structure": "Impossible de détecter la structure de dossiers Star Citizen.",
         "menu_import_backup": "Importer une sauvegarde",
+        "menu_restore_auto_backup": "Restaurer une sauvegarde auto",
         "all_collections": "Toutes les collections",
         "backup_btn": "Sauvegarder",
         "restore_btn": "Restaurer",
@@ -757,6 +760,7 @@ TRANSLATIONS = {
         "deploy_error": "Deployment fehlgeschlagen: {error}",
         "error_sc_structure": "Konnte Star Citizen Ordnerstruktur nicht erkennen.",
         "menu_import_backup": "Backup importieren",
+        "menu_restore_auto_backup": "Auto-Backup wiederherstellen",
         "all_collections": "Alle Sammlungen",
         "backup_btn": "Sichern",
         "restore_btn": "Wiederherstellen",
@@ -948,6 +952,7 @@ TRANSLATIONS = {
         "deploy_error": "Falha ao implantar: {error}",
         "error_sc_structure": "Não foi possível detectar estrutura de pastas Star Citizen.",
         "menu_import_backup": "Importar Backup",
+        "menu_restore_auto_backup": "Restaurar Backup Automático",
         "all_collections": "Todas as Coleções",
         "backup_btn": "Backup",
         "restore_btn": "Restaurar",
@@ -1136,6 +1141,7 @@ TRANSLATIONS = {
         "ctx_select_all": "Seleziona tutto",
         "new_badge": "NUOVO",
         "menu_import_backup": "Importa Backup",
+        "menu_restore_auto_backup": "Ripristina Backup Automatico",
         "all_collections": "Tutte le collezioni",
         "backup_btn": "Backup",
         "restore_btn": "Ripristina",
@@ -1299,6 +1305,7 @@ TRANSLATIONS = {
         "theme_light": "Светлая",
         "new_badge": "НОВЫЙ",
         "menu_import_backup": "Импорт резервной копии",
+        "menu_restore_auto_backup": "Восстановить автокопию",
         "all_collections": "Все коллекции",
         "backup_btn": "Резервная копия",
         "restore_btn": "Восстановить",
@@ -1463,6 +1470,7 @@ TRANSLATIONS = {
         "theme_light": "亮色",
         "new_badge": "新",
         "menu_import_backup": "导入备份",
+        "menu_restore_auto_backup": "恢复自动备份",
         "all_collections": "所有集合",
         "backup_btn": "备份",
         "restore_btn": "恢复",
@@ -1621,6 +1629,7 @@ TRANSLATIONS = {
         "theme_light": "ライト",
         "new_badge": "新",
         "menu_import_backup": "バックアップをインポート",
+        "menu_restore_auto_backup": "自動バックアップを復元",
         "all_collections": "すべてのコレクション",
         "backup_btn": "バックアップ",
         "restore_btn": "復元",
@@ -1779,6 +1788,7 @@ TRANSLATIONS = {
         "theme_light": "فاتح",
         "new_badge": "جديد",
         "menu_import_backup": "استيراد نسخة احتياطية",
+        "menu_restore_auto_backup": "استعادة نسخة احتياطية تلقائية",
         "all_collections": "كل المجموعات",
         "backup_btn": "نسخ احتياطي",
         "restore_btn": "استعادة",
@@ -0,0 +1,59 @@
+import asyncio
+import time
+import requests
+from src.core.api_client import ApiClient, TokenBucket, parse_retry_after
+
+class _Response:
+    def __init__(self, status, headers=None):
+        self.status_code = status
+        self.headers = headers or {}
+
+class _Session:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.times = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.times.append(time.monotonic())
+        item = self.responses.pop(0)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+def test_retry_after_is_honoured():
+    session = _Session([_Response(429, {"Retry-After": "1"}), _Response(200)])
+    client = ApiClient(session)
+    response = client.run(client.get("https://example.invalid/api"))
+    assert response.status_code == 200
+    assert session.times[1] - session.times[0] >= 0.95
+    client.close()
+
+def test_network_errors_retry_then_raise():
+    session = _Session([requests.ConnectionError("down")] * ApiClient.MAX_RETRIES)
+    client = ApiClient(session)
+    client.BASE_DELAY = 0
+    try:
+        client.run(client.get("https://example.invalid/api"))
+        assert False, "expected ConnectionError"
+    except requests.ConnectionError:
+        pass
+    assert len(session.times) == ApiClient.MAX_RETRIES
+    client.close()
+
+def test_token_bucket_spaces_out_requests():
+    bucket = TokenBucket(rate=50, capacity=2)
+
+    async def take(n):
+        start = time.monotonic()
+        for _ in range(n):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    # Two tokens of burst, then 50/s: 7 more take about 0.14s
+    assert asyncio.run(take(9)) >= 0.12
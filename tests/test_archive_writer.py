@@ -0,0 +1,34 @@
+import os
+import zipfile
+from src.core.archive_writer import write_archive, compress_member
+
+def test_archive_roundtrips_with_zipfile(tmp_path):
+    members = [("manifest.json", b'{"version": 1}')]
+    contents = {}
+    for i in range(20):
+        data = (f"character {i} ".encode() * 500)
+        path = tmp_path / f"Head{i}.chf"
+        path.write_bytes(data)
+        members.append((f"Héad{i}.chf", str(path)))
+        contents[f"Héad{i}.chf"] = data
+
+    target = str(tmp_path / "backup.zip")
+    assert write_archive(target, members, level="fast", max_workers=4) == 21
+
+    with zipfile.ZipFile(target) as zf:
+        assert zf.testzip() is None
+        assert zf.namelist()[0] == "manifest.json"
+        for name, data in contents.items():
+            assert zf.read(name) == data
+    assert not os.path.exists(target + ".tmp")
+
+def test_incompressible_payload_is_stored(tmp_path):
+    path = tmp_path / "thumb.jpg"
+    path.write_bytes(os.urandom(200_000))
+    item = compress_member(("thumb.jpg", str(path)), 6)
+    assert item.method == zipfile.ZIP_STORED
+    assert item.data == path.read_bytes()
+
+    text = compress_member(("a.json", b"a" * 200_000), 6)
+    assert text.method == zipfile.ZIP_DEFLATED
+    assert len(text.data) < 1000
@@ -0,0 +1,119 @@
+import os
+import json
+from src.core.backup_manager import BackupManager
+
+def _manager(mock_config_manager, tmp_path):
+    mock_config_manager.config_dir = str(tmp_path / "config")
+    os.makedirs(mock_config_manager.config_dir, exist_ok=True)
+    return BackupManager(mock_config_manager)
+
+def _write(path, data):
+    tmp = f"{path}.new"
+    with open(tmp, 'w') as f:
+        f.write(data)
+    os.replace(tmp, path)  # like the downloader: new inode per version
+
+def test_snapshots_are_journaled_and_restorable(mock_config_manager, temp_game_dir, tmp_path):
+    manager = _manager(mock_config_manager, tmp_path)
+    chf = os.path.join(temp_game_dir, "Head.chf")
+    _write(chf, "v1")
+    _write(os.path.join(temp_game_dir, "Head.json"), '{"name": "Head v1"}')
+    first = manager.create_snapshot(chf)
+    _write(chf, "v2")
+    manager.create_snapshot(chf)
+
+    # A fresh manager rebuilds its indexes from the journal
+    manager = BackupManager(mock_config_manager)
+    assert [s["id"] for s in manager.list_snapshots("Head")][1] == first["id"]
+    assert len(manager.list_recent()) == 2
+
+    _write(chf, "v3")
+    assert manager.restore_snapshot(first["id"], temp_game_dir)
+    with open(chf) as f:
+        assert f.read() == "v1"
+    with open(os.path.join(temp_game_dir, "Head.json")) as f:
+        assert json.load(f)["name"] == "Head v1"
+
+def test_history_limit_uses_tombstones_and_dedupes(mock_config_manager, temp_game_dir, tmp_path):
+    manager = _manager(mock_config_manager, tmp_path)
+    chf = os.path.join(temp_game_dir, "Head.chf")
+    for i in range(BackupManager.MAX_PER_CHARACTER + 3):
+        _write(chf, f"version {i % 2}")  # only two distinct contents
+        manager.create_snapshot(chf)
+
+    assert len(manager.list_snapshots("Head")) == BackupManager.MAX_PER_CHARACTER
+    objects = [f for _, _, files in os.walk(manager.objects_dir) for f in files]
+    assert len(objects) == 2
+    with open(manager.journal_path) as f:
+        assert sum('"op": "del"' in line for line in f) == 3
+
+def test_legacy_history_is_migrated(mock_config_manager, tmp_path):
+    mock_config_manager.config_dir = str(tmp_path / "config")
+    legacy = tmp_path / "config" / "Backups" / "Head"
+    legacy.mkdir(parents=True)
+    (legacy / "20240101_120000_Head.chf").write_text("old")
+    (legacy / "history.json").write_text(json.dumps([
+        {"timestamp": "20240101_120000", "reason": "Pre-Update", "filename": "20240101_120000_Head.chf", "original_path": "x"}
+    ]))
+
+    manager = BackupManager(mock_config_manager)
+    snaps = manager.list_snapshots("Head")
+    assert [(s["filename"], s["reason"]) for s in snaps] == [("Head.chf", "Pre-Update")]
+    assert not legacy.exists()
+    assert os.path.exists(manager.journal_path)
+
+def test_content_retired_and_re_added_survives_replay(mock_config_manager, temp_game_dir, tmp_path):
+    manager = _manager(mock_config_manager, tmp_path)
+    chf = os.path.join(temp_game_dir, "Head.chf")
+    _write(chf, "same bytes")
+    manager.create_snapshot(chf)
+    manager.prune(max_per_character=0)
+    again = manager.create_snapshot(chf)  # journal: add A, del A, add B (same content)
+
+    manager = BackupManager(mock_config_manager)
+    os.remove(chf)
+    assert manager.restore_snapshot(again["id"], temp_game_dir)
+    with open(chf) as f:
+        assert f.read() == "same bytes"
+
+def test_snapshots_are_copies_of_the_live_file(mock_config_manager, temp_game_dir, tmp_path):
+    manager = _manager(mock_config_manager, tmp_path)
+    chf = os.path.join(temp_game_dir, "Head.chf")
+    _write(chf, "v1")
+    snap = manager.create_snapshot(chf)
+    with open(chf, 'w') as f:
+        f.write("edited in place")
+
+    assert manager.restore_snapshot(snap, temp_game_dir)
+    with open(chf, 'w') as f:
+        f.write("edited after restore")
+    assert os.stat(chf).st_nlink == 1
+    with open(manager._object_path(snap["sha"])) as f:
+        assert f.read() == "v1"
+
+def test_snapshots_in_the_same_clock_tick_get_their_own_ids(mock_config_manager, temp_game_dir, tmp_path):
+    from unittest.mock import patch
+    manager = _manager(mock_config_manager, tmp_path)
+    paths = {}
+    for name in ("A", "B"):
+        paths[name] = os.path.join(temp_game_dir, f"{name}.chf")
+        _write(paths[name], f"{name} bytes")
+    with patch("src.core.backup_manager.time.time", return_value=1_700_000_000.0):
+        a = manager.create_snapshot(paths["A"])
+        b = manager.create_snapshot(paths["B"])
+    assert a["id"] != b["id"]
+
+    manager = BackupManager(mock_config_manager)
+    assert [s["character"] for s in manager.list_snapshots("A")] == ["A"]
+    assert manager.prune(max_per_character=0) == 2
+    assert BackupManager(mock_config_manager).list_recent() == []
+
+def test_journal_with_repeated_id_still_loads(mock_config_manager, tmp_path):
+    manager = _manager(mock_config_manager, tmp_path)
+    with open(manager.journal_path, 'w') as f:
+        for char in ("A", "B"):
+            f.write(json.dumps({"op": "add", "id": "60a24181e4000", "character": char, "time": 1.0,
+                                "timestamp": "", "filename": f"{char}.chf", "size": 1, "sha": char * 64}) + "\n")
+    assert [s["character"] for s in manager.list_recent()] == ["A"]
+    assert manager.prune(max_age_days=0) == 1
+    assert BackupManager(mock_config_manager).list_recent() == []
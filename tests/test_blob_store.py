@@ -0,0 +1,66 @@
+import os
+from unittest.mock import patch
+from src.core.blob_store import BlobStore
+
+def _write(path, data):
+    with open(path, 'wb') as f:
+        f.write(data)
+    return str(path)
+
+def test_place_shares_one_copy(tmp_path):
+    store = BlobStore(str(tmp_path / "config"))
+    src = _write(tmp_path / "live.chf", b"character bytes")
+    (tmp_path / "ptu").mkdir()
+    (tmp_path / "eptu").mkdir()
+
+    assert store.place(src, str(tmp_path / "ptu" / "live.chf"))
+    assert store.place(src, str(tmp_path / "eptu" / "live.chf"))
+
+    digest = store.digest(src)
+    assert os.path.samefile(store.blob_path(digest), tmp_path / "ptu" / "live.chf")
+    assert os.stat(src).st_nlink == 1  # the live file is never linked
+    assert os.stat(store.blob_path(digest)).st_nlink == 3  # blob, ptu, eptu
+
+def test_in_place_edits_dont_leak_into_stored_copies(tmp_path):
+    store = BlobStore(str(tmp_path / "config"))
+    src = _write(tmp_path / "live.chf", b"version one")
+    ptu = str(tmp_path / "ptu.chf")
+    store.place(src, ptu)
+    digest = store.digest(src)
+
+    # The game rewrites the live file in place: the deployed copy keeps the old bytes
+    with open(src, 'r+b') as f:
+        f.write(b"VERSION")
+    with open(ptu, 'rb') as f:
+        assert f.read() == b"version one"
+
+    # An in-place write to a linked copy damages the blob: it is dropped, not linked again
+    with open(ptu, 'r+b') as f:
+        f.write(b"garbage")
+    os.utime(ptu, ns=(0, 0))
+    assert not store.verify(digest)
+    assert not store.has(digest)
+
+def test_place_copies_when_links_fail(tmp_path):
+    store = BlobStore(str(tmp_path / "config"))
+    src = _write(tmp_path / "live.chf", b"character bytes")
+    dest = str(tmp_path / "copy.chf")
+
+    with patch("src.core.blob_store.os.link", side_effect=OSError(18, "Invalid cross-device link")):
+        assert store.place(src, dest) is False
+    with open(dest, 'rb') as f:
+        assert f.read() == b"character bytes"
+    assert not os.path.samefile(src, dest)
+
+def test_gc_drops_unreferenced_blobs(tmp_path):
+    store = BlobStore(str(tmp_path / "config"))
+    src = _write(tmp_path / "live.chf", b"old")
+    dest = str(tmp_path / "snapshot.chf")
+    store.place(src, dest)
+    digest = store.digest(src)
+
+    os.remove(src)
+    assert store.gc() == 0  # snapshot still references it
+    os.remove(dest)
+    assert store.gc() == 1
+    assert not store.has(digest)
@@ -0,0 +1,72 @@
+import requests
+from src.core.catalog import Catalog
+from src.core.models import Character
+
+def _char(i, name, author="Pilot", tags=None, created="2024-01-01"):
+    return Character(
+        name=name, author=author, url_detail=f"https://site/character/{i}", image_url="",
+        download_url=f"https://site/dna/{i}", tags=tags or [], created_at=created
+    )
+
+class _FakeScraper:
+    """Serves a catalog newest first, `per_page` per page; pages from `fail_from` on are unreachable."""
+    def __init__(self, characters, per_page=2, fail_from=None):
+        self.characters = characters
+        self.per_page = per_page
+        self.fail_from = fail_from
+        self.pages_requested = []
+
+    def get_character_pages(self, start_page, page_count, order_by=None, use_cache=True, raise_errors=False):
+        assert order_by == "latest" and not use_cache and raise_errors
+        if self.fail_from is not None and start_page + page_count > self.fail_from:
+            raise requests.ConnectionError("offline")
+        start = (start_page - 1) * self.per_page
+        end = start + page_count * self.per_page
+        self.pages_requested.extend(range(start_page, start_page + page_count))
+        return self.characters[start:end], end < len(self.characters)
+
+def test_full_then_delta_sync(tmp_path):
+    heads = [_char(i, f"Head {i}", created=f"2024-01-{20 - i:02d}") for i in range(9)]
+    catalog = Catalog(str(tmp_path))
+    assert catalog.sync(_FakeScraper(heads)) == 9
+    assert catalog.is_complete and catalog.count() == 9
+
+    fresh = [_char(100, "Brand New"), _char(101, "Newer Still")]
+    scraper = _FakeScraper(fresh + heads)
+    assert catalog.sync(scraper) == 2
+    # Stops at the first page holding known characters
+    assert scraper.pages_requested == [1, 2]
+    assert catalog.count() == 11
+
+def test_interrupted_full_sync_resumes_and_is_not_complete(tmp_path):
+    heads = [_char(i, f"Head {i}") for i in range(200)]
+    catalog = Catalog(str(tmp_path))
+    batch = Catalog.SYNC_BATCH_PAGES
+    scraper = _FakeScraper(heads, per_page=1, fail_from=batch + 1) # Network drops after the first batch
+    assert catalog.sync(scraper) == batch
+    assert not catalog.is_complete
+
+    scraper = _FakeScraper(heads, per_page=1)
+    assert catalog.sync(scraper) == 200 - batch
+    assert scraper.pages_requested[0] == batch + 1
+    assert catalog.is_complete and catalog.count() == 200
+
+def test_local_search_tags_and_sorting(tmp_path):
+    catalog = Catalog(str(tmp_path))
+    catalog.upsert([
+        _char(1, "zephyr", "Nova", tags=[{"name": "Female"}], created="2024-03-01"),
+        _char(2, "Aurora Bright", "Kite", tags=["Male", "Scarred Face"], created="2024-02-01"),
+        _char(3, "aurora dusk", "Nova", tags=["Female"], created="2024-01-01"),
+    ])
+    assert [c.name for c in catalog.search()] == ["Aurora Bright", "aurora dusk", "zephyr"]
+    assert [c.name for c in catalog.search("auro")] == ["Aurora Bright", "aurora dusk"]
+    assert [c.name for c in catalog.search("nova", order_by="latest")] == ["zephyr", "aurora dusk"]
+    assert [c.name for c in catalog.search("#Female aurora")] == ["aurora dusk"]
+    assert [c.name for c in catalog.search(tags=["Scarred Face"])] == ["Aurora Bright"]
+    assert catalog.search("zephyr")[0].tags == ["Female"]
+
+def test_like_fallback_without_fts(tmp_path):
+    catalog = Catalog(str(tmp_path))
+    catalog.upsert([_char(1, "Solo", tags=["Female"]), _char(2, "Other")])
+    catalog.fts = False
+    assert [c.name for c in catalog.search("sol #Female")] == ["Solo"]
@@ -49,3 +49,136 @@ def test_uninstall_non_existent_character(mock_config_manager, temp_game_dir):
     # Checking implementation: "Returns True if successful (or file didn't exist)"
     result = service.uninstall_character(character)
     assert result is True
+
+def test_deploy_to_ptu_copies_only_changes(mock_config_manager, temp_game_dir, tmp_path):
+    mock_config_manager.config_dir = str(tmp_path / "config")
+    mock_config_manager.get_custom_ptu_path.return_value = None
+    ptu_env = tmp_path / "StarCitizen" / "PTU"
+    ptu_env.mkdir()
+    for i in range(3):
+        with open(os.path.join(temp_game_dir, f"Head{i}.chf"), 'wb') as f:
+            f.write(f"head {i}".encode())
+    service = CharacterService(mock_config_manager)
+
+    preview = service.deploy_to_ptu(dry_run=True)
+    assert preview.target_names == ["PTU"]
+    assert len(preview.ops) == 3
+    assert not (ptu_env / "USER" / "Client" / "0" / "CustomCharacters" / "Head0.chf").exists()
+
+    service.deploy_to_ptu()
+    # Edits replace the file (deployed copies are hardlinks of the old content)
+    edited = os.path.join(temp_game_dir, "edited.tmp")
+    with open(edited, 'wb') as f:
+        f.write(b"edited head 1")
+    os.replace(edited, os.path.join(temp_game_dir, "Head1.chf"))
+
+    plan = service.deploy_to_ptu()
+    assert [os.path.basename(op.dest) for op in plan.ops] == ["Head1.chf"]
+    assert plan.stats["PTU"].unchanged == 2 and plan.stats["PTU"].updated == 1
+    with open(ptu_env / "USER" / "Client" / "0" / "CustomCharacters" / "Head1.chf", 'rb') as f:
+        assert f.read() == b"edited head 1"
+
+class _Collections:
+    def __init__(self, collections):
+        self.collections = collections
+
+def _make_head(directory, stem, name):
+    with open(os.path.join(directory, f"{stem}.chf"), 'w') as f:
+        f.write(stem)
+    with open(os.path.join(directory, f"{stem}.json"), 'w') as f:
+        f.write('{"name": "%s"}' % name)
+
+def test_loadout_switch_moves_only_the_delta(mock_config_manager, temp_game_dir, tmp_path):
+    mock_config_manager.config_dir = str(tmp_path / "config")
+    os.makedirs(mock_config_manager.config_dir)
+    for stem in ("a", "b", "c", "d"):
+        _make_head(temp_game_dir, stem, stem.upper())
+    collections = _Collections({"One": ["A", "B"], "Two": ["B", "C"]})
+    service = CharacterService(mock_config_manager)
+    storage = os.path.join(temp_game_dir, "_storage")
+
+    assert service.deploy_collection_as_loadout("One", collections) == (2, 2)
+    assert sorted(f for f in os.listdir(temp_game_dir) if f.endswith(".chf")) == ["a.chf", "b.chf"]
+
+    # B stays put: only A goes to storage and C comes back
+    b_inode = os.stat(os.path.join(temp_game_dir, "b.chf")).st_ino
+    assert service.plan_loadout("Two", collections) == {"to_store": ["a.chf"], "to_activate": ["c.chf"], "active": 2}
+    service.deploy_collection_as_loadout("Two", collections)
+    assert sorted(f for f in os.listdir(temp_game_dir) if f.endswith(".chf")) == ["b.chf", "c.chf"]
+    assert os.stat(os.path.join(temp_game_dir, "b.chf")).st_ino == b_inode
+
+    assert service.undo_last_loadout() == 4
+    assert sorted(f for f in os.listdir(temp_game_dir) if f.endswith(".chf")) == ["a.chf", "b.chf"]
+    assert sorted(f for f in os.listdir(storage) if f.endswith(".chf")) == ["c.chf", "d.chf"]
+
+def test_restore_writes_only_changed_members(mock_config_manager, temp_game_dir, tmp_path):
+    import zipfile
+    zip_path = str(tmp_path / "backup.zip")
+    with zipfile.ZipFile(zip_path, 'w') as zf:
+        zf.writestr("same.chf", "same")
+        zf.writestr("changed.chf", "new content")
+        zf.writestr("added.chf", "added")
+        zf.writestr("../evil.chf", "nope")
+    for name, data in (("same.chf", "same"), ("changed.chf", "old content")):
+        with open(os.path.join(temp_game_dir, name), 'w') as f:
+            f.write(data)
+    same_mtime = os.stat(os.path.join(temp_game_dir, "same.chf")).st_mtime_ns
+    service = CharacterService(mock_config_manager)
+
+    plan = service.plan_restore(zip_path)
+    assert (plan.added, plan.changed, plan.unchanged) == (["added.chf"], ["changed.chf"], ["same.chf"])
+    assert not os.path.exists(os.path.join(temp_game_dir, "added.chf"))
+
+    progress = []
+    assert service.restore_backup(zip_path, lambda d, t: progress.append((d, t))) == 2
+    assert progress[-1] == (2, 2)
+    with open(os.path.join(temp_game_dir, "changed.chf")) as f:
+        assert f.read() == "new content"
+    assert os.stat(os.path.join(temp_game_dir, "same.chf")).st_mtime_ns == same_mtime
+
+def test_integrity_check_flags_bad_files_and_caches(mock_config_manager, temp_game_dir, tmp_path):
+    from unittest.mock import patch
+    mock_config_manager.config_dir = str(tmp_path / "config")
+    os.makedirs(mock_config_manager.config_dir)
+    files = {
+        "good.chf": bytes(range(256)) * 8,
+        "empty.chf": b"",
+        "short.chf": b"abc",
+        "zip.chf": b"PK\x03\x04" + b"\x01" * 200,
+        "page.chf": b"  <!DOCTYPE html>" + b"x" * 200,
+        "blank.chf": b"\x00" * 4096,
+    }
+    for name, data in files.items():
+        with open(os.path.join(temp_game_dir, name), 'wb') as f:
+            f.write(data)
+    service = CharacterService(mock_config_manager)
+
+    errors = {e['filename']: e['error'] for e in service.validate_library_integrity()}
+    assert set(errors) == {"empty.chf", "short.chf", "zip.chf", "page.chf", "blank.chf"}
+    assert "ZIP" in errors["zip.chf"]
+
+    # Second run is served from the cache without reading any file
+    with patch("src.core.chf_format.inspect_file", side_effect=AssertionError("read")):
+        assert len(service.validate_library_integrity()) == 5
+
+def test_repair_library_dry_run_then_fix(mock_config_manager, temp_game_dir, tmp_path):
+    service = CharacterService(mock_config_manager)
+    for name in ("kept.chf", "kept.json", "bare_head.chf", "gone.json", "gone_thumb.jpg",
+                 ".tmp_old.chf", ".tmp_old.chf.resume", ".tmp_active.chf"):
+        with open(os.path.join(temp_game_dir, name), 'w') as f:
+            f.write("x")
+    old = 1_000_000_000
+    for name in (".tmp_old.chf", ".tmp_old.chf.resume"):
+        os.utime(os.path.join(temp_game_dir, name), (old, old))
+
+    plan = service.repair_library(dry_run=True)
+    assert plan.orphan_json == ["gone.json"]
+    assert plan.orphan_thumbs == ["gone_thumb.jpg"]
+    assert list(plan.missing_metadata) == ["bare_head"]
+    assert plan.stale_temp == [".tmp_old.chf", ".tmp_old.chf.resume"]
+    assert os.path.exists(os.path.join(temp_game_dir, "gone.json"))
+
+    plan = service.repair_library(plan=plan)
+    assert plan.results == {"orphans_removed": 1, "metadata_created": 1, "thumbnails_removed": 1, "temp_removed": 2}
+    assert sorted(os.listdir(temp_game_dir)) == [".tmp_active.chf", "bare_head.chf", "bare_head.json", "kept.chf", "kept.json"]
+    assert service.repair_library(dry_run=True).pending == 0
@@ -0,0 +1,66 @@
+import os
+from unittest.mock import patch
+from src.core.chf_format import ChfFile, fingerprint, inspect_file
+from src.core.library_index import LibraryIndex
+
+def _write(path, data):
+    with open(path, 'wb') as f:
+        f.write(data)
+    return str(path)
+
+def test_fingerprint_ignores_trailing_padding(tmp_path):
+    body = b"HEADER0123456789" + b"payload"
+    a = _write(tmp_path / "a.chf", body + b"\x00" * 100)
+    b = _write(tmp_path / "b.chf", body + b"\x00" * 4000)
+    c = _write(tmp_path / "c.chf", body.replace(b"payload", b"payloae"))
+
+    assert fingerprint(a) == fingerprint(b)
+    assert fingerprint(a) != fingerprint(c)
+
+def test_header_and_body_views(tmp_path):
+    path = _write(tmp_path / "a.chf", b"H" * 16 + b"body" + b"\x00" * 10)
+    with ChfFile(path) as chf:
+        assert chf.header == b"H" * 16
+        assert chf.content_end == 20
+        with chf.body_view() as view:
+            assert bytes(view) == b"body"
+
+    empty = _write(tmp_path / "empty.chf", b"")
+    with ChfFile(empty) as chf:
+        assert chf.content_end == 0 and chf.header == b""
+
+def test_index_caches_fingerprints(tmp_path, temp_game_dir):
+    _write(os.path.join(temp_game_dir, "a.chf"), b"content a")
+    _write(os.path.join(temp_game_dir, "b.chf"), b"content b")
+    index = LibraryIndex(str(tmp_path))
+    first = index.fingerprints(temp_game_dir)
+    assert set(first) == {"a.chf", "b.chf"}
+
+    with patch("src.core.chf_format.fingerprint", side_effect=AssertionError("read")):
+        assert LibraryIndex(str(tmp_path)).fingerprints(temp_game_dir) == first
+
+def test_integrity_verdict_reuses_the_fingerprint(tmp_path):
+    character = _write(tmp_path / "a.chf", b"H" * 80 + b"\x00" * 50)
+    assert inspect_file(character) == (fingerprint(character), None)
+    assert inspect_file(_write(tmp_path / "blank.chf", b"\x00" * 200))[1] == "File contains only zero bytes"
+    assert "ZIP" in inspect_file(_write(tmp_path / "zip.chf", b"PK\x03\x04" + b"x" * 100))[1]
+
+def test_service_fingerprints(mock_config_manager, tmp_path, temp_game_dir):
+    from src.core.character_service import CharacterService
+    mock_config_manager.config_dir = str(tmp_path / "config")
+    os.makedirs(mock_config_manager.config_dir)
+    _write(os.path.join(temp_game_dir, "a.chf"), b"same" + b"\x00" * 8)
+    _write(os.path.join(temp_game_dir, "b.chf"), b"same")
+    prints = CharacterService(mock_config_manager).get_fingerprints()
+    assert prints["a.chf"] == prints["b.chf"]
+
+def test_integrity_check_fills_the_fingerprint_cache(mock_config_manager, tmp_path, temp_game_dir):
+    from src.core.character_service import CharacterService
+    mock_config_manager.config_dir = str(tmp_path / "config")
+    os.makedirs(mock_config_manager.config_dir)
+    _write(os.path.join(temp_game_dir, "a.chf"), b"H" * 100)
+    service = CharacterService(mock_config_manager)
+    assert service.validate_library_integrity() == []
+
+    with patch("src.core.chf_format.fingerprint", side_effect=AssertionError("read")):
+        assert service.get_fingerprints() == {"a.chf": fingerprint(os.path.join(temp_game_dir, "a.chf"))}
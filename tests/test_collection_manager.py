@@ -0,0 +1,57 @@
+import json
+import os
+from unittest.mock import patch
+from src.core.collection_manager import CollectionManager
+from src.core.models import Character
+
+def _char(name, filename=None):
+    return Character(name=name, url_detail="", image_url="", local_filename=filename)
+
+def test_membership_uses_stable_ids(tmp_path):
+    manager = CollectionManager(str(tmp_path))
+    manager.create_collection("Squad")
+    head = _char("Old Name", "old_name.chf")
+    manager.add_to_collection("Squad", head)
+
+    head.name = "Renamed"
+    assert manager.is_in_collection("Squad", head)
+    assert manager.get_character_collections(head) == ["Squad"]
+
+    manager.rename_collection("Squad", "Wing")
+    assert manager.get_character_collections("old_name") == ["Wing"]
+    manager.delete_collection("Wing")
+    assert manager.get_character_collections(head) == []
+
+def test_bulk_add_saves_once(tmp_path):
+    manager = CollectionManager(str(tmp_path))
+    manager.create_collection("Big")
+    with patch("src.core.collection_manager.os.replace", wraps=os.replace) as replace:
+        assert manager.add_many("Big", [f"head_{i}" for i in range(1000)]) == 1000
+        with manager.batch():
+            manager.remove_from_collection("Big", "head_1")
+            manager.remove_from_collection("Big", "head_2")
+    assert replace.call_count == 2
+
+    reloaded = CollectionManager(str(tmp_path))
+    assert len(reloaded.get_characters_in_collection("Big")) == 998
+
+def test_legacy_file_is_migrated_to_ids(tmp_path):
+    with open(tmp_path / "collections.json", 'w') as f:
+        json.dump({"Squad": ["Fancy Head", "Unknown"]}, f)
+
+    manager = CollectionManager(str(tmp_path))
+    manager.migrate_legacy_names([_char("Fancy Head", "fancy_head.chf")])
+    assert manager.get_characters_in_collection("Squad") == ["Unknown", "fancy_head"]
+
+    with open(tmp_path / "collections.json") as f:
+        assert json.load(f)["version"] == CollectionManager.FORMAT_VERSION
+
+def test_pack_names_resolve_to_ids(tmp_path):
+    manager = CollectionManager(str(tmp_path))
+    manager.create_collection("Pack")
+    shipped = [_char("Fancy Head", "fancy_head.chf"), _char("Plain", "plain.chf")]
+    # Older packs list display names, newer ones IDs; both end up as IDs
+    members = manager.resolve_ids(["Fancy Head", "plain", "Missing"], shipped)
+    assert members == ["fancy_head", "plain", "Missing"]
+    manager.add_many("Pack", members)
+    assert manager.is_in_collection("Pack", shipped[0])
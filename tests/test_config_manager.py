@@ -0,0 +1,46 @@
+import json
+import os
+import time
+import pytest
+from src.core import config_manager as cm
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    monkeypatch.setattr(cm.QStandardPaths, "writableLocation", staticmethod(lambda _loc: str(tmp_path)))
+    manager = cm.ConfigManager()
+    yield manager
+    manager.flush()
+
+def _read(manager):
+    with open(manager.config_file) as f:
+        return json.load(f)
+
+def test_favorite_toggles_are_coalesced(config, monkeypatch):
+    writes = []
+    real_replace = os.replace
+    monkeypatch.setattr(cm.os, "replace", lambda a, b: (writes.append(b), real_replace(a, b)))
+    config.SAVE_DELAY = 60
+
+    for i in range(200):
+        config.add_favorite(f"head {i}")
+    config.remove_favorite("head 7")
+    assert config.is_favorite("head 3") and not config.is_favorite("head 7")
+    assert writes == []
+
+    config.flush()
+    assert writes == [config.config_file]
+    assert len(_read(config)["favorites"]) == 199
+    assert not os.path.exists(config.config_file + ".tmp")
+
+def test_debounced_write_happens_in_background(config):
+    config.SAVE_DELAY = 0.01
+    config.set_muted(True)
+    deadline = time.time() + 5
+    while not os.path.exists(config.config_file) and time.time() < deadline:
+        time.sleep(0.01)
+    assert _read(config)["sound_enabled"] is False
+
+def test_favorites_survive_reload(config):
+    config.add_favorite("Vanduul Chic")
+    config.flush()
+    assert cm.ConfigManager().get_favorites() == ["Vanduul Chic"]
@@ -0,0 +1,52 @@
+import threading
+from src.core.download_queue import DownloadQueue
+from src.core.models import Character
+
+class FakeDownloader:
+    def __init__(self, fail_names=()):
+        self.fail_names = set(fail_names)
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def install_character(self, character, progress_callback=None, cancel_event=None):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            if progress_callback:
+                progress_callback(10, 10)
+            return character.name not in self.fail_names
+        finally:
+            with self.lock:
+                self.active -= 1
+
+def _chars(n):
+    return [Character(name=f"Char{i}", url_detail="", image_url="", author="A", download_url=f"https://x/{i}") for i in range(n)]
+
+def test_batch_reports_aggregate_result(qtbot):
+    downloader = FakeDownloader(fail_names={"Char3"})
+    queue = DownloadQueue(downloader, max_parallel=2)
+
+    with qtbot.waitSignal(queue.batch_finished, timeout=5000) as blocker:
+        assert queue.enqueue(_chars(6)) == 6
+    assert blocker.args == [5, 1, 0]
+    assert downloader.peak <= 2
+    assert not queue.is_running()
+
+def test_duplicates_are_not_queued_twice(qtbot):
+    queue = DownloadQueue(FakeDownloader(), max_parallel=1)
+    chars = _chars(2)
+    with qtbot.waitSignal(queue.batch_finished, timeout=5000) as blocker:
+        queue.enqueue(chars + chars)
+    assert blocker.args == [2, 0, 0]
+
+def test_cancel_skips_pending_items(qtbot):
+    queue = DownloadQueue(FakeDownloader(), max_parallel=1)
+    queue.cancel()  # no batch yet: a new batch starts with a fresh event
+    chars = _chars(3)
+    with qtbot.waitSignal(queue.batch_finished, timeout=5000) as blocker:
+        queue.enqueue(chars)
+        queue.cancel()
+    succeeded, failed, cancelled = blocker.args
+    assert failed == 0 and succeeded + cancelled == 3
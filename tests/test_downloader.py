@@ -0,0 +1,173 @@
+import os
+import json
+from unittest.mock import patch
+from src.core.downloader import Downloader
+from src.core.models import Character
+
+def _installed(directory, stem, **metadata):
+    open(os.path.join(directory, f"{stem}.chf"), 'wb').close()
+    with open(os.path.join(directory, f"{stem}.json"), 'w') as f:
+        json.dump(metadata, f)
+
+def _char(name, author="Me", url=""):
+    return Character(name=name, author=author, url_detail="", image_url="", download_url=url)
+
+def test_duplicate_lookup_by_url_and_name(mock_config_manager, temp_game_dir, tmp_path):
+    mock_config_manager.config_dir = str(tmp_path)
+    _installed(temp_game_dir, "Alpha", name="Alpha", author="Me", download_url="http://x/a.chf")
+    downloader = Downloader(mock_config_manager)
+
+    assert downloader._find_existing_character(temp_game_dir, _char("Other", url="http://x/a.chf")) == "Alpha.chf"
+    assert downloader._find_existing_character(temp_game_dir, _char(" alpha ", author="ME")) == "Alpha.chf"
+    assert downloader._find_existing_character(temp_game_dir, _char("Alpha", author="Someone")) is None
+    assert downloader._find_existing_character(temp_game_dir, _char("Alpha", author="")) == "Alpha.chf"
+
+def test_duplicate_index_parses_sidecars_once(mock_config_manager, temp_game_dir, tmp_path):
+    mock_config_manager.config_dir = str(tmp_path)
+    for i in range(5):
+        _installed(temp_game_dir, f"Head{i}", name=f"Head{i}", author="Me")
+    downloader = Downloader(mock_config_manager)
+
+    with patch("src.core.downloader.json.load", wraps=json.load) as load:
+        for i in range(5):
+            downloader._find_existing_character(temp_game_dir, _char(f"Head{i}"))
+    assert load.call_count == 5
+
+def test_duplicate_index_tracks_uninstall_and_watcher(mock_config_manager, temp_game_dir, tmp_path):
+    mock_config_manager.config_dir = str(tmp_path)
+    _installed(temp_game_dir, "Alpha", name="Alpha", author="Me")
+    downloader = Downloader(mock_config_manager)
+    assert downloader._find_existing_character(temp_game_dir, _char("Alpha")) == "Alpha.chf"
+
+    char = _char("Alpha")
+    char.local_filename = "Alpha.chf"
+    downloader.forget_character(char)
+    assert downloader._find_existing_character(temp_game_dir, _char("Alpha")) is None
+
+    # Watcher reports the sidecar changed on disk -> only that file is re-read
+    downloader.duplicate_index.invalidate(["Alpha.chf"])
+    assert downloader._find_existing_character(temp_game_dir, _char("Alpha")) == "Alpha.chf"
+
+class _FakeResponse:
+    """Streams `body`, optionally dropping the connection after `fail_after` bytes."""
+    def __init__(self, status_code, body, headers, fail_after=None):
+        self.status_code = status_code
+        self.headers = headers
+        self._body = body
+        self._pos = 0
+        self._fail_after = fail_after
+        self.raw = self
+
+    def read(self, size, decode_content=True):
+        if self._fail_after is not None and self._pos >= self._fail_after:
+            raise ConnectionError("connection reset")
+        end = self._pos + size
+        if self._fail_after is not None:
+            end = min(end, self._fail_after)
+        chunk = self._body[self._pos:end]
+        self._pos = end
+        return chunk
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise IOError(f"HTTP {self.status_code}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+class _FakeServer:
+    """Range-aware server whose first response dies halfway through."""
+    def __init__(self, body, etag='"v1"'):
+        self.body = body
+        self.etag = etag
+        self.requests = []
+
+    def get(self, url, stream=True, timeout=None, headers=None):
+        headers = headers or {}
+        self.requests.append(headers)
+        first = len(self.requests) == 1
+        fail_after = len(self.body) // 2 if first else None
+        if "Range" in headers and headers.get("If-Range") == self.etag:
+            start = int(headers["Range"].split("=")[1].rstrip("-"))
+            part = self.body[start:]
+            return _FakeResponse(206, part, {
+                "Content-Length": str(len(part)),
+                "Content-Range": f"bytes {start}-{len(self.body) - 1}/{len(self.body)}",
+                "ETag": self.etag
+            })
+        return _FakeResponse(200, self.body, {"Content-Length": str(len(self.body)), "ETag": self.etag}, fail_after)
+
+def test_interrupted_download_resumes_with_range(mock_config_manager, tmp_path):
+    mock_config_manager.config_dir = str(tmp_path)
+    downloader = Downloader(mock_config_manager)
+    downloader.RETRY_DELAY = 0
+    body = os.urandom(300_000)
+    server = _FakeServer(body)
+    downloader.session = server
+    target = str(tmp_path / ".tmp_head.chf")
+
+    assert downloader._download_file("http://x/head.chf", target)
+    with open(target, 'rb') as f:
+        assert f.read() == body
+    assert server.requests[1]["Range"] == f"bytes={len(body) // 2}-"
+    assert not os.path.exists(target + ".resume")
+
+def test_changed_remote_file_restarts_from_zero(mock_config_manager, tmp_path):
+    mock_config_manager.config_dir = str(tmp_path)
+    downloader = Downloader(mock_config_manager)
+    downloader.RETRY_DELAY = 0
+    target = str(tmp_path / ".tmp_head.chf")
+    with open(target, 'wb') as f:
+        f.write(b"stale partial data")
+    with open(target + ".resume", 'w') as f:
+        json.dump({"url": "http://x/head.chf", "etag": '"old"', "total": 100}, f)
+
+    server = _FakeServer(b"new content", etag='"v2"')
+    server.requests.append({})  # skip the simulated drop
+    downloader.session = server
+
+    assert downloader._download_file("http://x/head.chf", target)
+    with open(target, 'rb') as f:
+        assert f.read() == b"new content"
+
+def test_misaligned_partial_response_restarts_without_range(mock_config_manager, tmp_path):
+    mock_config_manager.config_dir = str(tmp_path)
+    downloader = Downloader(mock_config_manager)
+    downloader.RETRY_DELAY = 0
+    body = b"0123456789" * 100
+    target = str(tmp_path / ".tmp_head.chf")
+    with open(target, 'wb') as f:
+        f.write(body[:400])
+    with open(target + ".resume", 'w') as f:
+        json.dump({"url": "http://x/head.chf", "etag": '"v1"', "total": len(body)}, f)
+
+    class MisalignedServer(_FakeServer):
+        def get(self, url, stream=True, timeout=None, headers=None):
+            self.requests.append(headers or {})
+            if "Range" in (headers or {}):
+                # Asked for bytes 400-, got bytes 0-: must not be appended to the partial file
+                return _FakeResponse(206, body, {
+                    "Content-Length": str(len(body)), "Content-Range": f"bytes 0-{len(body) - 1}/{len(body)}"
+                })
+            return _FakeResponse(200, body, {"Content-Length": str(len(body)), "ETag": self.etag})
+
+    server = MisalignedServer(body)
+    downloader.session = server
+    assert downloader._download_file("http://x/head.chf", target)
+    with open(target, 'rb') as f:
+        assert f.read() == body
+    assert "Range" not in server.requests[1]
+
+def test_parallel_items_with_same_filename_get_their_own_paths(mock_config_manager, temp_game_dir, tmp_path):
+    mock_config_manager.config_dir = str(tmp_path)
+    downloader = Downloader(mock_config_manager)
+    first = downloader._reserve_path(temp_game_dir, "head.chf")
+    second = downloader._reserve_path(temp_game_dir, "head.chf")
+    assert first != second
+    assert os.path.basename(second) == "head_1.chf"
+
+    downloader._release_path(first)
+    assert downloader._reserve_path(temp_game_dir, "head.chf") == first
@@ -0,0 +1,101 @@
+import os
+from unittest.mock import patch
+from src.core.incremental_backup import IncrementalBackup
+
+def _write(directory, name, data):
+    path = os.path.join(directory, name)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return path
+
+def _objects(backup):
+    return sum(len(files) for _, _, files in os.walk(backup.objects_dir))
+
+def test_unchanged_library_is_skipped(tmp_path, temp_game_dir):
+    _write(temp_game_dir, "a.chf", b"a" * 100)
+    backup = IncrementalBackup(str(tmp_path))
+    assert backup.create(temp_game_dir) is not None
+
+    with patch.object(IncrementalBackup, "_hash_file", side_effect=AssertionError("read file")):
+        assert backup.create(temp_game_dir) is None
+    assert len(backup.list_snapshots()) == 1
+
+def test_only_new_contents_are_stored(tmp_path, temp_game_dir):
+    _write(temp_game_dir, "a.chf", b"a" * 100)
+    _write(temp_game_dir, "b.chf", b"b" * 100)
+    backup = IncrementalBackup(str(tmp_path))
+    backup.create(temp_game_dir)
+
+    _write(temp_game_dir, "c.chf", b"a" * 100)  # same bytes as a.chf
+    _write(temp_game_dir, "d.chf", b"d" * 100)
+    backup.create(temp_game_dir)
+    assert _objects(backup) == 3
+    assert len(backup.list_snapshots()) == 2
+
+def test_restore_any_point_in_time(tmp_path, temp_game_dir):
+    backup = IncrementalBackup(str(tmp_path))
+    path = _write(temp_game_dir, "a.chf", b"version 1")
+    first = backup.create(temp_game_dir)
+    _write(temp_game_dir, "a.chf", b"version 2!")
+    backup.create(temp_game_dir)
+
+    assert backup.restore(first, temp_game_dir) == 1
+    with open(path, 'rb') as f:
+        assert f.read() == b"version 1"
+    assert backup.restore(first, temp_game_dir) == 0  # already matches
+
+def test_prune_respects_budget_and_keeps_newest(tmp_path, temp_game_dir):
+    backup = IncrementalBackup(str(tmp_path))
+    for i in range(4):
+        _write(temp_game_dir, "a.chf", bytes([i]) * 1000)
+        backup.create(temp_game_dir)
+
+    removed, objects_removed = backup.prune(budget_bytes=2500)
+    assert removed == 2 and objects_removed == 2
+    assert len(backup.list_snapshots()) == 2
+
+    backup.prune(budget_bytes=0)
+    assert len(backup.list_snapshots()) == 1
+
+def test_unreadable_manifest_keeps_every_object(tmp_path, temp_game_dir):
+    backup = IncrementalBackup(str(tmp_path))
+    _write(temp_game_dir, "a.chf", b"old")
+    first = backup.create(temp_game_dir)
+    _write(temp_game_dir, "a.chf", b"new!")
+    backup.create(temp_game_dir)
+
+    with open(os.path.join(backup.manifests_dir, f"{first}.json"), 'w') as f:
+        f.write('{"files": ')  # cut off mid-write
+    assert backup.prune(budget_bytes=0) == (0, 0)
+    assert _objects(backup) == 2
+
+def test_restore_worker_writes_snapshot(qtbot, tmp_path, temp_game_dir):
+    from src.core.workers import SnapshotRestoreWorker
+    backup = IncrementalBackup(str(tmp_path))
+    path = _write(temp_game_dir, "a.chf", b"version 1")
+    snapshot = backup.create(temp_game_dir)
+    os.remove(path)
+
+    worker = SnapshotRestoreWorker(backup, snapshot, temp_game_dir)
+    with qtbot.waitSignal(worker.signals.result, timeout=5000) as blocker:
+        worker.run()
+    assert blocker.args == [1]
+    assert os.path.exists(path)
+
+def test_unreadable_file_is_retried_next_run(tmp_path, temp_game_dir):
+    _write(temp_game_dir, "a.chf", b"a" * 100)
+    _write(temp_game_dir, "locked.chf", b"l" * 100)
+    backup = IncrementalBackup(str(tmp_path))
+    real_hash = IncrementalBackup._hash_file
+
+    def flaky(path):
+        if path.endswith("locked.chf"):
+            raise PermissionError("in use")
+        return real_hash(path)
+
+    with patch.object(IncrementalBackup, "_hash_file", side_effect=flaky):
+        backup.create(temp_game_dir)
+    assert set(backup.list_snapshots()[0]["files"]) == {"a.chf"}
+
+    assert backup.create(temp_game_dir) is not None
+    assert set(backup.list_snapshots()[0]["files"]) == {"a.chf", "locked.chf"}
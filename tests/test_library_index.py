@@ -0,0 +1,49 @@
+import os
+import json
+from unittest.mock import patch
+from src.core.library_index import LibraryIndex
+
+def _write_char(directory, stem, metadata=None):
+    with open(os.path.join(directory, f"{stem}.chf"), 'wb') as f:
+        f.write(b"dummy chf content")
+    if metadata is not None:
+        with open(os.path.join(directory, f"{stem}.json"), 'w') as f:
+            json.dump(metadata, f)
+
+def test_scan_reads_sidecars(tmp_path, temp_game_dir):
+    _write_char(temp_game_dir, "Alpha", {"name": "Alpha Head", "author": "Me", "extra": 1})
+    _write_char(temp_game_dir, "Beta")
+
+    index = LibraryIndex(str(tmp_path))
+    chars, missing = index.scan(temp_game_dir)
+
+    assert [c.name for c in chars] == ["Alpha Head", "Beta"]
+    assert chars[0].author == "Me"
+    assert chars[0].local_filename == "Alpha.chf"
+    assert missing == ["Beta.chf"]
+
+def test_warm_scan_skips_unchanged_sidecars(tmp_path, temp_game_dir):
+    _write_char(temp_game_dir, "Alpha", {"name": "Alpha Head"})
+    LibraryIndex(str(tmp_path)).scan(temp_game_dir)
+
+    # A fresh instance must reuse the persisted rows without opening the sidecar
+    index = LibraryIndex(str(tmp_path))
+    with patch.object(LibraryIndex, "build_char_data", side_effect=AssertionError("re-read")):
+        chars, _ = index.scan(temp_game_dir)
+    assert chars[0].name == "Alpha Head"
+
+def test_scan_picks_up_changes_and_removals(tmp_path, temp_game_dir):
+    index = LibraryIndex(str(tmp_path))
+    _write_char(temp_game_dir, "Alpha", {"name": "Old"})
+    _write_char(temp_game_dir, "Beta", {"name": "Beta"})
+    index.scan(temp_game_dir)
+
+    json_path = os.path.join(temp_game_dir, "Alpha.json")
+    with open(json_path, 'w') as f:
+        json.dump({"name": "Renamed Alpha"}, f)
+    st = os.stat(json_path)
+    os.utime(json_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    os.remove(os.path.join(temp_game_dir, "Beta.chf"))
+
+    chars, _ = index.scan(temp_game_dir)
+    assert [c.name for c in chars] == ["Renamed Alpha"]
@@ -0,0 +1,60 @@
+from src.core.library_watcher import (
+    ChangeCoalescer, LibraryChange,
+    CHANGE_ADDED, CHANGE_MODIFIED, CHANGE_REMOVED, CHANGE_RENAMED
+)
+
+def _collect():
+    batches = []
+    coalescer = ChangeCoalescer(batches.append, delay=60)
+    return coalescer, batches
+
+def test_bulk_events_flush_as_one_batch():
+    coalescer, batches = _collect()
+    for i in range(500):
+        coalescer.file_created(f"/cc/Head{i}.chf")
+        coalescer.file_created(f"/cc/Head{i}.json")
+        coalescer.file_modified(f"/cc/Head{i}.chf")
+    coalescer.flush()
+
+    assert len(batches) == 1
+    assert len(batches[0]) == 500
+    assert all(c.kind == CHANGE_ADDED for c in batches[0])
+
+def test_sidecar_and_temp_files_map_to_character():
+    coalescer, batches = _collect()
+    coalescer.file_created("/cc/.tmp_Head.chf")
+    coalescer.file_moved("/cc/.tmp_Head.chf", "/cc/Head.chf")
+    coalescer.file_modified("/cc/Other.json")
+    coalescer.file_created("/cc/Other_thumb.jpg")
+    coalescer.flush()
+
+    assert sorted(batches[0], key=lambda c: c.filename) == [
+        LibraryChange(CHANGE_ADDED, "Head.chf"),
+        LibraryChange(CHANGE_MODIFIED, "Other.chf"),
+    ]
+
+def test_created_then_deleted_cancels_out():
+    coalescer, batches = _collect()
+    coalescer.file_created("/cc/Head.chf")
+    coalescer.file_deleted("/cc/Head.chf")
+    coalescer.file_deleted("/cc/Gone.chf")
+    coalescer.flush()
+
+    assert batches == [[LibraryChange(CHANGE_REMOVED, "Gone.chf")]]
+
+def test_rename_keeps_original_name():
+    coalescer, batches = _collect()
+    coalescer.file_moved("/cc/A.chf", "/cc/B.chf")
+    coalescer.file_moved("/cc/B.chf", "/cc/C.chf")
+    coalescer.flush()
+
+    assert batches == [[LibraryChange(CHANGE_RENAMED, "C.chf", "A.chf")]]
+
+def test_sidecar_events_dont_revive_a_removed_character():
+    coalescer, batches = _collect()
+    coalescer.file_deleted("/cc/Head.chf")
+    coalescer.file_deleted("/cc/Head.json")
+    coalescer.file_deleted("/cc/Head_thumb.jpg")
+    coalescer.flush()
+
+    assert batches == [[LibraryChange(CHANGE_REMOVED, "Head.chf")]]
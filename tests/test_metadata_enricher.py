@@ -0,0 +1,82 @@
+import asyncio
+import json
+import requests
+from src.core.library_index import LibraryIndex
+from src.core.metadata_enricher import MetadataEnricher
+from src.core.models import Character
+
+class FakeApi:
+    def run(self, coro):
+        return asyncio.run(coro)
+
+class FakeScraper:
+    """Answers searches from a dict; queries in `offline` fail at the network level."""
+    def __init__(self, results, offline=()):
+        self.api = FakeApi()
+        self.results = results
+        self.offline = set(offline)
+        self.queries = []
+
+    async def get_character_list_async(self, page=1, search_query=None, order_by=None,
+                                       use_cache=True, raise_errors=False):
+        self.queries.append(search_query)
+        if search_query in self.offline:
+            raise requests.ConnectionError("offline")
+        return self.results.get(search_query, []), False
+
+def _online(name, char_id, downloads=0, likes=0):
+    return Character(name=name, url_detail=f"https://x/character/{char_id}", image_url="img", author="Kestrel",
+                     download_url=f"https://x/dna/{char_id}", downloads=downloads, likes=likes)
+
+def _local(tmp_path, stem, sidecar=None):
+    (tmp_path / f"{stem}.chf").write_bytes(b"x")
+    if sidecar is not None:
+        (tmp_path / f"{stem}.json").write_text(json.dumps(sidecar))
+    fields = {"name": stem, "url_detail": "", "image_url": "", **(sidecar or {})}
+    return Character.from_sidecar({**fields, "status": "installed", "local_filename": f"{stem}.chf"})
+
+def test_missing_sidecar_is_recovered_and_misses_are_remembered(tmp_path):
+    scraper = FakeScraper({"Aurora Vale": [_online("Aurora Vale", "a1", downloads=5)]})
+    enricher = MetadataEnricher(scraper, LibraryIndex())
+    jobs = [(str(tmp_path), _local(tmp_path, "Aurora_Vale")), (str(tmp_path), _local(tmp_path, "Nobody"))]
+
+    assert enricher.process_batch(jobs) == {str(tmp_path): ["Aurora_Vale.chf"]}
+    data = json.loads((tmp_path / "Aurora_Vale.json").read_text())
+    assert data["author"] == "Kestrel" and data["downloads"] == 5
+    assert data["local_filename"] == "Aurora_Vale.chf"
+    assert not (tmp_path / "Nobody.json").exists()
+
+    # The miss is cached: a rescan makes no request for it
+    scraper.queries.clear()
+    assert enricher.process_batch(jobs[1:]) == {}
+    assert scraper.queries == []
+
+def test_failed_lookups_are_not_cached(tmp_path):
+    scraper = FakeScraper({}, offline={"Ghost"})
+    enricher = MetadataEnricher(scraper, LibraryIndex())
+    job = (str(tmp_path), _local(tmp_path, "Ghost"))
+    assert enricher.process_batch([job]) == {}
+    enricher.process_batch([job])
+    assert scraper.queries == ["Ghost", "Ghost"]
+
+def test_stale_counts_are_refreshed_once_per_ttl(tmp_path):
+    sidecar = {"name": "Marcus", "url_detail": "https://x/character/m1", "downloads": 1, "likes": 0, "custom": "kept"}
+    char = _local(tmp_path, "Marcus", sidecar)
+    scraper = FakeScraper({"Marcus": [_online("Marcus", "other"), _online("Marcus", "m1", downloads=40, likes=7)]})
+    enricher = MetadataEnricher(scraper, LibraryIndex())
+
+    assert enricher.process_batch([(str(tmp_path), char)]) == {str(tmp_path): ["Marcus.chf"]}
+    data = json.loads((tmp_path / "Marcus.json").read_text())
+    assert (data["downloads"], data["likes"], data["custom"]) == (40, 7, "kept")
+
+    scraper.queries.clear()
+    enricher.process_batch([(str(tmp_path), char)])
+    assert scraper.queries == []
+
+def test_enqueue_runs_in_background(qtbot, tmp_path):
+    scraper = FakeScraper({"Zoe": [_online("Zoe", "z1")]})
+    enricher = MetadataEnricher(scraper, LibraryIndex())
+    with qtbot.waitSignal(enricher.enriched, timeout=5000) as blocker:
+        assert enricher.enqueue(str(tmp_path), [_local(tmp_path, "Zoe")]) == 1
+    assert blocker.args == [str(tmp_path), ["Zoe.chf"]]
+    qtbot.waitUntil(lambda: not enricher.is_running(), timeout=5000)
@@ -0,0 +1,41 @@
+import json
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+
+from src.core.models import Character, parse_timestamp
+
+def test_slotted_and_interned():
+    a = Character.from_api({"title": "A", "id": 1, "dnaUrl": "u1", "user": {"name": "".join(["Kes", "trel"])},
+                            "tags": [{"name": "pilot"}, {"tag": {"name": "female"}}, "old"]}, "https://x")
+    b = Character(name="B", url_detail="", image_url="", author="".join(["Kes", "trel"]), tags=["".join(["pi", "lot"])])
+    assert not hasattr(a, "__dict__")
+    assert a.author is b.author
+    assert a.tags == ["pilot", "female", "old"] and a.tags[0] is b.tags[0]
+    assert a.url_detail == "https://x/character/1"
+    assert Character.from_api({"title": "No download"}, "https://x") is None
+
+def test_created_at_parsed_once_and_follows_assignment():
+    recent = (datetime.now(timezone.utc) - timedelta(days=2)).isoformat().replace("+00:00", "Z")
+    char = Character(name="A", url_detail="", image_url="", created_at=recent)
+    assert char.is_new
+    assert char.created_ts == parse_timestamp(recent)
+    char.created_at = "2020-01-01T00:00:00.000Z"
+    assert not char.is_new
+    assert char.created_ts == datetime(2020, 1, 1, tzinfo=timezone.utc).timestamp()
+    char.created_at = "not a date"
+    assert char.created_ts == 0.0 and not char.is_new
+
+def test_derived_keys_follow_renames():
+    char = Character(name="Zoe Vale", url_detail="", image_url="", author="Kestrel")
+    assert char.sort_name == "zoe vale"
+    assert char.match_key == "zoe vale_kestrel"
+    char.name = "Ada"
+    char.author = None
+    assert char.match_key == "ada_"
+
+def test_sidecar_round_trip_ignores_unknown_keys():
+    char = Character(name="A", url_detail="", image_url="", tags=["x"], local_filename="a.chf")
+    data = json.loads(json.dumps(asdict(char)))
+    assert not any(key.startswith("_") for key in data)
+    data["unknown"] = 1
+    assert Character.from_sidecar(data) == char
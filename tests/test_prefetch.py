@@ -0,0 +1,110 @@
+import asyncio
+import threading
+import requests
+from src.core.api_client import ApiClient
+from src.core.models import Character
+from src.core.prefetch import PageCache, PrefetchEngine, page_key
+
+class FakeScraper:
+    """Serves `last_page` pages of two characters; page keys in `slow` wait until released."""
+    def __init__(self, last_page=10):
+        self.api = ApiClient(requests.Session())
+        self.last_page = last_page
+        self.requested = []
+        self.release = threading.Event()
+        self.slow = set()
+
+    async def get_character_list_async(self, page=1, search_query=None, order_by=None, use_cache=True):
+        self.requested.append((search_query, order_by, page))
+        if page_key(search_query, order_by, page) in self.slow:
+            await asyncio.to_thread(self.release.wait, 5)
+        chars = [Character(name=f"{search_query}-{page}-{i}", url_detail="", image_url="") for i in range(2)]
+        return chars, page < self.last_page
+
+def test_page_cache_evicts_least_recently_used():
+    cache = PageCache(max_pages=2)
+    cache.put(page_key(None, "latest", 1), ([], True))
+    cache.put(page_key(None, "latest", 2), ([], True))
+    cache.get(page_key(None, "latest", 1))
+    cache.put(page_key("zoe", "latest", 1), ([], False))
+    assert page_key(None, "latest", 1) in cache
+    assert page_key(None, "latest", 2) not in cache
+    assert len(cache) == 2
+
+def test_prefetched_pages_are_served_from_memory(qtbot):
+    scraper = FakeScraper(last_page=3)
+    engine = PrefetchEngine(scraper)
+    engine.set_query(None, "latest")
+    engine.depth = 2
+    with qtbot.waitSignals([engine.page_loaded] * 2, timeout=5000):
+        engine.prefetch(1)
+    assert engine.get(2)[0][0].name == "None-2-0"
+    assert engine.get(3)[1] is False
+
+    scraper.requested.clear()
+    engine.depth = 5
+    engine.prefetch(1) # Pages 2-3 are cached and page 3 was the last one
+    assert scraper.requested == []
+    scraper.api.close()
+
+def test_query_change_cancels_running_fetches(qtbot):
+    scraper = FakeScraper()
+    scraper.slow = {page_key("zoe", "latest", 2)} # Only the old query's page hangs
+    engine = PrefetchEngine(scraper)
+    engine.set_query("zoe", "latest")
+    engine.prefetch(1)
+    qtbot.waitUntil(lambda: len(scraper.requested) == 1, timeout=5000)
+
+    engine.set_query("zoe", "like")
+    with qtbot.waitSignal(engine.page_loaded, timeout=5000) as blocker:
+        engine.request(2)
+    assert blocker.args[0] == page_key("zoe", "like", 2)
+    scraper.release.set()
+    qtbot.wait(100)
+    assert page_key("zoe", "latest", 2) not in engine.cache
+    scraper.api.close()
+
+def test_depth_follows_scroll_speed(monkeypatch):
+    engine = PrefetchEngine(FakeScraper())
+    clock = [100.0]
+    monkeypatch.setattr("src.core.prefetch.time.monotonic", lambda: clock[0])
+    assert engine.note_scroll(0) == PrefetchEngine.MIN_DEPTH
+    for step in range(1, 6):
+        clock[0] += 0.1
+        depth = engine.note_scroll(step * 1000) # 10000 px/s
+    assert depth == PrefetchEngine.MAX_DEPTH
+    clock[0] += 5
+    assert engine.note_scroll(5000) == PrefetchEngine.MIN_DEPTH
+
+def test_results_after_close_are_dropped(qtbot):
+    scraper = FakeScraper()
+    scraper.slow = {page_key(None, "latest", 2)}
+    engine = PrefetchEngine(scraper)
+    engine.set_query(None, "latest")
+    engine.prefetch(1)
+    qtbot.waitUntil(lambda: len(scraper.requested) == 1, timeout=5000)
+
+    engine.close()
+    with qtbot.assertNotEmitted(engine.page_loaded, wait=200):
+        scraper.release.set()
+        engine.request(3)
+    assert len(engine.cache) == 0
+    scraper.api.close()
+
+def test_engine_deleted_with_fetches_running(qtbot):
+    from PySide6.QtCore import QObject
+    scraper = FakeScraper()
+    scraper.slow = {page_key(None, "latest", 2)}
+    parent = QObject()
+    engine = PrefetchEngine(scraper, parent=parent)
+    engine.set_query(None, "latest")
+    engine.prefetch(1)
+    qtbot.waitUntil(lambda: len(scraper.requested) == 1, timeout=5000)
+    future = next(iter(engine._inflight.values()))
+
+    parent.deleteLater()
+    qtbot.wait(50)
+    scraper.release.set()
+    qtbot.waitUntil(future.done, timeout=5000)
+    assert future.cancelled()
+    scraper.api.close()
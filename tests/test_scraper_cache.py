@@ -0,0 +1,89 @@
+import json
+import time
+import requests
+from src.core.http_cache import ResponseCache
+from src.core.scraper import Scraper
+
+PAGE = {"body": {"rows": [{"id": 1, "title": "Head", "dnaUrl": "https://x/dna"}], "hasNextPage": True}}
+
+class _Response:
+    def __init__(self, status, body=b"", headers=None):
+        self.status_code = status
+        self.content = body
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(str(self.status_code))
+
+class _Session:
+    def __init__(self):
+        self.calls = []
+        self.offline = False
+        self.headers = {}
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.calls.append(dict(headers or {}))
+        if self.offline:
+            raise requests.ConnectionError("offline")
+        if headers and headers.get("If-None-Match") == '"v1"':
+            return _Response(304)
+        payload = PAGE["body"]["rows"] if url.endswith("/random") else PAGE
+        return _Response(200, json.dumps(payload).encode(), {"ETag": '"v1"'})
+
+def _scraper(tmp_path):
+    scraper = Scraper(cache=ResponseCache(str(tmp_path)))
+    scraper.session = _Session()
+    scraper.api.BASE_DELAY = 0
+    return scraper
+
+def test_fresh_pages_come_from_cache(tmp_path):
+    scraper = _scraper(tmp_path)
+    first = scraper.get_character_list(page=1, order_by="like")
+    second = scraper.get_character_list(page=1, order_by="like")
+    assert first[0][0].name == second[0][0].name == "Head" and second[1] is True
+    assert len(scraper.session.calls) == 1
+
+    scraper.get_character_list(page=1, order_by="latest")
+    assert len(scraper.session.calls) == 2
+
+def test_stale_entry_is_served_and_revalidated(tmp_path):
+    scraper = _scraper(tmp_path)
+    scraper.get_character_list(page=2)
+    scraper.LIST_TTL = 0
+    chars, _ = scraper.get_character_list(page=2)
+    assert chars[0].name == "Head"
+
+    deadline = time.time() + 5
+    while len(scraper.session.calls) < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    assert scraper.session.calls[1] == {"If-None-Match": '"v1"'}
+
+    # The task is held until it finishes, then released
+    while scraper._refresh_tasks and time.time() < deadline:
+        time.sleep(0.01)
+    assert not scraper._refresh_tasks
+
+def test_offline_falls_back_to_cache(tmp_path):
+    scraper = _scraper(tmp_path)
+    assert scraper.get_random_characters(5)
+    scraper.session.offline = True
+    assert [c.name for c in scraper.get_random_characters(5)] == ["Head"]
+    assert scraper.get_character_list(page=9) == ([], False)
+
+def test_multi_page_fetch_keeps_page_order(tmp_path):
+    scraper = _scraper(tmp_path)
+    chars, has_next = scraper.get_character_pages(1, 4, order_by="download")
+    assert len(chars) == 4 and has_next is True
+    assert len(scraper.session.calls) == 4
+
+def test_multi_page_fetch_can_report_failures(tmp_path):
+    scraper = _scraper(tmp_path)
+    scraper.session.offline = True
+    assert scraper.get_character_pages(1, 2, use_cache=False) == ([], False)
+    try:
+        scraper.get_character_pages(1, 2, use_cache=False, raise_errors=True)
+    except requests.RequestException:
+        pass
+    else:
+        raise AssertionError("failure was reported as an empty catalog")
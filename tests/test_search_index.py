@@ -0,0 +1,45 @@
+from src.core.search_index import SearchIndex
+from src.core.models import Character
+
+def _char(name, author="Unknown", tags=None):
+    return Character(name=name, url_detail="", image_url="", author=author, tags=tags or [])
+
+def _index():
+    index = SearchIndex()
+    index.add_characters([
+        ("a", _char("Aurora Fleetwood", "Kestrel", ["female", "pilot"])),
+        ("b", _char("Marcus Vale", "Aurora Studio", ["male"])),
+        ("c", _char("Zoë Carrack", "Kestrel", ["female", "explorer"])),
+    ])
+    return index
+
+def _keys(results):
+    return [key for key, _ in results]
+
+def test_prefix_and_accents():
+    index = _index()
+    assert set(_keys(index.search("fle"))) == {"a"}
+    assert _keys(index.search("zoe")) == ["c"]
+    assert _keys(index.search("ZO")) == ["c"]
+
+def test_typo_tolerance():
+    index = _index()
+    assert _keys(index.search("fleetwod")) == ["a"]
+    assert _keys(index.search("carrak")) == ["c"]
+    assert index.search("qwxz") == []
+
+def test_all_words_must_match_and_name_ranks_first():
+    index = _index()
+    assert _keys(index.search("kestrel explorer")) == ["c"]
+    # "aurora" is a name for a, only the author for b
+    assert _keys(index.search("aurora")) == ["a", "b"]
+
+def test_remove_and_reindex():
+    index = _index()
+    index.remove("a")
+    assert "a" not in index
+    assert _keys(index.search("fleetwood")) == []
+    index.add_character("b", _char("Marcus Fleetwood"))
+    assert _keys(index.search("fleetwood")) == ["b"]
+    assert _keys(index.search("studio")) == []
+    assert len(index) == 2
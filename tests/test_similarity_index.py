@@ -0,0 +1,50 @@
+import os
+import random
+from src.core.similarity_index import SimilarityIndex, compute_minhash, similarity
+
+def _blob(seed, size=4096):
+    rng = random.Random(seed)
+    return bytes(rng.getrandbits(8) for _ in range(size))
+
+def _mutate(data, count, seed=0):
+    rng = random.Random(seed)
+    data = bytearray(data)
+    for _ in range(count):
+        data[rng.randrange(len(data))] = rng.getrandbits(8)
+    return bytes(data)
+
+def test_similarity_estimates():
+    a = _blob(1)
+    assert similarity(compute_minhash(a), compute_minhash(a)) == 1.0
+    assert similarity(compute_minhash(a), compute_minhash(_mutate(a, 3))) > 0.9
+    assert similarity(compute_minhash(a), compute_minhash(_blob(2))) < 0.2
+
+def test_clusters_and_incremental_updates():
+    index = SimilarityIndex()
+    base_a, base_b = _blob(10), _blob(20)
+    index.add("a.chf", compute_minhash(base_a))
+    index.add("a_1.chf", compute_minhash(_mutate(base_a, 2)))
+    index.add("b.chf", compute_minhash(base_b))
+    index.add("b copy.chf", compute_minhash(base_b))
+    index.add("c.chf", compute_minhash(_blob(30)))
+
+    assert index.clusters() == [["a.chf", "a_1.chf"], ["b copy.chf", "b.chf"]]
+    assert {k for k, _ in index.query(compute_minhash(base_a))} == {"a.chf", "a_1.chf"}
+
+    index.remove("b copy.chf")
+    assert index.clusters() == [["a.chf", "a_1.chf"]]
+
+def test_service_find_duplicates(mock_config_manager, tmp_path, temp_game_dir):
+    from src.core.character_service import CharacterService
+    mock_config_manager.config_dir = str(tmp_path / "config")
+    os.makedirs(mock_config_manager.config_dir)
+    base = _blob(5)
+    for name, data in (("x.chf", base), ("x_1.chf", _mutate(base, 1)), ("y.chf", _blob(6))):
+        with open(os.path.join(temp_game_dir, name), 'wb') as f:
+            f.write(data)
+
+    service = CharacterService(mock_config_manager)
+    assert service.find_duplicates() == [["x.chf", "x_1.chf"]]
+
+    os.remove(os.path.join(temp_game_dir, "x_1.chf"))
+    assert service.find_duplicates() == []